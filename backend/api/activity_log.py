@@ -0,0 +1,266 @@
+"""
+Registro de actividad asíncrono y por lotes.
+
+Las vistas llaman a `record(...)` en lugar de `Activity.objects.create`. Al confirmar
+la transacción del request, el evento se agrega a un archivo de spool (JSON por línea)
+y a una cola en memoria; un hilo de fondo los guarda con un solo `bulk_create` cuando
+la cola llega a BATCH_SIZE o pasa FLUSH_INTERVAL. Así la mutación solo paga su propia
+escritura.
+
+El spool es el respaldo ante caídas: cada proceso escribe en `activity-<pid>.jsonl` y
+al vaciar la cola lo rota a `.flushing`, que se borra cuando el lote quedó guardado.
+Los archivos de procesos que ya no existen se reinsertan al arrancar el hilo (o con
+`manage.py flush_activity_spool`). La entrega es al-menos-una-vez: si el proceso cae
+entre el bulk_create y el borrado del archivo, ese lote puede quedar duplicado.
+
+Configuración (settings.ACTIVITY_LOG): ASYNC, BATCH_SIZE, FLUSH_INTERVAL, SPOOL_DIR.
+Con ASYNC=False el lote del request se guarda al confirmar, en el mismo hilo (tests).
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import prometheus
+from .models import Activity, Board, Card
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'ASYNC': True,
+    'BATCH_SIZE': 200,
+    'FLUSH_INTERVAL': 1.0,
+    'SPOOL_DIR': None,
+}
+
+
+def config(name):
+    return getattr(settings, 'ACTIVITY_LOG', {}).get(name, DEFAULTS[name])
+
+
+def _event(activity):
+    return {
+        "board": activity.board_id,
+        "card": activity.card_id,
+        "actor": activity.actor_id,
+        "action": activity.action,
+        "meta": activity.meta,
+        "created_at": activity.created_at.isoformat(),
+    }
+
+
+def _activity(event):
+    return Activity(
+        board_id=event["board"], card_id=event["card"], actor_id=event["actor"],
+        action=event["action"], meta=event["meta"], created_at=parse_datetime(event["created_at"]),
+    )
+
+
+def _existing(model, ids):
+    return set(model.objects.filter(id__in=ids).values_list('id', flat=True)) if ids else set()
+
+
+def write(events):
+    """Guarda eventos con un bulk_create, descartando los de tarjetas o tableros ya eliminados."""
+    if not events:
+        return 0
+    alive = {
+        key: _existing(model, {e[key] for e in events if e[key] is not None})
+        for key, model in (("card", Card), ("board", Board), ("actor", User))
+    }
+    rows = []
+    for e in events:
+        if e["card"] is not None and e["card"] not in alive["card"]:
+            continue
+        if e["board"] is not None and e["board"] not in alive["board"]:
+            continue
+        if e["actor"] not in alive["actor"]:
+            e = {**e, "actor": None}  # Activity.actor es SET_NULL
+        rows.append(_activity(e))
+    Activity.objects.bulk_create(rows)
+    return len(rows)
+
+
+def read_spool(path):
+    events = []
+    with open(path, encoding='utf-8') as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                # Última línea a medio escribir al caer el proceso
+                logger.warning("Línea inválida en %s", path)
+    return events
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def recover(spool_dir=None):
+    """Reinserta los spools de procesos terminados. Devuelve la cantidad de eventos guardados."""
+    spool_dir = spool_dir or config('SPOOL_DIR')
+    if not spool_dir:
+        return 0
+    saved = 0
+    for path in sorted(Path(spool_dir).glob('activity-*.jsonl*')):
+        try:
+            pid = int(path.name.split('-', 1)[1].split('.', 1)[0])
+        except ValueError:
+            continue
+        if pid == os.getpid() or _pid_alive(pid):
+            continue
+        saved += write(read_spool(path))
+        path.unlink()
+    return saved
+
+
+class ActivityWriter:
+    """Cola en memoria + spool en disco + hilo que guarda por lotes."""
+
+    def __init__(self, batch_size, interval, spool_dir=None):
+        self.batch_size = batch_size
+        self.interval = interval
+        self.spool_dir = Path(spool_dir) if spool_dir else None
+        self._queue = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._spool = None
+        self._pid = None
+
+    # --- spool ---
+    def _spool_path(self, suffix=''):
+        return self.spool_dir / f'activity-{os.getpid()}.jsonl{suffix}'
+
+    def _append_spool(self, events):
+        if self.spool_dir is None:
+            return
+        if self._spool is None or self._pid != os.getpid():
+            self.spool_dir.mkdir(parents=True, exist_ok=True)
+            self._spool = open(self._spool_path(), 'a', encoding='utf-8')
+            self._pid = os.getpid()
+        self._spool.write(''.join(json.dumps(e) + '\n' for e in events))
+        self._spool.flush()
+
+    def _rotate_spool(self):
+        """Aparta el spool del lote actual; devuelve su ruta (o None)."""
+        if self.spool_dir is None:
+            return None
+        flushing = self._spool_path('.flushing')
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+            if flushing.exists():
+                # Un lote anterior falló y sigue en la cola: se acumula en el mismo archivo
+                with open(flushing, 'a', encoding='utf-8') as dst, open(self._spool_path(), encoding='utf-8') as src:
+                    dst.write(src.read())
+                self._spool_path().unlink()
+            else:
+                self._spool_path().rename(flushing)
+        return flushing if flushing.exists() else None
+
+    # --- cola ---
+    def enqueue(self, events):
+        with self._lock:
+            self._append_spool(events)
+            self._queue.extend(events)
+            size = len(self._queue)
+        prometheus.set_activity_queue(size)
+        self._ensure_thread()
+        if size >= self.batch_size:
+            self._wake.set()
+
+    def flush(self):
+        """Guarda todo lo encolado. Si falla, los eventos vuelven a la cola y el spool se conserva."""
+        with self._lock:
+            batch, self._queue = self._queue, []
+            spooled = self._rotate_spool()
+        if not batch:
+            return 0
+        prometheus.set_activity_queue(0)
+        try:
+            with transaction.atomic():
+                saved = write(batch)
+        except Exception:
+            logger.exception("No se pudo guardar el lote de actividad (%d eventos)", len(batch))
+            with self._lock:
+                self._queue[:0] = batch
+                prometheus.set_activity_queue(len(self._queue))
+            return 0
+        if spooled is not None:
+            spooled.unlink(missing_ok=True)
+        return saved
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name='activity-writer', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        try:
+            recover(self.spool_dir)
+        except Exception:
+            logger.exception("No se pudieron recuperar los spools de actividad")
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            close_old_connections()
+            self.flush()
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_writer():
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = ActivityWriter(config('BATCH_SIZE'), config('FLUSH_INTERVAL'), config('SPOOL_DIR'))
+                atexit.register(_writer.flush)
+    return _writer
+
+
+# -----------------------
+# API
+# -----------------------
+def record(board_id, actor, action, card_id=None, meta=None):
+    """Registra una actividad al confirmarse la transacción actual (no toca la base en el request)."""
+    enqueue([Activity(
+        board_id=board_id, card_id=card_id, actor=actor, action=action,
+        meta=meta or {}, created_at=timezone.now(),
+    )])
+
+
+def enqueue(activities):
+    """Encola instancias de Activity sin guardar; se descartan si la transacción se revierte."""
+    events = [_event(a) for a in activities if a is not None]
+    if not events:
+        return
+    if config('ASYNC'):
+        transaction.on_commit(lambda: get_writer().enqueue(events))
+    else:
+        transaction.on_commit(lambda: write(events))
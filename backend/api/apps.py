@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class ApiConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'api'
+
+    def ready(self):
+        from . import (  # noqa: F401  (conectan las señales)
+            authentication, lookups, membership, prometheus, search, sqlite, stats, sync, versioning,
+        )
@@ -0,0 +1,209 @@
+"""
+Autenticación JWT sin consultas a User/Profile en el camino caliente.
+
+Los tokens emitidos por los logins (y al renovar) llevan los claims `role`, `username`
+e `is_staff`, firmados con el resto del token.
+
+- `CachedJWTAuthentication` resuelve el usuario desde la caché ('user', invalidada al
+  guardar User) y toma el rol del claim; si el token no lo trae, usa el rol cacheado.
+- `StatelessJWTAuthentication` (la configurada por defecto) ni siquiera lee la caché de
+  usuarios: arma un User a partir de los claims, con el resto de campos diferidos, que
+  Django carga de la base solo si una vista los usa.
+
+Para que un token no siga valiendo con datos viejos, al desactivar o borrar un usuario,
+cambiar su contraseña, nombre, is_staff o rol se registra una marca de revocación
+(`revoke`). Los tokens emitidos antes de esa marca dejan de confiarse en sus claims y
+pasan por la carga completa, que rechaza usuarios inactivos. La marca se guarda en la
+base (TokenRevocation), visible para todos los procesos, y dura lo mismo que un access
+token. Con settings.TOKEN_REVOCATION_STORE = 'cache' (por defecto con Redis) se lee desde
+la caché compartida, que consulta la base solo al expirar. Con 'db' (la caché en memoria
+no se comparte entre workers) cada proceso guarda una copia de la tabla y la relee cada
+TOKEN_REVOCATION_REFRESH_SECONDS: una revocación hecha en otro worker tarda a lo sumo eso.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from . import cache, db_router
+from .lookups import role_of, user_by_id
+from .models import Profile, TokenRevocation
+
+ROLE_CLAIM = 'role'
+# Campos del User que viajan en el token, en el orden de User._meta.concrete_fields
+CLAIM_FIELDS = ('id', 'username', 'is_staff', 'is_active')
+WATCHED_FIELDS = ('username', 'is_staff', 'is_active', 'password')
+
+
+def add_user_claims(token, user):
+    """Agrega a `token` los claims de identidad y rol de `user`."""
+    token[ROLE_CLAIM] = role_of(user)
+    token['username'] = user.username
+    token['is_staff'] = user.is_staff
+    return token
+
+
+# -----------------------
+# REVOCACIÓN
+# -----------------------
+def _cached_store():
+    return getattr(settings, 'TOKEN_REVOCATION_STORE', 'db') == 'cache'
+
+
+class _ProcessRevocations:
+    """Copia por proceso de TokenRevocation, releída cada TOKEN_REVOCATION_REFRESH_SECONDS."""
+
+    def __init__(self):
+        self.marks = {}
+        self.loaded_at = None
+        self.lock = threading.Lock()
+
+    def get(self, user_id):
+        refresh = getattr(settings, 'TOKEN_REVOCATION_REFRESH_SECONDS', 5)
+        with self.lock:
+            if self.loaded_at is None or time.monotonic() - self.loaded_at >= refresh:
+                since = int(time.time() - api_settings.ACCESS_TOKEN_LIFETIME.total_seconds())
+                with db_router.use_primary():
+                    self.marks = dict(
+                        TokenRevocation.objects.filter(revoked_at__gte=since).values_list('user_id', 'revoked_at')
+                    )
+                self.loaded_at = time.monotonic()
+            # simplejwt guarda el id como texto en el token
+            return self.marks.get(int(user_id))
+
+    def add(self, user_ids, revoked_at):
+        with self.lock:
+            self.marks.update(dict.fromkeys(user_ids, revoked_at))
+
+
+_process_revocations = _ProcessRevocations()
+
+
+def revoke(user_ids):
+    """Deja de confiar en los claims de los tokens ya emitidos para `user_ids`."""
+    user_ids = list(user_ids)
+    lifetime = int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds())
+    now = int(time.time())
+    TokenRevocation.objects.bulk_create(
+        [TokenRevocation(user_id=pk, revoked_at=now) for pk in user_ids],
+        update_conflicts=True, unique_fields=['user_id'], update_fields=['revoked_at'],
+    )
+    # Las marcas más viejas que un access token ya no afectan a ningún token vigente
+    TokenRevocation.objects.filter(revoked_at__lt=now - lifetime).delete()
+    _process_revocations.add(user_ids, now)
+    if _cached_store():
+        marks = {cache.make_key('revoked', pk): now for pk in user_ids}
+        # De nuevo al confirmar: una lectura concurrente pudo guardar el valor anterior
+        cache.backend().set_many(marks, lifetime)
+        transaction.on_commit(lambda: cache.backend().set_many(marks, lifetime))
+
+
+def revoked_at(user_id):
+    if not _cached_store():
+        return _process_revocations.get(user_id)
+    # 0 = sin marca, para que la ausencia también quede cacheada
+    return cache.get_or_set('revoked', (user_id,), lambda: TokenRevocation.objects.filter(
+        user_id=user_id,
+    ).values_list('revoked_at', flat=True).first() or 0) or None
+
+
+def is_revoked(user_id, issued_at):
+    revoked = revoked_at(user_id)
+    return revoked is not None and issued_at is not None and issued_at <= revoked
+
+
+# -----------------------
+# AUTENTICACIÓN
+# -----------------------
+class CachedJWTAuthentication(JWTAuthentication):
+    def load_user(self, validated_token):
+        """User completo (desde la caché) con las validaciones de simplejwt."""
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        user = user_by_id(user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
+
+    def get_user(self, validated_token):
+        user = self.load_user(validated_token)
+        role = validated_token.get(ROLE_CLAIM)
+        if role and not is_revoked(user.pk, validated_token.get('iat')):
+            user._role = role
+        return user
+
+
+class StatelessJWTAuthentication(CachedJWTAuthentication):
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if (
+            user_id is None or 'username' not in validated_token
+            or is_revoked(user_id, validated_token.get('iat'))
+        ):
+            # Token anterior a los claims o con datos posiblemente viejos: carga completa
+            return self.load_user(validated_token)
+        user = User.from_db('default', CLAIM_FIELDS, [
+            int(user_id), validated_token['username'], bool(validated_token.get('is_staff')), True,
+        ])
+        role = validated_token.get(ROLE_CLAIM)
+        if role:
+            user._role = role
+        return user
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """Al renovar, el access token nuevo lleva claims actuales (no los copiados del refresh)."""
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        access = AccessToken(data['access'])
+        user = user_by_id(access[api_settings.USER_ID_CLAIM])
+        if user is not None:
+            add_user_claims(access, user)
+            data['access'] = str(access)
+        return data
+
+
+# -----------------------
+# SEÑALES
+# -----------------------
+def _on_user_pre_save(sender, instance, **kwargs):
+    if not instance.pk:
+        return
+    previous = User.objects.filter(pk=instance.pk).values(*WATCHED_FIELDS).first()
+    if previous and any(previous[f] != getattr(instance, f) for f in WATCHED_FIELDS):
+        instance._revoke_tokens = True
+
+
+def _on_user_saved(sender, instance, **kwargs):
+    if getattr(instance, '_revoke_tokens', False):
+        instance._revoke_tokens = False
+        revoke([instance.pk])
+
+
+def _on_user_deleted(sender, instance, **kwargs):
+    revoke([instance.pk])
+
+
+def _on_profile_saved(sender, instance, created, **kwargs):
+    if not created:
+        revoke([instance.user_id])
+
+
+pre_save.connect(_on_user_pre_save, sender=User, dispatch_uid='token-revoke-user-pre-save')
+post_save.connect(_on_user_saved, sender=User, dispatch_uid='token-revoke-user-save')
+post_delete.connect(_on_user_deleted, sender=User, dispatch_uid='token-revoke-user-delete')
+post_save.connect(_on_profile_saved, sender=Profile, dispatch_uid='token-revoke-profile-save')
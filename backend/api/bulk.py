@@ -0,0 +1,250 @@
+from collections import defaultdict
+
+from django.db.models import prefetch_related_objects
+from django.db.models.signals import post_save
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from . import activity_log
+from .membership import is_member
+from .models import BoardScoped
+from .ordering import POSITION_GAP, append_position, place
+from .sqlite import serialized_write
+
+
+class BulkMutationMixin:
+    """
+    Acción `POST <recurso>/bulk/` que aplica una lista de operaciones en una sola transacción.
+
+    Payload: { "operations": [
+        {"op": "create", "data": {...}},
+        {"op": "update", "id": <id>, "data": {...}},
+        {"op": "move", "id": <id>, "position": <índice>, <parent>: <id opcional>},
+        {"op": "delete", "id": <id>}
+    ] }
+
+    Primero se validan todas; si alguna falla no se escribe nada (400 con los errores por índice).
+    Si una creación o edición apunta a un padre de un tablero del que el usuario no es
+    miembro, el lote entero se rechaza con 403.
+    Luego se aplican agrupadas: bulk_create, bulk_update, movimientos, un solo delete
+    y un solo lote para el registro de actividad. Las operaciones update/move/delete solo pueden
+    referirse a objetos que ya existían antes del lote.
+    """
+    bulk_parent_field = None  # FK que agrupa las posiciones ('list' para tarjetas)
+    bulk_max_operations = 200
+    bulk_prefetch = ()
+    bulk_event_names = {'create': 'created', 'update': 'updated', 'move': 'moved', 'delete': 'deleted'}
+
+    def bulk_create_kwargs(self):
+        """Campos fijados por el servidor al crear (p. ej. created_by)."""
+        return {}
+
+    def bulk_resolve_move(self, obj, target_id):
+        """
+        Resuelve el padre destino de un movimiento. Devuelve (destino, error).
+        Por defecto solo se reordena dentro del mismo padre.
+        """
+        current = getattr(obj, f'{self.bulk_parent_field}_id')
+        if str(target_id) != str(current):
+            return None, {self.bulk_parent_field: "Solo se puede reordenar dentro del mismo grupo."}
+        return getattr(obj, self.bulk_parent_field), None
+
+    def check_parent_board(self, request, validated_data):
+        """403 si el padre validado (lista, tarjeta) es de un tablero ajeno al usuario."""
+        target = validated_data.get(self.bulk_parent_field)
+        if target is not None and not is_member(request.user, target.board_id):
+            self.permission_denied(request, message="No autorizado en el tablero destino")
+
+    def bulk_activity(self, kind, obj):
+        """Activity a registrar por operación, o None."""
+        return None
+
+    def bulk_board_id(self, obj):
+        """Tablero de un objeto antes de eliminarlo, para el evento de borrado."""
+        return None
+
+    def bulk_publish(self, kind, pk, obj, data, board_id):
+        """Publica el delta de una operación aplicada (obj y data son None si se eliminó)."""
+        pass
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        operations = request.data.get('operations')
+        if not isinstance(operations, list) or not operations:
+            return Response({"detail": "operations requerido"}, status=400)
+        if len(operations) > self.bulk_max_operations:
+            return Response({"detail": f"Máximo {self.bulk_max_operations} operaciones por lote."}, status=400)
+
+        model = self.get_serializer_class().Meta.model
+        parent = self.bulk_parent_field
+        ids = []
+        for op in operations:
+            if isinstance(op, dict) and op.get('op') in ('update', 'move', 'delete'):
+                try:
+                    ids.append(int(op.get('id')))
+                except (TypeError, ValueError):
+                    pass
+        existing = self.get_queryset().in_bulk(ids)
+
+        errors = {}
+        creates, updates, moves, deletes = [], [], [], []
+        for i, op in enumerate(operations):
+            kind = op.get('op') if isinstance(op, dict) else None
+            if kind == 'create':
+                serializer = self.get_serializer(data=op.get('data') or {})
+                if serializer.is_valid():
+                    self.check_parent_board(request, serializer.validated_data)
+                    creates.append((i, serializer))
+                else:
+                    errors[i] = serializer.errors
+                continue
+            if kind not in ('update', 'move', 'delete'):
+                errors[i] = {"op": "Operación desconocida"}
+                continue
+            try:
+                obj = existing.get(int(op.get('id')))
+            except (TypeError, ValueError):
+                obj = None
+            if obj is None:
+                errors[i] = {"id": "No existe"}
+                continue
+            self.check_object_permissions(request, obj)
+            if kind == 'update':
+                serializer = self.get_serializer(obj, data=op.get('data') or {}, partial=True)
+                if serializer.is_valid():
+                    self.check_parent_board(request, serializer.validated_data)
+                    updates.append((i, obj, serializer))
+                else:
+                    errors[i] = serializer.errors
+            elif kind == 'move':
+                try:
+                    index = max(0, int(op.get('position')))
+                except (TypeError, ValueError):
+                    errors[i] = {"position": "position inválida"}
+                    continue
+                target, error = self.bulk_resolve_move(obj, op.get(parent, getattr(obj, f'{parent}_id')))
+                if error:
+                    errors[i] = error
+                else:
+                    moves.append((i, obj, target, index))
+            else:
+                deletes.append((i, obj))
+
+        if errors:
+            return Response({
+                "detail": "Ninguna operación fue aplicada.",
+                "errors": [{"index": i, "errors": e} for i, e in sorted(errors.items())],
+            }, status=400)
+
+        results = [None] * len(operations)
+        activities = []
+        deleted_boards = {}
+        with serialized_write():
+            created = self._bulk_create(model, creates)
+            for (i, _), obj in zip(creates, created):
+                # bulk_create/bulk_update no disparan señales: se envían a mano para que
+                # los receptores (versión del tablero, índice de búsqueda) vean el cambio
+                post_save.send(sender=model, instance=obj, created=True)
+                results[i] = ('create', obj.pk, obj, 201)
+                activities.append(self.bulk_activity('created', obj))
+
+            self._bulk_update(model, updates)
+            for i, obj, _ in updates:
+                post_save.send(sender=model, instance=obj, created=False)
+                results[i] = ('update', obj.pk, obj, 200)
+                activities.append(self.bulk_activity('updated', obj))
+
+            for i, obj, target, index in moves:
+                setattr(obj, parent, target)
+                siblings = model.objects.filter(**{parent: target}).exclude(pk=obj.pk)
+                place(obj, siblings, index)
+                obj.save(update_fields=[parent, 'position'])
+                results[i] = ('move', obj.pk, obj, 200)
+                activities.append(self.bulk_activity('moved', obj))
+
+            if deletes:
+                for i, obj in deletes:
+                    results[i] = ('delete', obj.pk, None, 204)
+                    deleted_boards[obj.pk] = self.bulk_board_id(obj)
+                model.objects.filter(pk__in=[obj.pk for _, obj in deletes]).delete()
+
+            activity_log.enqueue(activities)
+
+        alive = [obj for _, _, obj, _ in results if obj is not None]
+        if self.bulk_prefetch:
+            prefetch_related_objects(alive, *self.bulk_prefetch)
+        out = []
+        for i, (kind, pk, obj, code) in enumerate(results):
+            entry = {"index": i, "op": kind, "id": pk, "status": code}
+            if obj is not None:
+                entry["data"] = self.get_serializer(obj).data
+            out.append(entry)
+            self.bulk_publish(self.bulk_event_names[kind], pk, obj, entry.get("data"), deleted_boards.get(pk))
+        return Response({"results": out}, status=200)
+
+    def _m2m_fields(self, model):
+        return {f.name: f for f in model._meta.many_to_many}
+
+    def _bulk_create(self, model, creates):
+        if not creates:
+            return []
+        m2m_fields = self._m2m_fields(model)
+        parent = self.bulk_parent_field
+        extra = self.bulk_create_kwargs()
+        objs, relations = [], []
+        next_position = {}
+        for _, serializer in creates:
+            data = dict(serializer.validated_data)
+            rel = {name: data.pop(name) for name in list(data) if name in m2m_fields}
+            obj = model(**data, **extra)
+            if parent and 'position' not in serializer.initial_data:
+                parent_id = getattr(obj, f'{parent}_id')
+                if parent_id in next_position:
+                    next_position[parent_id] += POSITION_GAP
+                else:
+                    next_position[parent_id] = append_position(model.objects.filter(**{f'{parent}_id': parent_id}))
+                obj.position = next_position[parent_id]
+            if isinstance(obj, BoardScoped):
+                obj.refresh_board()
+            objs.append(obj)
+            relations.append(rel)
+        model.objects.bulk_create(objs)
+
+        through_rows = defaultdict(list)
+        for obj, rel in zip(objs, relations):
+            for name, values in rel.items():
+                field = m2m_fields[name]
+                through = field.remote_field.through
+                for value in values:
+                    through_rows[through].append(through(**{
+                        f'{field.m2m_field_name()}_id': obj.pk,
+                        f'{field.m2m_reverse_field_name()}_id': value.pk,
+                    }))
+        for through, rows in through_rows.items():
+            through.objects.bulk_create(rows)
+        return objs
+
+    def _bulk_update(self, model, updates):
+        if not updates:
+            return
+        m2m_fields = self._m2m_fields(model)
+        fields = set()
+        objs = {}
+        for _, obj, serializer in updates:
+            for name, value in serializer.validated_data.items():
+                if name in m2m_fields:
+                    getattr(obj, name).set(value)
+                else:
+                    setattr(obj, name, value)
+                    fields.add(name)
+            objs[obj.pk] = obj
+        moved = []
+        if issubclass(model, BoardScoped) and model.board_parent in fields:
+            # bulk_update no pasa por save(): el tablero desnormalizado se copia aquí
+            fields.add('board')
+            moved = [(obj, obj.refresh_board()) for obj in objs.values()]
+        if fields:
+            model.objects.bulk_update(list(objs.values()), sorted(fields))
+        for obj, previous in moved:
+            if previous is not None:
+                obj.board_moved(previous)
@@ -0,0 +1,101 @@
+"""
+Capa de caché para las lecturas calientes de la API.
+
+Cada valor vive en un espacio de nombres ('user', 'membership', 'role', 'labels', 'snapshot',
+'revoked') con su propio TTL (settings.API_CACHE_TTLS). El backend es el caché de Django
+configurado en settings.API_CACHE_ALIAS: LocMemCache (LRU con MAX_ENTRIES) en
+desarrollo y tests, RedisCache en producción (la expulsión LRU la hace Redis con
+maxmemory-policy allkeys-lru). Los aciertos y fallos se cuentan por espacio en
+memoria del proceso (`metrics()`) y en api/prometheus.py.
+
+Las invalidaciones se hacen en los módulos dueños de cada dato mediante señales;
+`invalidate` borra de inmediato y de nuevo al confirmar la transacción, para que
+una lectura concurrente no deje guardado el valor anterior. Los valores se calculan
+siempre contra la base principal, nunca contra una réplica atrasada.
+"""
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from . import db_router, prometheus
+
+DEFAULT_TTLS = {
+    'user': 300,
+    'membership': 300,
+    'role': 600,
+    'labels': 600,
+    'snapshot': 600,
+    'revoked': 300,
+}
+
+_counters = defaultdict(lambda: {'hits': 0, 'misses': 0})
+_counters_lock = threading.Lock()
+
+
+def backend():
+    return caches[getattr(settings, 'API_CACHE_ALIAS', 'default')]
+
+
+def ttl(namespace):
+    return getattr(settings, 'API_CACHE_TTLS', {}).get(namespace, DEFAULT_TTLS.get(namespace, 300))
+
+
+def make_key(namespace, *parts):
+    return ':'.join([namespace, *map(str, parts)])
+
+
+def _count(namespace, hits=0, misses=0):
+    with _counters_lock:
+        counter = _counters[namespace]
+        counter['hits'] += hits
+        counter['misses'] += misses
+    prometheus.count_cache(namespace, hits, misses)
+
+
+def get_or_set(namespace, parts, compute):
+    """Valor cacheado de `make_key(namespace, *parts)`, calculándolo con `compute()` si falta."""
+    key = make_key(namespace, *parts)
+    value = backend().get(key)
+    if value is not None:
+        _count(namespace, hits=1)
+        return value
+    _count(namespace, misses=1)
+    with db_router.use_primary():
+        value = compute()
+    backend().set(key, value, ttl(namespace))
+    return value
+
+
+def get_many_or_set(namespace, ids, compute_many):
+    """
+    Versión por lotes: {id: valor} para `ids`, con `compute_many(faltantes)` -> {id: valor}
+    calculando todos los ausentes de una vez.
+    """
+    keys = {make_key(namespace, i): i for i in ids}
+    found = backend().get_many(list(keys))
+    values = {keys[k]: v for k, v in found.items()}
+    missing = [i for i in ids if i not in values]
+    _count(namespace, hits=len(values), misses=len(missing))
+    if missing:
+        with db_router.use_primary():
+            computed = compute_many(missing)
+        backend().set_many({make_key(namespace, i): computed[i] for i in missing}, ttl(namespace))
+        values.update(computed)
+    return values
+
+
+def invalidate(namespace, ids):
+    keys = [make_key(namespace, i) for i in ids]
+    if not keys:
+        return
+    backend().delete_many(keys)
+    transaction.on_commit(lambda: backend().delete_many(keys))
+
+
+def metrics():
+    """{espacio: {'hits', 'misses'}} acumulados en este proceso."""
+    with _counters_lock:
+        return {namespace: dict(counter) for namespace, counter in _counters.items()}
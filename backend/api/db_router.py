@@ -0,0 +1,78 @@
+"""
+Lecturas en réplica con "read-your-writes".
+
+`ReplicaMiddleware` marca los requests GET/HEAD/OPTIONS para leer de la base
+'replica' (si está configurada con DATABASE_REPLICA_URL). Tras una mutación exitosa,
+el mismo cliente (identificado por su cabecera Authorization) queda "pegado" a la
+principal durante REPLICA_STICKY_SECONDS para que vea sus propios cambios aunque la
+réplica vaya atrasada. Las escrituras, los hilos de fondo y todo lo que se calcula
+para guardarse en caché (`use_primary`) van siempre a la principal.
+"""
+import hashlib
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+from . import cache
+
+REPLICA = 'replica'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_read_db = ContextVar('read_db', default='default')
+
+
+def replica_enabled():
+    return REPLICA in settings.DATABASES
+
+
+@contextmanager
+def use_primary():
+    """Fuerza las lecturas del bloque a la base principal."""
+    token = _read_db.set('default')
+    try:
+        yield
+    finally:
+        _read_db.reset(token)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _read_db.get()
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
+
+
+def _sticky_key(request):
+    auth = request.META.get('HTTP_AUTHORIZATION')
+    if not auth:
+        return None
+    return cache.make_key('sticky', hashlib.sha256(auth.encode()).hexdigest()[:32])
+
+
+class ReplicaMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not replica_enabled():
+            return self.get_response(request)
+        key = _sticky_key(request)
+        if request.method in SAFE_METHODS:
+            sticky = key is not None and cache.backend().get(key) is not None
+            token = _read_db.set('default' if sticky else REPLICA)
+            try:
+                return self.get_response(request)
+            finally:
+                _read_db.reset(token)
+        response = self.get_response(request)
+        if key is not None and response.status_code < 400:
+            cache.backend().set(key, 1, getattr(settings, 'REPLICA_STICKY_SECONDS', 5))
+        return response
@@ -0,0 +1,162 @@
+"""
+Serialización de lectura rápida para listados grandes.
+
+`ValuesReader(CardSerializer)` compila una sola vez, a partir de los campos del
+serializer, las columnas de `values()` y una función por campo. Luego arma cada fila
+desde un dict de `values()`, sin instanciar serializers ni modelos, con la misma
+salida que `CardSerializer(...).data`:
+
+- clave foránea (PrimaryKeyRelatedField) -> el id que ya trae `values()`;
+- many=True de ids -> una consulta a la tabla intermedia por campo, ids ordenados;
+- serializer anidado (p. ej. UserSerializer en `actor`) -> columnas `actor__*` del
+  LEFT JOIN, o None si la relación es nula;
+- campos simples -> `field.to_representation` del propio campo de DRF.
+
+Un serializer con campos no soportados (SerializerMethodField, fuentes con '*'...)
+falla al compilar y la vista debe seguir usando DRF.
+
+`FastJSONRenderer` usa orjson si está instalado (`pip install orjson`) y produce los
+mismos bytes que el JSONRenderer de DRF (compacto, UTF-8, \\u2028/\\u2029 escapados);
+sin orjson, o con sangría pedida por el cliente, es el JSONRenderer normal.
+"""
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import relations, serializers
+from rest_framework.renderers import JSONRenderer
+
+from .instrumentation import span
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependencia opcional
+    orjson = None
+
+SIMPLE_FIELDS = (
+    serializers.BooleanField, serializers.CharField, serializers.ChoiceField, serializers.DateField,
+    serializers.DateTimeField, serializers.FloatField, serializers.IntegerField, serializers.JSONField,
+    serializers.ReadOnlyField,
+)
+
+
+def _simple(column, field):
+    represent = field.to_representation
+
+    def build(row):
+        value = row[column]
+        return None if value is None else represent(value)
+    return build
+
+
+def _key(column):
+    return lambda row: row[column]
+
+
+def _nested(pk_column, fields):
+    def build(row):
+        if row[pk_column] is None:
+            return None
+        return {name: build_field(row) for name, build_field in fields}
+    return build
+
+
+class ValuesReader:
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+        self._compiled = False
+
+    def _compile(self):
+        if self._compiled:
+            return
+        self.columns = []
+        self.many = []  # (nombre, campo m2m del modelo)
+        model = self.serializer_class.Meta.model
+        self.pk = model._meta.pk.attname
+        self._column(self.pk)
+        self.fields = self._fields(self.serializer_class(), model, prefix='')
+        self._compiled = True
+
+    def _column(self, column):
+        if column not in self.columns:
+            self.columns.append(column)
+        return column
+
+    def _fields(self, serializer, model, prefix):
+        out = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if field.source == '*':
+                raise ImproperlyConfigured(f"{self.serializer_class.__name__}.{name}: source='*' no soportado")
+            source = prefix + '__'.join(field.source_attrs)
+            if isinstance(field, relations.ManyRelatedField) and not prefix:
+                if type(field.child_relation) is not relations.PrimaryKeyRelatedField or field.child_relation.pk_field:
+                    raise ImproperlyConfigured(f"{self.serializer_class.__name__}.{name}: relación many no soportada")
+                self.many.append((name, model._meta.get_field(source)))
+                out.append((name, None))
+            elif type(field) is relations.PrimaryKeyRelatedField and not field.pk_field:
+                out.append((name, _key(self._column(source))))
+            elif isinstance(field, serializers.Serializer) and not isinstance(field, serializers.ListSerializer):
+                related = model._meta.get_field(field.source_attrs[-1]).related_model
+                pk_column = self._column(f'{source}__{related._meta.pk.attname}')
+                out.append((name, _nested(pk_column, self._fields(field, related, prefix=f'{source}__'))))
+            elif isinstance(field, SIMPLE_FIELDS) and not isinstance(field, serializers.SerializerMethodField):
+                out.append((name, _simple(self._column(source), field)))
+            else:
+                raise ImproperlyConfigured(
+                    f"{self.serializer_class.__name__}.{name}: {type(field).__name__} no soportado en lectura rápida"
+                )
+        return out
+
+    def values(self, queryset):
+        """Queryset de dicts con las columnas necesarias (sin prefetch, que no aplica a values())."""
+        self._compile()
+        return queryset.prefetch_related(None).values(*self.columns)
+
+    def _related_ids(self, m2m, ids):
+        # Una consulta por campo, como prefetch_related: el número de consultas no
+        # depende de la cantidad de filas
+        through = m2m.remote_field.through
+        source, target = f'{m2m.m2m_field_name()}_id', f'{m2m.m2m_reverse_field_name()}_id'
+        related = {pk: [] for pk in ids}
+        pairs = through.objects.filter(**{f'{source}__in': ids}).order_by(source, target).values_list(source, target)
+        for owner, value in pairs:
+            related[owner].append(value)
+        return related
+
+    def to_data(self, rows):
+        """Lista de dicts de salida para filas de `values()`."""
+        self._compile()
+        with span('serialize'):
+            many = {}
+            if self.many and rows:
+                ids = [row[self.pk] for row in rows]
+                many = {name: self._related_ids(m2m, ids) for name, m2m in self.many}
+            fields = self.fields
+            pk = self.pk
+            out = []
+            for row in rows:
+                item = {}
+                for name, build in fields:
+                    item[name] = build(row) if build is not None else many[name][row[pk]]
+                out.append(item)
+            return out
+
+    def data(self, queryset):
+        return self.to_data(list(self.values(queryset)))
+
+
+def _unsupported(obj):
+    raise TypeError
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            rendered = orjson.dumps(data, default=_unsupported, option=orjson.OPT_PASSTHROUGH_DATETIME)
+        except TypeError:
+            # Tipos que orjson no conoce o formatea distinto (fechas): el encoder de DRF
+            return super().render(data, accepted_media_type, renderer_context)
+        return rendered.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
@@ -0,0 +1,196 @@
+"""
+Métricas por request: consultas y tiempo de base de datos, autenticación, permisos,
+serialización y total.
+
+`RequestMetricsMiddleware` (el primero de MIDDLEWARE) muestrea una fracción de los
+requests (REQUEST_METRICS['SAMPLE_RATE']). En los muestreados:
+
+- envuelve las conexiones con `execute_wrapper` para contar y cronometrar cada consulta;
+- las vistas (TimedViewMixin) y los serializers (api/serializers.py) suman sus tramos con `span()`;
+- agrega la cabecera `Server-Timing` (los tramos pueden incluir tiempo de db) y una
+  línea JSON en el logger `api.requests`;
+- marca como duplicadas (forma N+1) las SELECT idénticas repetidas DUPLICATE_THRESHOLD
+  veces o más.
+
+Todo request que supere SLOW_MS se registra en `api.requests.slow`; si estaba
+muestreado incluye las consultas más lentas y las duplicadas. Sin muestreo el costo es
+tomar dos tiempos y leer una ContextVar por tramo. Las respuestas en streaming se miden
+hasta que la vista devuelve la respuesta, no hasta el último byte.
+"""
+import json
+import logging
+import random
+import time
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('api.requests')
+slow_logger = logging.getLogger('api.requests.slow')
+
+DEFAULTS = {
+    'SAMPLE_RATE': 0.0,
+    'SLOW_MS': 500,
+    'DUPLICATE_THRESHOLD': 3,
+    'SLOW_SQL_LIMIT': 10,
+    'SERVER_TIMING': True,
+}
+
+_current = ContextVar('request_metrics', default=None)
+
+
+def config(name):
+    return getattr(settings, 'REQUEST_METRICS', {}).get(name, DEFAULTS[name])
+
+
+def current():
+    """Métricas del request en curso, o None si no está muestreado."""
+    return _current.get()
+
+
+class _Span:
+    __slots__ = ('metrics', 'name', 'began')
+
+    def __init__(self, metrics, name):
+        self.metrics, self.name = metrics, name
+
+    def __enter__(self):
+        self.began = None
+        if self.name not in self.metrics.open_spans:
+            # Solo cuenta el tramo más externo (serializers anidados, listas)
+            self.metrics.open_spans.add(self.name)
+            self.began = time.perf_counter()
+
+    def __exit__(self, *exc):
+        if self.began is not None:
+            self.metrics.open_spans.discard(self.name)
+            self.metrics.add(self.name, time.perf_counter() - self.began)
+
+
+class _NoSpan:
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name):
+    """Context manager que suma la duración del bloque al tramo `name` del request."""
+    metrics = _current.get()
+    return _NO_SPAN if metrics is None else _Span(metrics, name)
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.spans = {}
+        self.open_spans = set()
+        self.queries = []  # (sql, segundos)
+
+    def add(self, name, seconds):
+        self.spans[name] = self.spans.get(name, 0.0) + seconds
+
+    def execute(self, execute, sql, params, many, context):
+        began = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - began))
+
+    @property
+    def db_seconds(self):
+        return sum(seconds for _, seconds in self.queries)
+
+    def duplicates(self):
+        """{sql: veces} de las SELECT repetidas con el mismo texto (mismos %s, otros parámetros)."""
+        threshold = config('DUPLICATE_THRESHOLD')
+        counts = Counter(sql for sql, _ in self.queries if sql.lstrip()[:6].upper() == 'SELECT')
+        return {sql: n for sql, n in counts.items() if n >= threshold}
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 2)
+
+
+def server_timing(metrics, total):
+    parts = [f'db;dur={_ms(metrics.db_seconds)};desc="{len(metrics.queries)} queries"']
+    parts += [f'{name};dur={_ms(seconds)}' for name, seconds in sorted(metrics.spans.items())]
+    duplicated = sum(metrics.duplicates().values())
+    if duplicated:
+        parts.append(f'dup;desc="{duplicated} repeated queries"')
+    parts.append(f'total;dur={_ms(total)}')
+    return ', '.join(parts)
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        began = time.perf_counter()
+        rate = config('SAMPLE_RATE')
+        if not rate or random.random() >= rate:
+            response = self.get_response(request)
+            total = time.perf_counter() - began
+            if total * 1000 >= config('SLOW_MS'):
+                slow_logger.warning(json.dumps(self._summary(request, response, total)))
+            return response
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics.execute))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total = time.perf_counter() - began
+
+        if config('SERVER_TIMING'):
+            response['Server-Timing'] = server_timing(metrics, total)
+        summary = self._summary(request, response, total, metrics)
+        logger.info(json.dumps(summary))
+        if total * 1000 >= config('SLOW_MS'):
+            slowest = sorted(metrics.queries, key=lambda q: q[1], reverse=True)[:config('SLOW_SQL_LIMIT')]
+            summary['slowest_sql'] = [{'sql': sql, 'ms': _ms(seconds)} for sql, seconds in slowest]
+            summary['duplicate_sql'] = [{'sql': sql, 'count': n} for sql, n in metrics.duplicates().items()]
+            slow_logger.warning(json.dumps(summary))
+        return response
+
+    def _summary(self, request, response, total, metrics=None):
+        summary = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'total_ms': _ms(total),
+            'sampled': metrics is not None,
+        }
+        if metrics is not None:
+            summary['queries'] = len(metrics.queries)
+            summary['db_ms'] = _ms(metrics.db_seconds)
+            summary.update({f'{name}_ms': _ms(seconds) for name, seconds in metrics.spans.items()})
+            summary['duplicate_queries'] = sum(metrics.duplicates().values())
+        return summary
+
+
+class TimedViewMixin:
+    """Mide autenticación y permisos de una vista DRF como tramos 'auth' y 'perm'."""
+
+    def perform_authentication(self, request):
+        with span('auth'):
+            super().perform_authentication(request)
+
+    def check_permissions(self, request):
+        with span('perm'):
+            super().check_permissions(request)
+
+    def check_object_permissions(self, request, obj):
+        with span('perm'):
+            super().check_object_permissions(request, obj)
@@ -0,0 +1,75 @@
+"""
+Lecturas pequeñas y muy frecuentes, cacheadas en api/cache.py:
+
+- usuario por id (autenticación JWT), espacio 'user', invalidado al guardar o borrar User;
+- rol del usuario ('teacher'/'student'), espacio 'role', invalidado al guardar Profile;
+- etiquetas de cada tablero ya serializadas, espacio 'labels', invalidadas al
+  guardar o borrar una Label.
+"""
+from collections import defaultdict
+
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from . import cache
+from django.contrib.auth.models import User
+
+from .models import Label, Profile
+
+
+def user_by_id(user_id):
+    """User cacheado; None si no existe (el None no se cachea)."""
+    return cache.get_or_set('user', (user_id,), lambda: User.objects.filter(pk=user_id).first())
+
+
+def role_of(user):
+    """Rol del usuario; 'student' si no tiene perfil."""
+    if user is None or not user.is_authenticated:
+        return None
+    role = getattr(user, '_role', None)
+    if role is None:
+        role = cache.get_or_set('role', (user.pk,), lambda: (
+            Profile.objects.filter(user_id=user.pk).values_list('role', flat=True).first() or 'student'
+        ))
+        user._role = role
+    return role
+
+
+def labels_for_boards(board_ids):
+    """Etiquetas serializadas de los tableros dados, en orden de tablero e id (una consulta si falta alguno)."""
+    from .serializers import LabelSerializer
+
+    def compute(missing):
+        out = defaultdict(list)
+        for label in Label.objects.filter(board_id__in=missing).order_by('id'):
+            out[label.board_id].append(dict(LabelSerializer(label).data))
+        return {board_id: out[board_id] for board_id in missing}
+
+    by_board = cache.get_many_or_set('labels', sorted(board_ids), compute)
+    return [label for board_id in sorted(by_board) for label in by_board[board_id]]
+
+
+def _on_user_changed(sender, instance, **kwargs):
+    cache.invalidate('user', [instance.pk])
+
+
+def _on_profile_changed(sender, instance, **kwargs):
+    cache.invalidate('role', [instance.user_id])
+
+
+def _on_label_pre_save(sender, instance, **kwargs):
+    # Si la etiqueta cambia de tablero hay que invalidar también el anterior
+    if instance.pk:
+        instance._previous_board_id = Label.objects.filter(pk=instance.pk).values_list('board_id', flat=True).first()
+
+
+def _on_label_changed(sender, instance, **kwargs):
+    cache.invalidate('labels', {instance.board_id, getattr(instance, '_previous_board_id', instance.board_id)})
+
+
+post_save.connect(_on_user_changed, sender=User, dispatch_uid='user-cache-save')
+post_delete.connect(_on_user_changed, sender=User, dispatch_uid='user-cache-delete')
+post_save.connect(_on_profile_changed, sender=Profile, dispatch_uid='role-cache-save')
+post_delete.connect(_on_profile_changed, sender=Profile, dispatch_uid='role-cache-delete')
+pre_save.connect(_on_label_pre_save, sender=Label, dispatch_uid='labels-cache-pre-save')
+post_save.connect(_on_label_changed, sender=Label, dispatch_uid='labels-cache-save')
+post_delete.connect(_on_label_changed, sender=Label, dispatch_uid='labels-cache-delete')
@@ -0,0 +1,25 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.retention import archive, retention_days
+
+
+class Command(BaseCommand):
+    help = "Compacta la actividad antigua y la mueve a archivos JSONL comprimidos por tablero y semestre"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=None, help="Conservar en la tabla los últimos N días")
+        parser.add_argument("--board", type=int, action="append", help="Solo estos tableros (repetible)")
+        parser.add_argument("--dry-run", action="store_true", help="Solo informar qué se archivaría")
+
+    def handle(self, *args, **options):
+        days = options["days"] if options["days"] is not None else retention_days()
+        before = timezone.now() - timedelta(days=days)
+        totals = archive(before, board_ids=options["board"], dry_run=options["dry_run"])
+        prefix = "[dry-run] " if options["dry_run"] else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}{totals['archived']} eventos anteriores a {before:%Y-%m-%d} -> "
+            f"{totals['written']} en {totals['segments']} segmentos."
+        ))
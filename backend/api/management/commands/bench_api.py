@@ -0,0 +1,194 @@
+import json
+import logging
+import random
+import subprocess
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.authentication import add_user_claims
+from api.models import Board, Card, Label, List
+
+from .seed_benchmark import PASSWORD, WORDS
+
+SCENARIOS = ("open_board", "filter_cards", "move_cards", "comment", "calendar", "login")
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(p / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+class Fixture:
+    """Datos sembrados que usan los escenarios (tableros, listas, tarjetas y miembros)."""
+
+    def __init__(self, prefix):
+        users = dict(User.objects.filter(username__startswith=f"{prefix}-u").values_list('id', 'username'))
+        if not users:
+            raise CommandError(f"No hay datos con prefijo '{prefix}'. Ejecutar antes seed_benchmark.")
+        self.usernames = users
+        self.boards = list(Board.objects.filter(owner_id__in=users).values_list('id', flat=True))
+        self.members = {}
+        for board_id, user_id in Board.members.through.objects.filter(board_id__in=self.boards).values_list('board_id', 'user_id'):
+            self.members.setdefault(board_id, []).append(user_id)
+        self.lists = {}
+        for list_id, board_id in List.objects.filter(board_id__in=self.boards).values_list('id', 'board_id'):
+            self.lists.setdefault(board_id, []).append(list_id)
+        self.cards = {}
+        for card_id, board_id in Card.objects.filter(board_id__in=self.boards).values_list('id', 'board_id'):
+            self.cards.setdefault(board_id, []).append(card_id)
+        self.labels = {}
+        for label_id, board_id in Label.objects.filter(board_id__in=self.boards).values_list('id', 'board_id'):
+            self.labels.setdefault(board_id, []).append(label_id)
+        self._tokens = {}
+        self._lock = threading.Lock()
+
+    def token(self, user_id):
+        with self._lock:
+            if user_id not in self._tokens:
+                user = User.objects.get(pk=user_id)
+                self._tokens[user_id] = str(add_user_claims(RefreshToken.for_user(user), user).access_token)
+            return self._tokens[user_id]
+
+
+class Command(BaseCommand):
+    help = (
+        "Escenarios de carga sobre los datos de seed_benchmark: latencia p50/p95/p99, consultas por "
+        "request y throughput. --output guarda el resultado (con el commit) y --compare muestra la diferencia."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="Repetible; por defecto todos")
+        parser.add_argument("--requests", type=int, default=200, help="Requests por escenario")
+        parser.add_argument("--warmup", type=int, default=10)
+        parser.add_argument("--concurrency", type=int, default=1, help="Hilos por escenario")
+        parser.add_argument("--prefix", default="bench")
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--output", help="Archivo JSON donde guardar los resultados")
+        parser.add_argument("--compare", help="Resultados JSON anteriores para comparar")
+
+    def handle(self, *args, **o):
+        logging.getLogger('django.request').setLevel(logging.ERROR)
+        fixture = Fixture(o["prefix"])
+        results = {}
+        for name in o["scenario"] or SCENARIOS:
+            results[name] = self._run(name, fixture, o)
+        self._print(results, o["compare"])
+        if o["output"]:
+            payload = {"commit": self._commit(), "date": timezone.now().isoformat(), "options": {
+                k: o[k] for k in ("requests", "warmup", "concurrency", "prefix", "seed")
+            }, "results": results}
+            with open(o["output"], "w", encoding="utf-8") as fh:
+                json.dump(payload, fh, indent=2)
+            self.stdout.write(f"Resultados guardados en {o['output']}")
+
+    # -----------------------
+    # ESCENARIOS
+    # -----------------------
+    def _request(self, name, client, fx, rnd):
+        board = rnd.choice(fx.boards)
+        user_id = rnd.choice(fx.members[board])
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {fx.token(user_id)}")
+        if name == "open_board":
+            return client.get(f"/api/api/boards/{board}/snapshot/")
+        if name == "filter_cards":
+            params = rnd.choice([
+                {"label": rnd.choice(fx.labels.get(board) or [0])},
+                {"assignee": user_id},
+                {"due_before": (timezone.now() + timedelta(days=7)).isoformat()},
+                {"search": rnd.choice(WORDS)},
+            ])
+            return client.get("/api/api/cards/", params)
+        if name == "move_cards":
+            payload = {"list": rnd.choice(fx.lists[board]), "position": rnd.randint(0, 20)}
+            return client.patch(f"/api/api/cards/{rnd.choice(fx.cards[board])}/move/", payload, format="json")
+        if name == "comment":
+            payload = {"card": rnd.choice(fx.cards[board]), "content": " ".join(rnd.choices(WORDS, k=6))}
+            return client.post("/api/api/comments/", payload, format="json")
+        if name == "calendar":
+            today = timezone.localdate()
+            return client.get("/api/api/cards/calendar/", {"from": today.isoformat(), "to": (today + timedelta(days=30)).isoformat()})
+        client.credentials()
+        return client.post("/api/token/", {"username": fx.usernames[user_id], "password": PASSWORD}, format="json")
+
+    def _run(self, name, fx, o):
+        latencies, queries, failures = [], [], []
+        lock = threading.Lock()
+        per_thread = max(1, o["requests"] // o["concurrency"])
+
+        def worker(index):
+            rnd = random.Random(o["seed"] * 1000 + index)
+            client = APIClient(HTTP_HOST='localhost')
+            for _ in range(o["warmup"]):
+                self._request(name, client, fx, rnd)
+            for _ in range(per_thread):
+                with CaptureQueriesContext(connection) as captured:
+                    began = time.perf_counter()
+                    response = self._request(name, client, fx, rnd)
+                    if hasattr(response, 'streaming_content'):
+                        b"".join(response.streaming_content)
+                    elapsed = time.perf_counter() - began
+                with lock:
+                    latencies.append(elapsed * 1000)
+                    queries.append(len(captured))
+                    if response.status_code >= 400:
+                        failures.append(response.status_code)
+            connections.close_all()
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(o["concurrency"])]
+        began = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        wall = time.perf_counter() - began
+        return {
+            "requests": len(latencies),
+            "errors": len(failures),
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+            "queries_avg": round(sum(queries) / len(queries), 2) if queries else 0,
+            "queries_max": max(queries, default=0),
+            "throughput_rps": round(len(latencies) / wall, 1) if wall else 0,
+        }
+
+    # -----------------------
+    # SALIDA
+    # -----------------------
+    def _commit(self):
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"], cwd=settings.BASE_DIR,
+                capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def _print(self, results, compare):
+        previous = {}
+        if compare:
+            with open(compare, encoding="utf-8") as fh:
+                previous = json.load(fh).get("results", {})
+        columns = ("p50_ms", "p95_ms", "p99_ms", "queries_avg", "throughput_rps", "errors")
+        self.stdout.write(f"{'escenario':<14}" + "".join(f"{c:>16}" for c in columns))
+        for name, row in results.items():
+            cells = []
+            for c in columns:
+                cell = f"{row[c]}"
+                if name in previous and c in previous[name]:
+                    cell += f" ({row[c] - previous[name][c]:+.1f})"
+                cells.append(f"{cell:>16}")
+            self.stdout.write(f"{name:<14}" + "".join(cells))
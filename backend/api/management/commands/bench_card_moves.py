@@ -0,0 +1,111 @@
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, connections
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+
+from api.models import Board, Card, List
+from api.sqlite import DEFAULT_PRAGMAS
+
+
+@contextmanager
+def sqlite_profile(tuned):
+    """Aplica el perfil indicado a las conexiones que se abran dentro del bloque."""
+    options = connections.settings['default'].setdefault('OPTIONS', {})
+    saved = dict(options)
+    if tuned:
+        pragmas = DEFAULT_PRAGMAS
+    else:
+        # Valores por defecto de SQLite/Django: journal DELETE, BEGIN diferido, 5 s de espera
+        pragmas = {'journal_mode': 'DELETE', 'synchronous': 'FULL'}
+        options.pop('transaction_mode', None)
+        options['timeout'] = 5
+    connections.close_all()
+    try:
+        with override_settings(SQLITE_TUNED=True, SQLITE_PRAGMAS=pragmas, SQLITE_SERIALIZE_WRITES=tuned):
+            yield
+    finally:
+        options.clear()
+        options.update(saved)
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide el throughput de movimientos de tarjetas concurrentes con y sin el perfil SQLite. "
+        "Crea y luego borra un tablero temporal en la base configurada."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--moves", type=int, default=50, help="Movimientos por hilo")
+        parser.add_argument("--cards", type=int, default=40)
+        parser.add_argument("--profile", choices=["both", "tuned", "default"], default="both")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            self.stderr.write("La base configurada no es SQLite; se mide igual pero sin perfiles.")
+        profiles = {"both": [False, True], "tuned": [True], "default": [False]}[options["profile"]]
+        user = User.objects.create_user(f"bench-{int(time.time())}", password=None)
+        board = Board.objects.create(name="bench", owner=user)
+        board.members.add(user)
+        lists = [List.objects.create(board=board, title=f"l{i}", position=i) for i in range(3)]
+        cards = Card.objects.bulk_create([
+            Card(list=lists[i % 3], board=board, title=f"c{i}", position=i * 1024, created_by=user)
+            for i in range(options["cards"])
+        ])
+        card_ids = [c.id for c in cards]
+        list_ids = [l.id for l in lists]
+        try:
+            for tuned in profiles:
+                if connection.vendor == 'sqlite':
+                    with sqlite_profile(tuned):
+                        result = self._run(user, card_ids, list_ids, options)
+                else:
+                    result = self._run(user, card_ids, list_ids, options)
+                name = "perfil SQLite" if tuned else "por defecto"
+                self.stdout.write(
+                    f"{name:>14}: {result['ok']} ok, {result['errors']} errores, "
+                    f"{result['elapsed']:.2f} s, {result['ok'] / result['elapsed']:.1f} mov/s"
+                )
+        finally:
+            board.delete()
+            user.delete()
+
+    def _run(self, user, card_ids, list_ids, options):
+        counts = {"ok": 0, "errors": 0}
+        lock = threading.Lock()
+        start = threading.Barrier(options["threads"])
+
+        def worker(seed):
+            rnd = random.Random(seed)
+            client = APIClient(HTTP_HOST='localhost')
+            client.force_authenticate(user)
+            start.wait()
+            for _ in range(options["moves"]):
+                payload = {"list": rnd.choice(list_ids), "position": rnd.randint(0, 20)}
+                try:
+                    response = client.patch(f"/api/api/cards/{rnd.choice(card_ids)}/move/", payload, format="json")
+                    ok = response.status_code == 200
+                except OperationalError:
+                    ok = False
+                with lock:
+                    counts["ok" if ok else "errors"] += 1
+            connections.close_all()
+
+        # Los "database is locked" se cuentan como errores; no hace falta su traceback
+        logging.getLogger('django.request').setLevel(logging.CRITICAL)
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(options["threads"])]
+        began = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        counts["elapsed"] = time.perf_counter() - began
+        return counts
@@ -0,0 +1,64 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models
+from rest_framework.renderers import JSONRenderer
+
+from api.fast_serialization import FastJSONRenderer, ValuesReader, orjson
+from api.models import Activity, Card, Label
+from api.serializers import ActivitySerializer, CardSerializer, UserSerializer
+
+# nombre -> (serializer, queryset como lo arma la vista)
+CASES = {
+    'cards': (CardSerializer, lambda: Card.objects.prefetch_related(
+        models.Prefetch('labels', queryset=Label.objects.only('id').order_by('id')),
+        models.Prefetch('assignees', queryset=User.objects.only('id').order_by('id')),
+    ).order_by('position', 'id')),
+    'activities': (ActivitySerializer, lambda: Activity.objects.select_related('actor').order_by('-created_at', '-id')),
+    'users': (UserSerializer, lambda: User.objects.order_by('username', 'id')),
+}
+
+
+def best_of(repeat, fn):
+    best, result = None, None
+    for _ in range(repeat):
+        began = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - began
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara el costo por fila de serializar y renderizar listados con DRF y con la lectura "
+        "rápida (values() + FastJSONRenderer), y verifica que el JSON sea idéntico byte a byte."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--case", action="append", choices=list(CASES), help="Repetible; por defecto todos")
+        parser.add_argument("--rows", type=int, default=2000, help="Filas por listado")
+        parser.add_argument("--repeat", type=int, default=5, help="Se toma la mejor de N vueltas")
+
+    def handle(self, *args, **o):
+        if orjson is None:
+            self.stderr.write("orjson no está instalado: FastJSONRenderer usa el JSONRenderer de DRF.")
+        slow_renderer, fast_renderer = JSONRenderer(), FastJSONRenderer()
+        self.stdout.write(f"{'listado':<12}{'filas':>8}{'drf µs/fila':>14}{'rápida µs/fila':>16}{'mejora':>9}")
+        for name in o["case"] or CASES:
+            serializer_class, queryset = CASES[name]
+            reader = ValuesReader(serializer_class)
+            qs = queryset()[:o["rows"]]
+            rows = qs.count()
+            if not rows:
+                self.stdout.write(f"{name:<12}{0:>8}  sin datos (ejecutar antes seed_benchmark)")
+                continue
+            # Mismo trabajo que la vista: consulta, serialización y render
+            slow, slow_bytes = best_of(o["repeat"], lambda: slow_renderer.render(serializer_class(qs.all(), many=True).data))
+            fast, fast_bytes = best_of(o["repeat"], lambda: fast_renderer.render(reader.data(qs.all())))
+            if slow_bytes != fast_bytes:
+                raise CommandError(f"{name}: la lectura rápida no produce el mismo JSON que {serializer_class.__name__}")
+            self.stdout.write(
+                f"{name:<12}{rows:>8}{slow / rows * 1e6:>14.1f}{fast / rows * 1e6:>16.1f}{slow / fast:>8.1f}x"
+            )
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from api.activity_log import recover
+
+
+class Command(BaseCommand):
+    help = "Guarda la actividad que quedó en los spools de procesos terminados"
+
+    def handle(self, *args, **options):
+        saved = recover()
+        self.stdout.write(self.style.SUCCESS(f"Actividades recuperadas: {saved}."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from api.sync import prune
+
+
+class Command(BaseCommand):
+    help = "Borra del registro de sincronización los cambios más antiguos que SYNC_LOG_RETENTION_DAYS"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=None, help="Conservar los últimos N días")
+
+    def handle(self, *args, **options):
+        deleted = prune(options["days"])
+        self.stdout.write(self.style.SUCCESS(f"{deleted} cambios borrados del registro de sincronización."))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from api.models import Board
+from api.stats import rebuild
+
+
+class Command(BaseCommand):
+    help = "Recalcula desde cero las estadísticas precalculadas (BoardStat) de todos los tableros"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=100, help="Tableros por lote")
+
+    def handle(self, *args, **options):
+        chunk = options["chunk_size"]
+        ids = list(Board.objects.order_by("id").values_list("id", flat=True))
+        for start in range(0, len(ids), chunk):
+            rebuild(ids[start:start + chunk])
+        self.stdout.write(self.style.SUCCESS(f"Estadísticas recalculadas ({len(ids)} tableros)."))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from api.models import Card, CardSearchDocument
+from api.search import reindex
+
+
+class Command(BaseCommand):
+    help = "Reconstruye el índice de búsqueda de tarjetas (título, descripción, comentarios, checklist)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        chunk = options["chunk_size"]
+        CardSearchDocument.objects.all().delete()
+        ids = list(Card.objects.order_by("id").values_list("id", flat=True))
+        for start in range(0, len(ids), chunk):
+            reindex(ids[start:start + chunk])
+        self.stdout.write(self.style.SUCCESS(f"Índice de búsqueda reconstruido ({len(ids)} tarjetas)."))
@@ -0,0 +1,136 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from api import search, stats
+from api.models import PRIORITY_CHOICES, Activity, Board, Card, ChecklistItem, Comment, Label, List, Profile
+from api.ordering import POSITION_GAP
+
+PASSWORD = "Bench123!"
+WORDS = (
+    "tarea examen lectura proyecto laboratorio informe entrega ensayo práctica guía "
+    "química física cálculo álgebra programación estadística historia inglés bases datos"
+).split()
+PRIORITIES = tuple(value for value, _ in PRIORITY_CHOICES)
+ACTIONS = ("created", "updated", "moved", "commented")
+
+
+class Command(BaseCommand):
+    help = (
+        "Crea un conjunto de datos de benchmark reproducible (usuarios, tableros, listas, tarjetas, "
+        "comentarios, checklist y actividad) con bulk_create. Los usuarios son <prefijo>-u<N> / " + PASSWORD
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=50)
+        parser.add_argument("--boards", type=int, default=10)
+        parser.add_argument("--members", type=int, default=10, help="Miembros por tablero")
+        parser.add_argument("--lists", type=int, default=5, help="Listas por tablero")
+        parser.add_argument("--cards", type=int, default=40, help="Tarjetas por lista")
+        parser.add_argument("--comments", type=int, default=3, help="Comentarios por tarjeta")
+        parser.add_argument("--checklist", type=int, default=3, help="Ítems de checklist por tarjeta")
+        parser.add_argument("--activities", type=int, default=5, help="Actividades por tarjeta")
+        parser.add_argument("--labels", type=int, default=5, help="Etiquetas por tablero")
+        parser.add_argument("--days", type=int, default=120, help="Antigüedad máxima de la actividad")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--prefix", default="bench")
+        parser.add_argument("--reset", action="store_true", help="Borra antes los datos del mismo prefijo")
+
+    def handle(self, *args, **o):
+        rnd = random.Random(o["seed"])
+        prefix = o["prefix"]
+        if o["reset"]:
+            deleted = User.objects.filter(username__startswith=f"{prefix}-u").delete()[0]
+            self.stdout.write(f"Borrados {deleted} objetos del prefijo '{prefix}'.")
+        now = timezone.now()
+
+        with transaction.atomic():
+            password = make_password(PASSWORD)
+            users = User.objects.bulk_create([
+                User(username=f"{prefix}-u{i}", password=password, is_active=True) for i in range(o["users"])
+            ])
+            Profile.objects.bulk_create([
+                Profile(user=u, role="teacher" if i % 10 == 0 else "student") for i, u in enumerate(users)
+            ])
+            teachers = [u for i, u in enumerate(users) if i % 10 == 0] or users[:1]
+
+            boards = Board.objects.bulk_create([
+                Board(name=f"{prefix} tablero {i}", owner=rnd.choice(teachers)) for i in range(o["boards"])
+            ])
+            members, board_members = [], {}
+            for board in boards:
+                chosen = {board.owner_id} | {u.id for u in rnd.sample(users, min(o["members"], len(users)))}
+                board_members[board.id] = sorted(chosen)
+                members += [Board.members.through(board_id=board.id, user_id=uid) for uid in chosen]
+            Board.members.through.objects.bulk_create(members)
+
+            labels = Label.objects.bulk_create([
+                Label(board=board, name=f"etiqueta {j}", color=f"#{rnd.randrange(0x1000000):06x}")
+                for board in boards for j in range(o["labels"])
+            ])
+            labels_by_board = {}
+            for label in labels:
+                labels_by_board.setdefault(label.board_id, []).append(label.id)
+
+            lists = List.objects.bulk_create([
+                List(board=board, title=f"Lista {j}", position=(j + 1) * POSITION_GAP)
+                for board in boards for j in range(o["lists"])
+            ])
+            cards = Card.objects.bulk_create([
+                Card(
+                    list=lst,
+                    board_id=lst.board_id,
+                    title=" ".join(rnd.sample(WORDS, 3)).capitalize(),
+                    description=" ".join(rnd.choices(WORDS, k=12)),
+                    due_date=now + timedelta(days=rnd.randint(-30, 60)) if rnd.random() < 0.7 else None,
+                    priority=rnd.choice(PRIORITIES),
+                    position=(k + 1) * POSITION_GAP,
+                    created_by_id=rnd.choice(board_members[lst.board_id]),
+                )
+                for lst in lists for k in range(o["cards"])
+            ], batch_size=2000)
+            board_of_list = {lst.id: lst.board_id for lst in lists}
+
+            assignees, card_labels, comments, items, activities = [], [], [], [], []
+            for card in cards:
+                board_id = board_of_list[card.list_id]
+                pool = board_members[board_id]
+                for uid in rnd.sample(pool, min(2, len(pool))):
+                    assignees.append(Card.assignees.through(card_id=card.id, user_id=uid))
+                for lid in rnd.sample(labels_by_board.get(board_id, []), min(2, o["labels"])):
+                    card_labels.append(Card.labels.through(card_id=card.id, label_id=lid))
+                for _ in range(o["comments"]):
+                    comments.append(Comment(card=card, board_id=board_id, author_id=rnd.choice(pool), content=" ".join(rnd.choices(WORDS, k=8))))
+                for k in range(o["checklist"]):
+                    items.append(ChecklistItem(
+                        card=card, board_id=board_id, text=" ".join(rnd.sample(WORDS, 2)), done=rnd.random() < 0.5,
+                        position=(k + 1) * POSITION_GAP,
+                    ))
+                for _ in range(o["activities"]):
+                    activities.append(Activity(
+                        board_id=board_id, card=card, actor_id=rnd.choice(pool), action=rnd.choice(ACTIONS),
+                        meta={"card": card.id}, created_at=now - timedelta(minutes=rnd.randint(0, o["days"] * 1440)),
+                    ))
+            Card.assignees.through.objects.bulk_create(assignees, batch_size=5000)
+            Card.labels.through.objects.bulk_create(card_labels, batch_size=5000)
+            Comment.objects.bulk_create(comments, batch_size=5000)
+            ChecklistItem.objects.bulk_create(items, batch_size=5000)
+            Activity.objects.bulk_create(activities, batch_size=5000)
+
+            # bulk_create no dispara señales: índices derivados a mano
+            card_ids = [c.id for c in cards]
+            for start in range(0, len(card_ids), 1000):
+                search.reindex(card_ids[start:start + 1000])
+            stats.rebuild([b.id for b in boards])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Seed '{prefix}' (semilla {o['seed']}): {len(users)} usuarios, {len(boards)} tableros, "
+            f"{len(lists)} listas, {len(cards)} tarjetas, {len(comments)} comentarios, "
+            f"{len(items)} ítems de checklist, {len(activities)} actividades."
+        ))
+        self.stdout.write(f"  Contraseña de todos los usuarios: {PASSWORD}")
@@ -0,0 +1,26 @@
+import sqlite3
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from api.db_router import REPLICA, replica_enabled
+
+
+class Command(BaseCommand):
+    help = "Copia la base SQLite principal sobre la réplica (simula la replicación en desarrollo)"
+
+    def handle(self, *args, **options):
+        if not replica_enabled():
+            raise CommandError("No hay réplica configurada (DATABASE_REPLICA_URL).")
+        primary, replica = connections['default'], connections[REPLICA]
+        if primary.vendor != 'sqlite' or replica.vendor != 'sqlite':
+            raise CommandError("Solo para SQLite; en PostgreSQL la replicación la hace el servidor.")
+        replica.close()
+        source = sqlite3.connect(str(primary.settings_dict['NAME']))
+        target = sqlite3.connect(str(replica.settings_dict['NAME']))
+        try:
+            source.backup(target)
+        finally:
+            source.close()
+            target.close()
+        self.stdout.write(self.style.SUCCESS(f"Réplica actualizada: {replica.settings_dict['NAME']}"))
@@ -0,0 +1,65 @@
+"""
+Caché de pertenencia a tableros: usuario -> conjunto de ids de tablero.
+
+Se guarda en el propio objeto `request.user` (por request) y en la capa de caché
+(api/cache.py, espacio 'membership') entre requests. Se invalida al agregar/quitar miembros y al borrar tableros, de
+modo que los permisos y los querysets no consultan la tabla de miembros en el
+camino caliente.
+"""
+from django.db.models.signals import m2m_changed, post_delete, pre_delete
+
+from . import cache
+from .models import Board
+
+Membership = Board.members.through
+
+
+def board_ids_for(user):
+    """frozenset con los ids de los tableros de los que `user` es miembro."""
+    if user is None or not user.is_authenticated:
+        return frozenset()
+    ids = getattr(user, '_board_ids', None)
+    if ids is not None:
+        return ids
+    ids = cache.get_or_set('membership', (user.pk,), lambda: frozenset(
+        Membership.objects.filter(user_id=user.pk).values_list('board_id', flat=True)
+    ))
+    user._board_ids = ids
+    return ids
+
+
+def is_member(user, board_id):
+    return board_id is not None and board_id in board_ids_for(user)
+
+
+def invalidate(user_ids):
+    cache.invalidate('membership', list(user_ids))
+
+
+def _on_members_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear':
+        if reverse:
+            instance._cleared_member_ids = {instance.pk}
+        else:
+            instance._cleared_member_ids = set(
+                Membership.objects.filter(board_id=instance.pk).values_list('user_id', flat=True)
+            )
+    elif action == 'post_clear':
+        invalidate(getattr(instance, '_cleared_member_ids', ()))
+    elif action in ('post_add', 'post_remove'):
+        invalidate([instance.pk] if reverse else pk_set or ())
+
+
+def _on_board_pre_delete(sender, instance, **kwargs):
+    instance._deleted_member_ids = list(
+        Membership.objects.filter(board_id=instance.pk).values_list('user_id', flat=True)
+    )
+
+
+def _on_board_deleted(sender, instance, **kwargs):
+    invalidate(getattr(instance, '_deleted_member_ids', ()))
+
+
+m2m_changed.connect(_on_members_changed, sender=Membership, dispatch_uid='board-membership-cache')
+pre_delete.connect(_on_board_pre_delete, sender=Board, dispatch_uid='board-membership-pre-delete')
+post_delete.connect(_on_board_deleted, sender=Board, dispatch_uid='board-membership-delete')
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:23
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_activity_actor_activity_meta_label_board_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='activity',
+            index=models.Index(fields=['board', '-created_at'], name='activity_board_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activity',
+            index=models.Index(fields=['card', '-created_at'], name='activity_card_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activity',
+            index=models.Index(fields=['-created_at', '-id'], name='activity_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='card',
+            index=models.Index(fields=['list', 'position'], name='card_list_position_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='card',
+            index=models.Index(fields=['due_date'], name='card_due_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='checklistitem',
+            index=models.Index(fields=['card', 'position'], name='checklist_card_position_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='list',
+            index=models.Index(fields=['board', 'position'], name='list_board_position_idx'),
+        ),
+    ]
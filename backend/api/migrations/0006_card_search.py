@@ -0,0 +1,114 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:32
+
+import unicodedata
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+SQLITE_FTS = [
+    "CREATE VIRTUAL TABLE api_card_fts USING fts5("
+    "title, body, content='api_cardsearchdocument', content_rowid='card_id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER api_card_fts_ai AFTER INSERT ON api_cardsearchdocument BEGIN "
+    "INSERT INTO api_card_fts(rowid, title, body) VALUES (new.card_id, new.title, new.body); END",
+    "CREATE TRIGGER api_card_fts_ad AFTER DELETE ON api_cardsearchdocument BEGIN "
+    "INSERT INTO api_card_fts(api_card_fts, rowid, title, body) VALUES ('delete', old.card_id, old.title, old.body); END",
+    "CREATE TRIGGER api_card_fts_au AFTER UPDATE ON api_cardsearchdocument BEGIN "
+    "INSERT INTO api_card_fts(api_card_fts, rowid, title, body) VALUES ('delete', old.card_id, old.title, old.body); "
+    "INSERT INTO api_card_fts(rowid, title, body) VALUES (new.card_id, new.title, new.body); END",
+]
+SQLITE_FTS_DROP = [
+    "DROP TRIGGER IF EXISTS api_card_fts_au",
+    "DROP TRIGGER IF EXISTS api_card_fts_ad",
+    "DROP TRIGGER IF EXISTS api_card_fts_ai",
+    "DROP TABLE IF EXISTS api_card_fts",
+]
+POSTGRES_FTS = [
+    "ALTER TABLE api_cardsearchdocument ADD COLUMN document tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('spanish', title), 'A') || setweight(to_tsvector('spanish', body), 'B')) STORED",
+    "CREATE INDEX api_cardsearch_document_gin ON api_cardsearchdocument USING GIN (document)",
+]
+POSTGRES_FTS_DROP = [
+    "DROP INDEX IF EXISTS api_cardsearch_document_gin",
+    "ALTER TABLE api_cardsearchdocument DROP COLUMN IF EXISTS document",
+]
+
+
+def _fts5_supported(connection):
+    with connection.cursor() as cursor:
+        try:
+            cursor.execute("CREATE VIRTUAL TABLE temp._fts5_probe USING fts5(x)")
+            cursor.execute("DROP TABLE temp._fts5_probe")
+            return True
+        except Exception:
+            return False
+
+
+def create_index(apps, schema_editor):
+    connection = schema_editor.connection
+    statements = []
+    if connection.vendor == 'sqlite' and _fts5_supported(connection):
+        statements = SQLITE_FTS
+    elif connection.vendor == 'postgresql':
+        statements = POSTGRES_FTS
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def drop_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for sql in {'sqlite': SQLITE_FTS_DROP, 'postgresql': POSTGRES_FTS_DROP}.get(vendor, []):
+        schema_editor.execute(sql)
+
+
+def fold(text):
+    """Copia congelada de api.search.fold."""
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def build_documents(card_ids, Card, Comment, ChecklistItem):
+    """Copia congelada de api.search.build_documents tal como era al crear la migración."""
+    extra = defaultdict(list)
+    for card_id, content in Comment.objects.filter(card_id__in=card_ids).values_list('card_id', 'content'):
+        extra[card_id].append(content)
+    for card_id, text in ChecklistItem.objects.filter(card_id__in=card_ids).values_list('card_id', 'text'):
+        extra[card_id].append(text)
+    return [
+        (card_id, fold(title), fold('\n'.join([description or ''] + extra[card_id])))
+        for card_id, title, description in Card.objects.filter(id__in=card_ids).values_list('id', 'title', 'description')
+    ]
+
+
+def backfill(apps, schema_editor):
+    Card = apps.get_model('api', 'Card')
+    Comment = apps.get_model('api', 'Comment')
+    ChecklistItem = apps.get_model('api', 'ChecklistItem')
+    CardSearchDocument = apps.get_model('api', 'CardSearchDocument')
+    ids = list(Card.objects.order_by('id').values_list('id', flat=True))
+    for start in range(0, len(ids), 1000):
+        docs = build_documents(ids[start:start + 1000], Card, Comment, ChecklistItem)
+        CardSearchDocument.objects.bulk_create(
+            [CardSearchDocument(card_id=i, title=t, body=b) for i, t, b in docs]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_board_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CardSearchDocument',
+            fields=[
+                ('card', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='api.card')),
+                ('title', models.TextField(blank=True)),
+                ('body', models.TextField(blank=True)),
+            ],
+        ),
+        migrations.RunPython(create_index, drop_index),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
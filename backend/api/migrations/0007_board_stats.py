@@ -0,0 +1,72 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:35
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+
+
+def compute_rows(board_ids, Card, BoardStat):
+    """Copia congelada de api.stats.compute_rows tal como era al crear la migración."""
+    cards = Card.objects.filter(list__board_id__in=board_ids).annotate(day=TruncDate('due_date'))
+    aggregates = {
+        'n_cards': Count('id', distinct=True),
+        'n_checklist': Count('checklist'),
+        'n_done': Count('checklist', filter=Q(checklist__done=True)),
+    }
+    rows = []
+    for row in cards.values('list__board_id', 'priority', 'day').annotate(**aggregates).order_by():
+        rows.append(BoardStat(
+            board_id=row['list__board_id'], assignee_id=None, priority=row['priority'], due_date=row['day'],
+            cards=row['n_cards'], checklist_total=row['n_checklist'], checklist_done=row['n_done'],
+        ))
+    per_assignee = (
+        cards.filter(assignees__isnull=False)
+        .values('list__board_id', 'assignees', 'priority', 'day')
+        .annotate(**aggregates)
+        .order_by()
+    )
+    for row in per_assignee:
+        rows.append(BoardStat(
+            board_id=row['list__board_id'], assignee_id=row['assignees'], priority=row['priority'], due_date=row['day'],
+            cards=row['n_cards'], checklist_total=row['n_checklist'], checklist_done=row['n_done'],
+        ))
+    return rows
+
+
+def backfill(apps, schema_editor):
+    Board = apps.get_model('api', 'Board')
+    Card = apps.get_model('api', 'Card')
+    BoardStat = apps.get_model('api', 'BoardStat')
+    ids = list(Board.objects.order_by('id').values_list('id', flat=True))
+    for start in range(0, len(ids), 100):
+        BoardStat.objects.bulk_create(compute_rows(ids[start:start + 100], Card, BoardStat))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_card_search'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoardStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('priority', models.CharField(max_length=10)),
+                ('due_date', models.DateField(blank=True, null=True)),
+                ('cards', models.PositiveIntegerField(default=0)),
+                ('checklist_total', models.PositiveIntegerField(default=0)),
+                ('checklist_done', models.PositiveIntegerField(default=0)),
+                ('assignee', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='board_stats', to=settings.AUTH_USER_MODEL)),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stats', to='api.board')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['board', 'assignee'], name='boardstat_board_assignee_idx'), models.Index(fields=['assignee'], name='boardstat_assignee_idx')],
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:39
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_board_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(max_length=7)),
+                ('path', models.CharField(max_length=500)),
+                ('events', models.PositiveIntegerField(default=0)),
+                ('original_events', models.PositiveIntegerField(default=0)),
+                ('start_at', models.DateTimeField()),
+                ('end_at', models.DateTimeField()),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('board', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='activity_archives', to='api.board')),
+            ],
+            options={
+                'ordering': ['-end_at'],
+                'indexes': [models.Index(fields=['board', 'period'], name='activityarchive_board_idx')],
+            },
+        ),
+    ]
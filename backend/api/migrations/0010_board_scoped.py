@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_change_log'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='card',
+            name='board',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='cards', to='api.board'),
+        ),
+        migrations.AddField(
+            model_name='checklistitem',
+            name='board',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='checklist_items', to='api.board'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='board',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='api.board'),
+        ),
+        migrations.AddField(
+            model_name='attachment',
+            name='board',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='attachments', to='api.board'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:21
+
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+CHUNK = 2000
+
+
+def _chunked_update(model, parent_model, parent_field):
+    """Copia board_id del padre por rangos de id; cada tramo se confirma por separado."""
+    board = Subquery(parent_model.objects.filter(id=OuterRef(f'{parent_field}_id')).values('board_id')[:1])
+    pending = model.objects.filter(board__isnull=True)
+    last = pending.order_by('-id').values_list('id', flat=True).first()
+    start = pending.order_by('id').values_list('id', flat=True).first()
+    if start is None:
+        return
+    while start <= last:
+        model.objects.filter(id__gte=start, id__lt=start + CHUNK, board__isnull=True).update(board_id=board)
+        start += CHUNK
+
+
+def backfill(apps, schema_editor):
+    List = apps.get_model('api', 'List')
+    Card = apps.get_model('api', 'Card')
+    # Primero las tarjetas: los hijos copian el tablero ya resuelto de su tarjeta
+    _chunked_update(Card, List, 'list')
+    for name in ('ChecklistItem', 'Comment', 'Attachment'):
+        _chunked_update(apps.get_model('api', name), Card, 'card')
+
+
+class Migration(migrations.Migration):
+    # Sin transacción única: en tablas grandes cada tramo libera los locks al terminar
+    atomic = False
+
+    dependencies = [
+        ('api', '0010_board_scoped'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:21
+
+from collections import defaultdict
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+
+
+def card_states(card_ids, Card, CardStat):
+    """Copia congelada de api.stats.card_states tal como era al crear la migración."""
+    rows = (
+        Card.objects.filter(id__in=card_ids)
+        .annotate(day=TruncDate('due_date'))
+        .values('id', 'board_id', 'priority', 'day')
+        .annotate(n_checklist=Count('checklist'), n_done=Count('checklist', filter=Q(checklist__done=True)))
+        .order_by()
+    )
+    assignees = defaultdict(list)
+    pairs = (
+        Card.assignees.through.objects.filter(card_id__in=card_ids)
+        .order_by('card_id', 'user_id').values_list('card_id', 'user_id')
+    )
+    for card_id, user_id in pairs:
+        assignees[card_id].append(user_id)
+    return [
+        CardStat(
+            card_id=row['id'], board_id=row['board_id'], priority=row['priority'], due_date=row['day'],
+            assignees=assignees[row['id']], checklist_total=row['n_checklist'], checklist_done=row['n_done'],
+        )
+        for row in rows
+    ]
+
+
+def backfill(apps, schema_editor):
+    Card = apps.get_model('api', 'Card')
+    CardStat = apps.get_model('api', 'CardStat')
+    ids = list(Card.objects.order_by('id').values_list('id', flat=True))
+    for start in range(0, len(ids), 500):
+        CardStat.objects.bulk_create(card_states(ids[start:start + 500], Card, CardStat))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_board_scoped_not_null'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CardStat',
+            fields=[
+                ('card_id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('board_id', models.BigIntegerField(db_index=True)),
+                ('priority', models.CharField(max_length=10)),
+                ('due_date', models.DateField(blank=True, null=True)),
+                ('assignees', models.JSONField(default=list)),
+                ('checklist_total', models.PositiveIntegerField(default=0)),
+                ('checklist_done', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
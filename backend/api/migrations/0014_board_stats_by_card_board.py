@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:05
+
+from django.db import migrations, transaction
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+
+
+def compute_rows(board_ids, Card, BoardStat):
+    """Copia congelada de api.stats.compute_rows agrupando por Card.board (0010-0012)."""
+    cards = Card.objects.filter(board_id__in=board_ids).annotate(day=TruncDate('due_date'))
+    aggregates = {
+        'n_cards': Count('id', distinct=True),
+        'n_checklist': Count('checklist'),
+        'n_done': Count('checklist', filter=Q(checklist__done=True)),
+    }
+    rows = []
+    for row in cards.values('board_id', 'priority', 'day').annotate(**aggregates).order_by():
+        rows.append(BoardStat(
+            board_id=row['board_id'], assignee_id=None, priority=row['priority'], due_date=row['day'],
+            cards=row['n_cards'], checklist_total=row['n_checklist'], checklist_done=row['n_done'],
+        ))
+    per_assignee = (
+        cards.filter(assignees__isnull=False)
+        .values('board_id', 'assignees', 'priority', 'day')
+        .annotate(**aggregates)
+        .order_by()
+    )
+    for row in per_assignee:
+        rows.append(BoardStat(
+            board_id=row['board_id'], assignee_id=row['assignees'], priority=row['priority'], due_date=row['day'],
+            cards=row['n_cards'], checklist_total=row['n_checklist'], checklist_done=row['n_done'],
+        ))
+    return rows
+
+
+def rebuild(apps, schema_editor):
+    # Las estadísticas pasan a agruparse por el tablero propio de la tarjeta
+    Board = apps.get_model('api', 'Board')
+    Card = apps.get_model('api', 'Card')
+    BoardStat = apps.get_model('api', 'BoardStat')
+    ids = list(Board.objects.order_by('id').values_list('id', flat=True))
+    for start in range(0, len(ids), 100):
+        chunk = ids[start:start + 100]
+        with transaction.atomic():
+            BoardStat.objects.filter(board_id__in=chunk).delete()
+            BoardStat.objects.bulk_create(compute_rows(chunk, Card, BoardStat))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_card_stat'),
+    ]
+
+    operations = [
+        migrations.RunPython(rebuild, migrations.RunPython.noop),
+    ]
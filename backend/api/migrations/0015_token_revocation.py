@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_board_stats_by_card_board'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TokenRevocation',
+            fields=[
+                ('user_id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('revoked_at', models.BigIntegerField()),
+            ],
+        ),
+    ]
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
 from django.utils import timezone
 
@@ -16,6 +16,10 @@ class Board(models.Model):
     members = models.ManyToManyField(User, related_name='boards', blank=True)
     color = models.CharField(max_length=7, default="#ffffff")
     created_at = models.DateTimeField(default=timezone.now)
+    # Se incrementa con cada escritura en el tablero (listas, tarjetas, etiquetas,
+    # checklist, comentarios, miembros); sirve de ETag/Last-Modified para GET condicionales
+    version = models.PositiveBigIntegerField(default=0)
+    modified_at = models.DateTimeField(default=timezone.now)
 
     def __str__(self):
         return self.name
@@ -25,17 +29,112 @@ class List(models.Model):
     title = models.CharField(max_length=200)
     position = models.IntegerField(default=0)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['board', 'position'], name='list_board_position_idx'),
+        ]
+
     def __str__(self):
         return f"{self.title} ({self.board.name})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_board_id = instance.__dict__.get('board_id')
+        return instance
+
+    def save(self, *args, **kwargs):
+        previous = getattr(self, '_loaded_board_id', None)
+        # Una sola transacción: quienes esperan al commit (versiones, estadísticas) ven
+        # la lista y sus tarjetas ya en el tablero nuevo
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self._loaded_board_id = self.board_id
+            if previous is not None and previous != self.board_id:
+                # La lista cambió de tablero: sus tarjetas y los hijos de estas también
+                Card.objects.filter(list_id=self.pk).update(board_id=self.board_id)
+                for model in (ChecklistItem, Comment, Attachment):
+                    model.objects.filter(card__list_id=self.pk).update(board_id=self.board_id)
+                self._log_board_move(previous)
+
+    def _log_board_move(self, previous):
+        # update() no emite señales: lápidas en el origen y altas en el destino para
+        # la sincronización (api/sync.py); el alta de la lista llega por post_save
+        rows = [ChangeLog(board_id=previous, model='lists', object_id=self.pk, deleted=True)]
+        for name, queryset in (
+            ('cards', Card.objects.filter(list_id=self.pk)),
+            ('checklist', ChecklistItem.objects.filter(card__list_id=self.pk)),
+            ('comments', Comment.objects.filter(card__list_id=self.pk)),
+        ):
+            for pk in queryset.values_list('id', flat=True):
+                rows.append(ChangeLog(board_id=previous, model=name, object_id=pk, deleted=True))
+                rows.append(ChangeLog(board_id=self.board_id, model=name, object_id=pk))
+        ChangeLog.objects.bulk_create(rows)
+
+
+class BoardScoped(models.Model):
+    """
+    Modelo con `board` desnormalizado desde su padre (`board_parent`: 'list' o 'card'),
+    para filtrar y comprobar permisos sin recorrer tarjeta -> lista -> tablero.
+    save() lo mantiene; quien use bulk_create/bulk_update llama a refresh_board().
+    """
+    board_parent = None
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_parent_id = instance.__dict__.get(f'{cls.board_parent}_id')
+        return instance
+
+    def refresh_board(self):
+        """
+        Copia el tablero del padre si falta o si el padre cambió (sin consulta si el
+        padre ya está cargado). Devuelve el tablero anterior cuando cambió, si no None;
+        también queda en `_source_board_id` para la sincronización (api/sync.py). El
+        padre anterior queda en `_source_parent_id` (estadísticas, api/stats.py).
+        """
+        parent_id = getattr(self, f'{self.board_parent}_id')
+        previous = self.board_id
+        loaded = getattr(self, '_loaded_parent_id', parent_id)
+        if previous is not None and parent_id == loaded:
+            return None
+        if loaded != parent_id:
+            self._source_parent_id = loaded
+        if self.board_parent in self._state.fields_cache:
+            self.board_id = getattr(self, self.board_parent).board_id
+        else:
+            parent_model = self._meta.get_field(self.board_parent).related_model
+            self.board_id = parent_model.objects.filter(pk=parent_id).values_list('board_id', flat=True).first()
+        self._loaded_parent_id = parent_id
+        if previous in (None, self.board_id):
+            return None
+        self._source_board_id = previous
+        return previous
+
+    def board_moved(self, previous):
+        """Gancho tras guardar un cambio de tablero."""
+
+    def save(self, *args, **kwargs):
+        previous = self.refresh_board()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and self.board_parent in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'board'}
+        super().save(*args, **kwargs)
+        if previous is not None:
+            self.board_moved(previous)
+
 PRIORITY_CHOICES = (
     ('low', 'low'),
     ('med', 'med'),
     ('high', 'high'),
 )
 
-class Card(models.Model):
+class Card(BoardScoped):
     list = models.ForeignKey(List, on_delete=models.CASCADE, related_name='cards')
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='cards', editable=False)
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True)
     due_date = models.DateTimeField(null=True, blank=True)
@@ -45,15 +144,37 @@ class Card(models.Model):
     assignees = models.ManyToManyField(User, related_name='assigned_cards', blank=True)
     labels = models.ManyToManyField('Label', related_name='cards', blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['list', 'position'], name='card_list_position_idx'),
+            models.Index(fields=['due_date'], name='card_due_date_idx'),
+        ]
+
+    board_parent = 'list'
+
     def __str__(self):
         return self.title
 
-class Comment(models.Model):
+    def board_moved(self, previous):
+        # Los hijos acompañan a la tarjeta
+        for model in (ChecklistItem, Comment, Attachment):
+            model.objects.filter(card_id=self.pk).update(board_id=self.board_id)
+
+class CardSearchDocument(models.Model):
+    """Texto indexable de una tarjeta (título, descripción, comentarios, checklist), ya normalizado."""
+    card = models.OneToOneField(Card, on_delete=models.CASCADE, primary_key=True, related_name='search_document')
+    title = models.TextField(blank=True)
+    body = models.TextField(blank=True)
+
+class Comment(BoardScoped):
     card = models.ForeignKey(Card, on_delete=models.CASCADE, related_name='comments')
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='comments', editable=False)
     author = models.ForeignKey(User, on_delete=models.CASCADE)
     content = models.TextField()
     created_at = models.DateTimeField(default=timezone.now)
 
+    board_parent = 'card'
+
 class Label(models.Model):
     board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='labels', null=True, blank=True)
     name = models.CharField(max_length=50)
@@ -62,24 +183,67 @@ class Label(models.Model):
     def __str__(self):
         return self.name
 
-class ChecklistItem(models.Model):
+class ChecklistItem(BoardScoped):
     card = models.ForeignKey(Card, on_delete=models.CASCADE, related_name='checklist')
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='checklist_items', editable=False)
     text = models.CharField(max_length=255)
     done = models.BooleanField(default=False)
     position = models.IntegerField(default=0)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['card', 'position'], name='checklist_card_position_idx'),
+        ]
+
+    board_parent = 'card'
+
     def __str__(self):
         return self.text
 
-class Attachment(models.Model):
+class Attachment(BoardScoped):
     card = models.ForeignKey(Card, on_delete=models.CASCADE, related_name='attachments')
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='attachments', editable=False)
     url = models.URLField()
     name = models.CharField(max_length=200, blank=True)
     created_at = models.DateTimeField(default=timezone.now)
 
+    board_parent = 'card'
+
     def __str__(self):
         return self.name or self.url
 
+class BoardStat(models.Model):
+    """
+    Conteos precalculados de tarjetas por tablero, asignado (None = todo el tablero),
+    prioridad y día de vencimiento. Los mantiene api/stats.py.
+    """
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='stats')
+    assignee = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='board_stats')
+    priority = models.CharField(max_length=10)
+    due_date = models.DateField(null=True, blank=True)
+    cards = models.PositiveIntegerField(default=0)
+    checklist_total = models.PositiveIntegerField(default=0)
+    checklist_done = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['board', 'assignee'], name='boardstat_board_assignee_idx'),
+            models.Index(fields=['assignee'], name='boardstat_assignee_idx'),
+        ]
+
+class CardStat(models.Model):
+    """
+    Último aporte de cada tarjeta a BoardStat: api/stats.py lo resta al sumar el
+    aporte nuevo. Sin FK a la tarjeta, para conservarlo hasta procesar su borrado.
+    """
+    card_id = models.BigIntegerField(primary_key=True)
+    board_id = models.BigIntegerField(db_index=True)
+    priority = models.CharField(max_length=10)
+    due_date = models.DateField(null=True, blank=True)
+    assignees = models.JSONField(default=list)
+    checklist_total = models.PositiveIntegerField(default=0)
+    checklist_done = models.PositiveIntegerField(default=0)
+
 class Activity(models.Model):
     ACTION_CHOICES = (
         ('created', 'created'),
@@ -99,7 +263,69 @@ class Activity(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['board', '-created_at'], name='activity_board_created_idx'),
+            models.Index(fields=['card', '-created_at'], name='activity_card_created_idx'),
+            models.Index(fields=['-created_at', '-id'], name='activity_created_id_idx'),
+        ]
 
     def __str__(self):
         who = self.actor or self.user
         return f"{who} {self.action}"
+
+
+class ActivityArchive(models.Model):
+    """
+    Segmento de actividad archivada: un JSONL comprimido por tablero, semestre y corrida
+    de `manage.py archive_activity`. Lo mantiene api/retention.py.
+    """
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='activity_archives', null=True, blank=True)
+    period = models.CharField(max_length=7)  # '2025-1' = ene-jun, '2025-2' = jul-dic
+    path = models.CharField(max_length=500)
+    events = models.PositiveIntegerField(default=0)
+    original_events = models.PositiveIntegerField(default=0)
+    start_at = models.DateTimeField()
+    end_at = models.DateTimeField()
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-end_at']
+        indexes = [
+            models.Index(fields=['board', 'period'], name='activityarchive_board_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.board_id} {self.period} ({self.events})"
+
+
+class ChangeLog(models.Model):
+    """
+    Registro monotónico de cambios por tablero para la sincronización incremental
+    (api/sync.py). `id` es el cursor; `deleted` marca las lápidas de objetos borrados.
+    """
+    board_id = models.BigIntegerField()
+    model = models.CharField(max_length=20)
+    object_id = models.BigIntegerField()
+    deleted = models.BooleanField(default=False)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['board_id', 'id'], name='changelog_board_id_idx'),
+            models.Index(fields=['created_at'], name='changelog_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.model}:{self.object_id} {'deleted' if self.deleted else 'upserted'}"
+
+
+class TokenRevocation(models.Model):
+    """
+    Marca de revocación de los tokens de un usuario (api/authentication.py), en segundos
+    epoch como el claim `iat`. Sin FK: debe sobrevivir al borrado del usuario.
+    """
+    user_id = models.BigIntegerField(primary_key=True)
+    revoked_at = models.BigIntegerField()
+
+    def __str__(self):
+        return f"{self.user_id} @ {self.revoked_at}"
@@ -0,0 +1,73 @@
+"""
+Orden disperso para List.position, Card.position y ChecklistItem.position.
+
+Las posiciones se asignan con huecos de POSITION_GAP, de modo que insertar o mover
+un elemento solo escribe ese elemento (toma el punto medio entre sus vecinos).
+Cuando dos vecinos quedan contiguos se reparte de nuevo todo el grupo (rebalanceo
+perezoso), que es el único caso que toca más de una fila.
+"""
+from django.db.models.signals import post_save
+
+POSITION_GAP = 1024
+
+
+def _ordered_positions(siblings):
+    return siblings.order_by('position', 'id').values_list('position', flat=True)
+
+
+def append_position(siblings):
+    """Posición para agregar al final del grupo."""
+    last = _ordered_positions(siblings).last()
+    return POSITION_GAP if last is None else last + POSITION_GAP
+
+
+def position_at(siblings, index):
+    """
+    Posición que deja a un elemento en el índice `index` entre `siblings`
+    (queryset del grupo sin el elemento). Devuelve None si no queda hueco.
+    """
+    index = max(0, index)
+    ordered = _ordered_positions(siblings)
+    window = list(ordered[max(index - 1, 0):index + 1])
+    if index == 0:
+        before, after = None, (window[0] if window else None)
+    elif window:
+        before, after = window[0], (window[1] if len(window) > 1 else None)
+    else:
+        # Índice más allá del final: se agrega después del último
+        before, after = ordered.last(), None
+
+    if before is None and after is None:
+        return POSITION_GAP
+    if before is None:
+        return after - POSITION_GAP
+    if after is None:
+        return before + POSITION_GAP
+    if after - before > 1:
+        return (before + after) // 2
+    return None
+
+
+def rebalance(obj, siblings, index):
+    """Reparte todo el grupo con huecos uniformes dejando `obj` en `index`."""
+    rows = list(siblings.order_by('position', 'id'))
+    rows.insert(min(max(index, 0), len(rows)), obj)
+    for i, row in enumerate(rows):
+        row.position = (i + 1) * POSITION_GAP
+    moved = [row for row in rows if row is not obj]
+    type(obj).objects.bulk_update(moved, ['position'])
+    # bulk_update no dispara señales: se envían a mano (versión, sincronización)
+    for row in moved:
+        post_save.send(sender=type(obj), instance=row, created=False, update_fields={'position'})
+
+
+def place(obj, siblings, index):
+    """
+    Asigna a `obj.position` el valor para quedar en `index` dentro de `siblings`.
+    No guarda `obj`; el llamador lo hace (normalmente con update_fields).
+    """
+    position = position_at(siblings, index)
+    if position is None:
+        rebalance(obj, siblings, index)
+    else:
+        obj.position = position
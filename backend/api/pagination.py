@@ -0,0 +1,196 @@
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación por cursor (keyset) sobre un orden compuesto y estable.
+    El cursor guarda los valores de `ordering` de la última fila entregada y la
+    siguiente página se obtiene con una comparación lexicográfica, sin OFFSET.
+    Si `optional` es True solo se pagina cuando el cliente envía cursor o page_size,
+    para no romper a los clientes que esperan la lista completa.
+    """
+    ordering = ('id',)
+    page_size = 50
+    max_page_size = 500
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    optional = False
+    invalid_cursor_message = 'Cursor inválido'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.optional and self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        queryset = queryset.order_by(*self.ordering)
+        values = self.decode_cursor(request, queryset.model)
+        if values is not None:
+            queryset = queryset.filter(self.after(values))
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        self.last_values = [self.field_value(rows[-1], f) for f in self.ordering] if rows else None
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def after(self, values):
+        """Q equivalente a (f1, f2, ...) > (v1, v2, ...) respetando el sentido de cada campo."""
+        q = Q()
+        for i, field in enumerate(self.ordering):
+            name = field.lstrip('-')
+            op = 'lt' if field.startswith('-') else 'gt'
+            cond = Q(**{f'{name}__{op}': values[i]})
+            for prev, value in zip(self.ordering[:i], values[:i]):
+                cond &= Q(**{prev.lstrip('-'): value})
+            q |= cond
+        return q
+
+    @staticmethod
+    def field_value(obj, field):
+        # Filas de modelo o dicts de values() (lectura rápida)
+        name = field.lstrip('-')
+        value = obj[name] if isinstance(obj, dict) else getattr(obj, name)
+        return value.isoformat() if hasattr(value, 'isoformat') else value
+
+    def encode_cursor(self, values):
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def decode_cursor(self, request, model):
+        raw = request.query_params.get(self.cursor_query_param)
+        if not raw:
+            return None
+        try:
+            values = json.loads(base64.urlsafe_b64decode(raw.encode()))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return [self.clean_value(model, field, value) for field, value in zip(self.ordering, values)]
+
+    def clean_value(self, model, field, value):
+        # Cada valor debe ser válido para su campo (int para ids, ISO para fechas)
+        if value is None or isinstance(value, (list, dict)):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            return model._meta.get_field(field.lstrip('-')).to_python(value)
+        except (ValidationError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.last_values))
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.get_next_link(), 'results': data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class CardCursorPagination(KeysetPagination):
+    ordering = ('position', 'id')
+    optional = True
+
+
+class ActivityCursorPagination(KeysetPagination):
+    ordering = ('-created_at', '-id')
+
+
+class UserCursorPagination(KeysetPagination):
+    ordering = ('username', 'id')
+    optional = True
+
+
+class StreamingListMixin:
+    """
+    Modo exportación: con ?stream=1 la lista se emite como un arreglo JSON fila por fila,
+    leyendo la base en bloques con iterator(), con memoria constante.
+
+    Si la vista define `values_reader` (api/fast_serialization.py) el listado, paginado
+    o en streaming, se arma desde values() en vez de instanciar el serializer por fila.
+    """
+    stream_query_param = 'stream'
+    stream_chunk_size = 500
+    values_reader = None
+
+    def wants_stream(self, request):
+        return request.query_params.get(self.stream_query_param) in ('1', 'true')
+
+    def stream_response(self, queryset):
+        paginator = self.paginator
+        if paginator is not None and getattr(paginator, 'ordering', None):
+            queryset = queryset.order_by(*paginator.ordering)
+        serializer_class = self.get_serializer_class()
+        context = self.get_serializer_context()
+        encoder = JSONEncoder()
+        reader = self.values_reader
+
+        def chunks():
+            if reader is None:
+                for obj in queryset.iterator(chunk_size=self.stream_chunk_size):
+                    yield [serializer_class(obj, context=context).data]
+                return
+            chunk = []
+            for row in reader.values(queryset).iterator(chunk_size=self.stream_chunk_size):
+                chunk.append(row)
+                if len(chunk) == self.stream_chunk_size:
+                    yield reader.to_data(chunk)
+                    chunk = []
+            if chunk:
+                yield reader.to_data(chunk)
+
+        def rows():
+            yield '['
+            first = True
+            for chunk in chunks():
+                for data in chunk:
+                    yield ('' if first else ',') + encoder.encode(data)
+                    first = False
+            yield ']'
+
+        return StreamingHttpResponse(rows(), content_type='application/json')
+
+    def list_response(self, queryset):
+        """Listado (paginado si corresponde) de `queryset` ya filtrado."""
+        reader = self.values_reader
+        if reader is None:
+            page = self.paginate_queryset(queryset)
+            if page is not None:
+                return self.get_paginated_response(self.get_serializer(page, many=True).data)
+            return Response(self.get_serializer(queryset, many=True).data)
+        rows = reader.values(queryset)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(reader.to_data(page))
+        return Response(reader.to_data(list(rows)))
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.wants_stream(request):
+            return self.stream_response(queryset)
+        return self.list_response(queryset)
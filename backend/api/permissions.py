@@ -1,19 +1,19 @@
 from rest_framework.permissions import BasePermission, SAFE_METHODS
-from .models import Board, Profile
+from .models import Board
+from .lookups import role_of
+from .membership import is_member
+
+
+def board_id_of(obj):
+    """Id del tablero al que pertenece `obj` (todos los modelos del tablero guardan board_id)."""
+    if isinstance(obj, Board):
+        return obj.pk
+    return getattr(obj, 'board_id', None)
 
 
 class IsBoardMember(BasePermission):
     def has_object_permission(self, request, view, obj):
-        board = None
-        if hasattr(obj, 'board'):
-            board = obj.board
-        elif hasattr(obj, 'list') and hasattr(obj.list, 'board'):
-            board = obj.list.board
-        elif isinstance(obj, Board):
-            board = obj
-        if not board:
-            return False
-        return board.members.filter(id=request.user.id).exists()
+        return is_member(request.user, board_id_of(obj))
 
 
 class CanDeleteBoard(BasePermission):
@@ -25,11 +25,6 @@ class CanDeleteBoard(BasePermission):
             return True
         if not isinstance(obj, Board):
             return True
-        if request.user == obj.owner:
+        if request.user.id == obj.owner_id:
             return True
-        try:
-            return request.user.profile.role == 'teacher'
-        except Profile.DoesNotExist:
-            return False
-
-
+        return role_of(request.user) == 'teacher'
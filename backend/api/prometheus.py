@@ -0,0 +1,137 @@
+"""
+Métricas en formato Prometheus: `GET /metrics`.
+
+- `http_requests_total` y `http_request_duration_seconds` por ruta (nombre de la URL:
+  `cards-list`, `cards-move`, `boards-snapshot`, `token_obtain_pair`...), método y,
+  en el contador, código de estado (tasa de errores: status=~"5..").
+- `db_connections_open` (conexiones abiertas del proceso) y
+  `db_connections_created_total` por alias de base.
+- `api_cache_requests_total` por espacio de api/cache.py y resultado (hit/miss), y
+  `api_cache_hit_ratio` calculado al exportar.
+- `activity_queue_depth`: eventos de actividad en cola sin guardar (api/activity_log.py).
+
+Con varios procesos (gunicorn/uvicorn con workers) definir PROMETHEUS_MULTIPROC_DIR
+con un directorio vacío antes de arrancar: cada proceso escribe sus valores en
+archivos mapeados en memoria y /metrics los suma. Al terminar un worker hay que
+llamar a `prometheus_client.multiprocess.mark_process_dead(pid)` (hook `child_exit`
+de gunicorn) para que sus gauges dejen de contarse.
+"""
+import os
+import time
+import weakref
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest,
+)
+from prometheus_client import multiprocess
+from prometheus_client.core import GaugeMetricFamily
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REQUESTS = Counter('http_requests_total', 'Requests HTTP atendidos', ['route', 'method', 'status'])
+LATENCY = Histogram(
+    'http_request_duration_seconds', 'Latencia de los requests HTTP', ['route', 'method'], buckets=LATENCY_BUCKETS,
+)
+DB_OPEN = Gauge('db_connections_open', 'Conexiones a la base abiertas', ['alias'], multiprocess_mode='livesum')
+DB_CREATED = Counter('db_connections_created_total', 'Conexiones a la base abiertas desde el arranque', ['alias'])
+CACHE_REQUESTS = Counter('api_cache_requests_total', 'Lecturas de la caché de la API', ['namespace', 'result'])
+ACTIVITY_QUEUE = Gauge('activity_queue_depth', 'Eventos de actividad en cola', multiprocess_mode='livesum')
+
+_wrappers = weakref.WeakSet()
+
+
+def enabled():
+    return getattr(settings, 'METRICS', {}).get('ENABLED', True)
+
+
+def count_cache(namespace, hits=0, misses=0):
+    if hits:
+        CACHE_REQUESTS.labels(namespace, 'hit').inc(hits)
+    if misses:
+        CACHE_REQUESTS.labels(namespace, 'miss').inc(misses)
+
+
+def set_activity_queue(depth):
+    ACTIVITY_QUEUE.set(depth)
+
+
+def _on_connection_created(sender, connection, **kwargs):
+    _wrappers.add(connection)
+    DB_CREATED.labels(connection.alias).inc()
+
+
+connection_created.connect(_on_connection_created, dispatch_uid='prometheus-db-connections')
+
+
+def _update_db_gauge():
+    # Las conexiones son por hilo: se cuentan todas las del proceso
+    open_by_alias = {}
+    for wrapper in list(_wrappers):
+        open_by_alias[wrapper.alias] = open_by_alias.get(wrapper.alias, 0) + (wrapper.connection is not None)
+    for alias, count in open_by_alias.items():
+        DB_OPEN.labels(alias).set(count)
+
+
+class PrometheusMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not enabled():
+            return self.get_response(request)
+        began = time.perf_counter()
+        response = self.get_response(request)
+        elapsed = time.perf_counter() - began
+        match = request.resolver_match
+        route = (match.url_name or match.view_name) if match else 'unmatched'
+        REQUESTS.labels(route, request.method, str(response.status_code)).inc()
+        LATENCY.labels(route, request.method).observe(elapsed)
+        _update_db_gauge()
+        return response
+
+
+class _CacheRatioCollector:
+    """api_cache_hit_ratio por espacio, a partir de los contadores ya agregados."""
+
+    def __init__(self, source):
+        self.source = source
+
+    def collect(self):
+        totals = {}
+        for family in self.source.collect():
+            if family.name != 'api_cache_requests':
+                continue
+            for sample in family.samples:
+                if sample.name.endswith('_total'):
+                    hits_misses = totals.setdefault(sample.labels['namespace'], {'hit': 0.0, 'miss': 0.0})
+                    hits_misses[sample.labels['result']] += sample.value
+        ratio = GaugeMetricFamily('api_cache_hit_ratio', 'Aciertos / lecturas de la caché de la API', labels=['namespace'])
+        for namespace, counts in sorted(totals.items()):
+            reads = counts['hit'] + counts['miss']
+            ratio.add_metric([namespace], counts['hit'] / reads if reads else 0.0)
+        yield ratio
+
+
+def export():
+    """Texto de exposición: métricas de este proceso o, en modo multiproceso, de todos."""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        source = CollectorRegistry()
+        multiprocess.MultiProcessCollector(source)
+    else:
+        source = REGISTRY
+    derived = CollectorRegistry()
+    derived.register(_CacheRatioCollector(source))
+    return generate_latest(source) + generate_latest(derived)
+
+
+def metrics_view(request):
+    if not enabled():
+        return HttpResponse(status=404)
+    token = getattr(settings, 'METRICS', {}).get('TOKEN')
+    if token and request.META.get('HTTP_AUTHORIZATION') != f'Bearer {token}':
+        return HttpResponse(status=401)
+    _update_db_gauge()
+    return HttpResponse(export(), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,138 @@
+"""
+Canal de eventos por tablero (Server-Sent Events).
+
+Las vistas publican deltas compactos (tarjeta creada/actualizada/movida/eliminada,
+comentario agregado) en los mismos puntos donde registran Activity. El broker se
+elige con settings.REALTIME_BROKER; el de memoria sirve para un solo proceso ASGI
+y puede reemplazarse por uno externo con la misma interfaz (publish/subscribe).
+"""
+import asyncio
+import threading
+from collections import defaultdict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils.module_loading import import_string
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+from .authentication import CachedJWTAuthentication
+from .membership import is_member
+
+# Segundos sin eventos entre pings; en cada uno se vuelve a comprobar la pertenencia
+HEARTBEAT = 15
+
+
+class InProcessBroker:
+    """Broker en memoria: cada suscriptor tiene una cola asyncio en su propio loop."""
+    queue_size = 1000
+
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def publish(self, board_id, message):
+        with self._lock:
+            subscribers = list(self._subscribers.get(board_id, ()))
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(self._offer, queue, message)
+
+    @staticmethod
+    def _offer(queue, message):
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Cliente demasiado lento: se descarta el evento, al reconectar hará un refetch
+            pass
+
+    async def subscribe(self, board_id, heartbeat=15):
+        """Genera mensajes del tablero; produce None cada `heartbeat` segundos sin eventos."""
+        entry = (asyncio.get_running_loop(), asyncio.Queue(maxsize=self.queue_size))
+        with self._lock:
+            self._subscribers[board_id].add(entry)
+        try:
+            while True:
+                try:
+                    yield await asyncio.wait_for(entry[1].get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            with self._lock:
+                self._subscribers[board_id].discard(entry)
+                if not self._subscribers[board_id]:
+                    del self._subscribers[board_id]
+
+
+_broker = None
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        _broker = import_string(getattr(settings, 'REALTIME_BROKER', 'api.realtime.InProcessBroker'))()
+    return _broker
+
+
+def publish(board_id, event, data):
+    """Publica un delta del tablero cuando la transacción actual se confirma."""
+    if board_id is None:
+        return
+    message = {"type": event, "board": board_id, "data": data}
+    transaction.on_commit(lambda: get_broker().publish(board_id, message))
+
+
+def _authenticate(request):
+    """JWT desde Authorization o ?token= (EventSource no permite cabeceras)."""
+    auth = CachedJWTAuthentication()
+    raw = request.GET.get('token')
+    if not raw:
+        header = auth.get_header(request)
+        raw = auth.get_raw_token(header) if header else None
+    if not raw:
+        return None
+    try:
+        return auth.get_user(auth.get_validated_token(raw))
+    except (InvalidToken, TokenError):
+        return None
+
+
+def _still_member(user, board_id):
+    # Sin la copia guardada en el usuario: pudo dejar el tablero después de conectarse
+    user._board_ids = None
+    return is_member(user, board_id)
+
+
+async def board_events(request, pk):
+    """
+    GET boards/<id>/events/ — flujo SSE con los deltas del tablero. Requiere servidor ASGI.
+    La pertenencia se comprueba al conectar y de nuevo con cada evento o ping.
+    """
+    user = await sync_to_async(_authenticate)(request)
+    if user is None:
+        return JsonResponse({"detail": "No autenticado."}, status=401)
+    if not await sync_to_async(is_member)(user, pk):
+        return JsonResponse({"detail": "No autorizado."}, status=403)
+
+    encoder = JSONEncoder()
+
+    async def stream():
+        yield "retry: 3000\n\n"
+        messages = get_broker().subscribe(pk, heartbeat=HEARTBEAT)
+        try:
+            async for message in messages:
+                # Sin acceso se cierra el flujo; al reconectar el cliente recibe 403
+                if not await sync_to_async(_still_member)(user, pk):
+                    break
+                if message is None:
+                    yield ": ping\n\n"
+                else:
+                    yield f"event: {message['type']}\ndata: {encoder.encode(message)}\n\n"
+        finally:
+            await messages.aclose()
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,135 @@
+"""
+Retención de Activity: la tabla caliente solo guarda los últimos ACTIVITY_RETENTION_DAYS.
+
+`archive(before)` recorre la actividad anterior a `before` por tablero y semestre,
+la compacta (una racha de 'updated' seguidos sobre la misma tarjeta queda en un solo
+evento resumen) y la escribe como JSONL gzip en ACTIVITY_ARCHIVE_DIR. Cada archivo se
+registra como ActivityArchive y sus filas se borran de Activity en la misma
+transacción; si algo falla el archivo se elimina y la tabla queda intacta.
+
+SQLite no tiene particiones declarativas, por eso el "particionado" es tablero/semestre
+en almacenamiento frío; ActivityViewSet sigue leyendo solo la tabla caliente.
+"""
+import gzip
+import json
+import os
+from collections import defaultdict
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.utils.encoders import JSONEncoder
+
+from .models import Activity, ActivityArchive
+
+FIELDS = ('id', 'board_id', 'card_id', 'actor_id', 'user_id', 'action', 'message', 'meta', 'created_at')
+
+
+def retention_days():
+    return getattr(settings, 'ACTIVITY_RETENTION_DAYS', 180)
+
+
+def archive_dir():
+    return Path(getattr(settings, 'ACTIVITY_ARCHIVE_DIR', settings.BASE_DIR / 'var' / 'activity-archive'))
+
+
+def period_of(moment):
+    """Semestre de una fecha: '2025-1' (ene-jun) o '2025-2' (jul-dic)."""
+    moment = timezone.localtime(moment)
+    return f"{moment.year}-{1 if moment.month <= 6 else 2}"
+
+
+def compact(rows):
+    """
+    Colapsa las rachas de 'updated' sobre una misma tarjeta (sin otra acción de esa
+    tarjeta en medio) en un evento con meta.compacted = cantidad. `rows` en orden cronológico.
+    """
+    out = []
+    open_run = {}  # card_id -> índice en `out` del 'updated' que abre la racha
+    for row in rows:
+        card = row['card_id']
+        if row['action'] != 'updated' or card is None:
+            open_run.pop(card, None)
+            out.append(row)
+            continue
+        i = open_run.get(card)
+        if i is None:
+            open_run[card] = len(out)
+            out.append(row)
+            continue
+        first = out[i]
+        meta = first['meta']
+        if not meta.get('compacted'):
+            meta = {**meta, 'compacted': 1, 'first_at': first['created_at'], 'actors': [first['actor_id']]}
+        meta['compacted'] += 1
+        if row['actor_id'] not in meta['actors']:
+            meta['actors'].append(row['actor_id'])
+        out[i] = {**first, 'id': row['id'], 'actor_id': row['actor_id'], 'created_at': row['created_at'], 'meta': meta}
+    return out
+
+
+def _write_segment(path, rows):
+    encoder = JSONEncoder()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with gzip.open(path, 'wt', encoding='utf-8') as fh:
+        for row in rows:
+            fh.write(encoder.encode(row) + '\n')
+        fh.flush()
+        os.fsync(fh.fileno())
+
+
+def read_segment(segment):
+    """Eventos de un ActivityArchive (dicts con los campos de FIELDS)."""
+    with gzip.open(segment.path, 'rt', encoding='utf-8') as fh:
+        return [json.loads(line) for line in fh if line.strip()]
+
+
+def _archive_group(board_id, period, rows, stamp):
+    events = compact(rows)
+    name = f"board-{board_id if board_id is not None else 'none'}"
+    path = archive_dir() / name / f"{period}-{stamp}.jsonl.gz"
+    _write_segment(path, events)
+    try:
+        with transaction.atomic():
+            ActivityArchive.objects.create(
+                board_id=board_id, period=period, path=str(path), events=len(events),
+                original_events=len(rows), start_at=rows[0]['created_at'], end_at=rows[-1]['created_at'],
+            )
+            ids = [row['id'] for row in rows]
+            for start in range(0, len(ids), 500):
+                Activity.objects.filter(id__in=ids[start:start + 500]).delete()
+    except Exception:
+        path.unlink(missing_ok=True)
+        raise
+    return len(rows), len(events)
+
+
+def archive(before=None, board_ids=None, dry_run=False):
+    """
+    Archiva la actividad anterior a `before` (por defecto hoy - ACTIVITY_RETENTION_DAYS).
+    Devuelve {"segments", "archived", "written"}.
+    """
+    before = before or timezone.now() - timedelta(days=retention_days())
+    old = Activity.objects.filter(created_at__lt=before)
+    if board_ids is not None:
+        old = old.filter(board_id__in=board_ids)
+    stamp = timezone.now().strftime('%Y%m%dT%H%M%S')
+    totals = {"segments": 0, "archived": 0, "written": 0}
+    boards = old.order_by('board_id').values_list('board_id', flat=True).distinct()
+    for board_id in list(boards):
+        groups = defaultdict(list)
+        rows = old.filter(board_id=board_id).order_by('created_at', 'id').values(*FIELDS)
+        for row in rows.iterator(chunk_size=2000):
+            groups[period_of(row['created_at'])].append(row)
+        for period, group in groups.items():
+            totals["segments"] += 1
+            if dry_run:
+                totals["archived"] += len(group)
+                totals["written"] += len(compact(group))
+                continue
+            archived, written = _archive_group(board_id, period, group, stamp)
+            totals["archived"] += archived
+            totals["written"] += written
+    return totals
@@ -0,0 +1,140 @@
+"""
+Búsqueda de texto completo sobre tarjetas: título, descripción, comentarios y checklist.
+
+El texto de cada tarjeta se guarda normalizado (minúsculas, sin tildes) en
+CardSearchDocument y se mantiene al día con señales, reindexando al confirmar la
+transacción. El índice depende del motor:
+
+- SQLite: tabla virtual FTS5 `api_card_fts` (contenido externo + triggers), ranking bm25.
+  FTS5 no trae stemmer en español: cada término se busca como prefijo.
+- PostgreSQL: columna generada `document` (tsvector 'spanish', título con peso A)
+  con índice GIN, ranking ts_rank.
+- Otros motores: icontains sobre el documento normalizado.
+"""
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+
+from django.db import connection, transaction
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_delete, post_save
+
+from .models import Card, CardSearchDocument, ChecklistItem, Comment
+
+FTS_TABLE = 'api_card_fts'
+_WORD = re.compile(r'\w+', re.UNICODE)
+
+
+def fold(text):
+    """Minúsculas y sin diacríticos ('Química' -> 'quimica')."""
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+# -----------------------
+# INDEXACIÓN
+# -----------------------
+def build_documents(card_ids, card_model=Card, comment_model=Comment, checklist_model=ChecklistItem):
+    """Documentos normalizados de las tarjetas dadas (tres consultas en total)."""
+    extra = defaultdict(list)
+    for card_id, content in comment_model.objects.filter(card_id__in=card_ids).values_list('card_id', 'content'):
+        extra[card_id].append(content)
+    for card_id, text in checklist_model.objects.filter(card_id__in=card_ids).values_list('card_id', 'text'):
+        extra[card_id].append(text)
+    return [
+        (card_id, fold(title), fold('\n'.join([description or ''] + extra[card_id])))
+        for card_id, title, description in card_model.objects.filter(id__in=card_ids).values_list('id', 'title', 'description')
+    ]
+
+
+def reindex(card_ids):
+    """Crea o actualiza los documentos de búsqueda de `card_ids` con un solo upsert."""
+    docs = [CardSearchDocument(card_id=i, title=t, body=b) for i, t, b in build_documents(list(card_ids))]
+    if docs:
+        CardSearchDocument.objects.bulk_create(
+            docs, update_conflicts=True, unique_fields=['card'], update_fields=['title', 'body'],
+        )
+
+
+_pending = threading.local()
+
+
+def mark_dirty(card_id):
+    if card_id is None:
+        return
+    if not hasattr(_pending, 'cards'):
+        _pending.cards = set()
+    _pending.cards.add(card_id)
+    transaction.on_commit(flush)
+
+
+def flush():
+    cards = getattr(_pending, 'cards', None)
+    if not cards:
+        return
+    _pending.cards = set()
+    reindex(cards)
+
+
+def _on_card_saved(sender, instance, update_fields=None, **kwargs):
+    # Mover o reordenar no cambia el texto indexado
+    if update_fields and set(update_fields) <= {'list', 'board', 'position'}:
+        return
+    mark_dirty(instance.pk)
+
+
+def _on_child_changed(sender, instance, **kwargs):
+    mark_dirty(instance.card_id)
+
+
+post_save.connect(_on_card_saved, sender=Card, dispatch_uid='search-card-save')
+for _model in (Comment, ChecklistItem):
+    post_save.connect(_on_child_changed, sender=_model, dispatch_uid=f'search-save-{_model.__name__}')
+    post_delete.connect(_on_child_changed, sender=_model, dispatch_uid=f'search-delete-{_model.__name__}')
+
+
+# -----------------------
+# CONSULTA
+# -----------------------
+def _fts_available():
+    if not hasattr(_fts_available, 'value'):
+        with connection.cursor() as cursor:
+            _fts_available.value = FTS_TABLE in connection.introspection.table_names(cursor)
+    return _fts_available.value
+
+
+def search_cards(queryset, text):
+    """
+    Filtra `queryset` (de Card) a las tarjetas que coinciden con `text` y las ordena por relevancia.
+    La coincidencia se resuelve en el índice; el queryset solo aporta la visibilidad.
+    """
+    terms = _WORD.findall(fold(text))
+    if not terms:
+        return queryset.none()
+    card_table = Card._meta.db_table
+    if connection.vendor == 'sqlite' and _fts_available():
+        match = ' '.join(f'"{term}"*' for term in terms)
+        matches = RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [match])
+        # bm25 es menor cuanto más relevante
+        rank = RawSQL(
+            f'SELECT bm25({FTS_TABLE}, 10.0, 1.0) FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s AND rowid = "{card_table}"."id"', [match],
+        )
+        return queryset.filter(id__in=matches).annotate(search_rank=rank).order_by('search_rank', 'id')
+    if connection.vendor == 'postgresql':
+        query = ' '.join(terms)
+        doc_table = CardSearchDocument._meta.db_table
+        matches = RawSQL(
+            f"SELECT card_id FROM {doc_table} WHERE document @@ plainto_tsquery('spanish', %s)", [query],
+        )
+        rank = RawSQL(
+            f"SELECT ts_rank(document, plainto_tsquery('spanish', %s)) FROM {doc_table} "
+            f'WHERE card_id = "{card_table}"."id"', [query],
+        )
+        return queryset.filter(id__in=matches).annotate(search_rank=rank).order_by('-search_rank', 'id')
+    condition = Q()
+    for term in terms:
+        condition &= Q(search_document__title__contains=term) | Q(search_document__body__contains=term)
+    return queryset.filter(condition)
@@ -1,72 +1,91 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from .models import Profile, Board, List, Card, Comment, Label, ChecklistItem, Attachment, Activity
+from .models import Profile, Board, List, Card, Comment, Label, ChecklistItem, Attachment, Activity, ActivityArchive
+from .instrumentation import span
 
-class UserSerializer(serializers.ModelSerializer):
+
+class ModelSerializer(serializers.ModelSerializer):
+    """ModelSerializer cuyo tiempo se suma al tramo 'serialize' del request (api/instrumentation.py)."""
+    def to_representation(self, instance):
+        with span('serialize'):
+            return super().to_representation(instance)
+
+
+class UserSerializer(ModelSerializer):
     class Meta:
         model = User
         fields = ['id','username','email']
 
-class ProfileSerializer(serializers.ModelSerializer):
+class ProfileSerializer(ModelSerializer):
     user = UserSerializer(read_only=True)
     class Meta:
         model = Profile
         fields = ['user','role']
 
-class BoardSerializer(serializers.ModelSerializer):
+class BoardSerializer(ModelSerializer):
     owner = UserSerializer(read_only=True)
     members = UserSerializer(read_only=True, many=True)
     class Meta:
         model = Board
-        fields = ['id','name','owner','members','color','created_at']
+        fields = ['id','name','owner','members','color','created_at','version']
+        read_only_fields = ['version']
 
-class ListSerializer(serializers.ModelSerializer):
+class ListSerializer(ModelSerializer):
     class Meta:
         model = List
         fields = ['id','board','title','position']
 
-class CardSerializer(serializers.ModelSerializer):
+class CardSerializer(ModelSerializer):
     labels = serializers.PrimaryKeyRelatedField(queryset=Label.objects.all(), many=True, required=False)
-    board = serializers.SerializerMethodField(read_only=True)
+    board = serializers.IntegerField(source='board_id', read_only=True)
     class Meta:
         model = Card
         fields = ['id','list','board','title','description','due_date','priority','position','created_by','assignees','labels']
+        read_only_fields = ['created_by']
 
-    def get_board(self, obj):
-        try:
-            return obj.list.board_id
-        except Exception:
-            return None
+class SnapshotCardSerializer(CardSerializer):
+    """Tarjeta dentro del snapshot del tablero: agrega progreso de checklist y conteo de comentarios."""
+    checklist_total = serializers.IntegerField(read_only=True)
+    checklist_done = serializers.IntegerField(read_only=True)
+    comments_count = serializers.IntegerField(read_only=True)
+    class Meta(CardSerializer.Meta):
+        fields = CardSerializer.Meta.fields + ['checklist_total','checklist_done','comments_count']
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(ModelSerializer):
     author = UserSerializer(read_only=True)
     class Meta:
         model = Comment
         fields = ['id','card','author','content','created_at']
 
-class LabelSerializer(serializers.ModelSerializer):
+class LabelSerializer(ModelSerializer):
     class Meta:
         model = Label
         fields = ['id','board','name','color']
 
-class ChecklistItemSerializer(serializers.ModelSerializer):
+class ChecklistItemSerializer(ModelSerializer):
     class Meta:
         model = ChecklistItem
         fields = ['id','card','text','done','position']
 
-class AttachmentSerializer(serializers.ModelSerializer):
+class AttachmentSerializer(ModelSerializer):
     class Meta:
         model = Attachment
         fields = ['id','card','url','name','created_at']
 
-class ActivitySerializer(serializers.ModelSerializer):
+class ActivitySerializer(ModelSerializer):
     actor = UserSerializer(read_only=True)
     class Meta:
         model = Activity
         fields = ['id','card','board','actor','action','meta','created_at']
 
 
-class AdminUserSerializer(serializers.ModelSerializer):
+class ActivityArchiveSerializer(ModelSerializer):
+    class Meta:
+        model = ActivityArchive
+        fields = ['id', 'board', 'period', 'events', 'original_events', 'start_at', 'end_at', 'created_at']
+
+
+class AdminUserSerializer(ModelSerializer):
     role = serializers.ChoiceField(choices=[('student', 'student'), ('teacher', 'teacher')], write_only=True, required=False)
     password = serializers.CharField(write_only=True, required=False, allow_blank=True)
     profile_role = serializers.SerializerMethodField(read_only=True)
@@ -0,0 +1,61 @@
+"""
+Perfil SQLite para despliegues de un solo nodo (settings.SQLITE_TUNED).
+
+Al abrir cada conexión se aplican los PRAGMA de settings.SQLITE_PRAGMAS: WAL (los
+lectores no bloquean al escritor), synchronous=NORMAL (seguro con WAL), E/S mapeada
+en memoria, busy_timeout y tamaño de caché de páginas. core/database.py además abre
+las transacciones en modo IMMEDIATE, que toma el lock de escritura al empezar en vez
+de fallar con "database is locked" al querer promoverlo a mitad de transacción.
+
+`serialized_write()` encola en el proceso las escrituras de varias sentencias
+(movimientos con reordenamiento) para que no compitan entre hilos por ese lock.
+"""
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.backends.signals import connection_created
+
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'busy_timeout': 20000,
+    'cache_size': -20000,  # en KiB: ~20 MB
+    'temp_store': 'MEMORY',
+}
+
+_write_lock = threading.Lock()
+
+
+def tuned():
+    return getattr(settings, 'SQLITE_TUNED', False)
+
+
+def _apply_pragmas(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite' or not tuned():
+        return
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', DEFAULT_PRAGMAS)
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+connection_created.connect(_apply_pragmas, dispatch_uid='sqlite-pragmas')
+
+
+@contextmanager
+def serialized_write():
+    """
+    transaction.atomic() que, en SQLite con el perfil activo (o SQLITE_SERIALIZE_WRITES),
+    espera su turno en una cola del proceso antes de empezar.
+    """
+    serialize = connection.vendor == 'sqlite' and getattr(settings, 'SQLITE_SERIALIZE_WRITES', tuned())
+    if not serialize or connection.in_atomic_block:
+        with transaction.atomic():
+            yield
+        return
+    with _write_lock:
+        with transaction.atomic():
+            yield
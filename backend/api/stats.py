@@ -0,0 +1,302 @@
+"""
+Estadísticas precalculadas del dashboard (BoardStat).
+
+Cada fila cuenta tarjetas de un tablero por asignado (None = todo el tablero),
+prioridad y día de vencimiento, junto con el progreso de sus checklists. Se
+mantienen por deltas: las escrituras de tarjetas, checklist, asignados y listas
+anotan las tarjetas tocadas y, cuando versioning confirma la transacción, se
+compara el aporte guardado de cada una (CardStat) con el actual y solo se
+suma/resta la diferencia en sus filas (bucket anterior y nuevo). El costo depende
+de las tarjetas tocadas, no del tamaño del tablero. `rebuild` recalcula todo desde
+cero y solo lo usan `manage.py rebuild_board_stats` y seed_benchmark.
+
+Los conteos que dependen de la fecha (vencidas, vencen esta semana) se resuelven al
+leer, sumando las filas por rango de días.
+"""
+import threading
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Value
+from django.db.models.functions import Greatest, TruncDate
+from django.db.models.signals import m2m_changed
+from django.utils import timezone
+
+from . import versioning
+from .models import BoardStat, Card, CardStat, ChecklistItem, List
+from .versioning import board_written, boards_changed
+
+BATCH = 500
+
+_pending = threading.local()
+
+
+def compute_rows(board_ids, card_model=Card, stat_model=BoardStat):
+    """Filas de BoardStat para los tableros dados, sin guardarlas."""
+    cards = card_model.objects.filter(board_id__in=board_ids).annotate(day=TruncDate('due_date'))
+    aggregates = {
+        'n_cards': Count('id', distinct=True),
+        'n_checklist': Count('checklist'),
+        'n_done': Count('checklist', filter=Q(checklist__done=True)),
+    }
+    rows = []
+    # Por tablero completo
+    for row in cards.values('board_id', 'priority', 'day').annotate(**aggregates).order_by():
+        rows.append(stat_model(
+            board_id=row['board_id'], assignee_id=None, priority=row['priority'], due_date=row['day'],
+            cards=row['n_cards'], checklist_total=row['n_checklist'], checklist_done=row['n_done'],
+        ))
+    # Por asignado: cada grupo tiene un solo asignado, así el join con checklist no duplica
+    per_assignee = (
+        cards.filter(assignees__isnull=False)
+        .values('board_id', 'assignees', 'priority', 'day')
+        .annotate(**aggregates)
+        .order_by()
+    )
+    for row in per_assignee:
+        rows.append(stat_model(
+            board_id=row['board_id'], assignee_id=row['assignees'], priority=row['priority'], due_date=row['day'],
+            cards=row['n_cards'], checklist_total=row['n_checklist'], checklist_done=row['n_done'],
+        ))
+    return rows
+
+
+def card_states(card_ids, card_model=Card, state_model=CardStat):
+    """Aporte actual (CardStat sin guardar) de las tarjetas dadas que existen."""
+    rows = (
+        card_model.objects.filter(id__in=card_ids)
+        .annotate(day=TruncDate('due_date'))
+        .values('id', 'board_id', 'priority', 'day')
+        .annotate(n_checklist=Count('checklist'), n_done=Count('checklist', filter=Q(checklist__done=True)))
+        .order_by()
+    )
+    through = card_model._meta.get_field('assignees').remote_field.through
+    assignees = defaultdict(list)
+    pairs = through.objects.filter(card_id__in=card_ids).order_by('card_id', 'user_id').values_list('card_id', 'user_id')
+    for card_id, user_id in pairs:
+        assignees[card_id].append(user_id)
+    return [
+        state_model(
+            card_id=row['id'], board_id=row['board_id'], priority=row['priority'], due_date=row['day'],
+            assignees=assignees[row['id']], checklist_total=row['n_checklist'], checklist_done=row['n_done'],
+        )
+        for row in rows
+    ]
+
+
+def _state_key(state):
+    if state is None:
+        return None
+    return (state.board_id, state.priority, state.due_date, tuple(state.assignees),
+            state.checklist_total, state.checklist_done)
+
+
+def _contribute(deltas, state, sign):
+    for assignee_id in (None, *state.assignees):
+        delta = deltas[(state.board_id, assignee_id, state.priority, state.due_date)]
+        delta[0] += sign
+        delta[1] += sign * state.checklist_total
+        delta[2] += sign * state.checklist_done
+
+
+def _apply_deltas(deltas):
+    boards = set()
+    for (board_id, assignee_id, priority, due_date), (cards, total, done) in deltas.items():
+        if not (cards or total or done):
+            continue
+        boards.add(board_id)
+        updated = BoardStat.objects.filter(
+            board_id=board_id, assignee_id=assignee_id, priority=priority, due_date=due_date,
+        ).update(
+            cards=Greatest(F('cards') + cards, Value(0)),
+            checklist_total=Greatest(F('checklist_total') + total, Value(0)),
+            checklist_done=Greatest(F('checklist_done') + done, Value(0)),
+        )
+        if not updated and cards > 0:
+            BoardStat.objects.create(
+                board_id=board_id, assignee_id=assignee_id, priority=priority, due_date=due_date,
+                cards=cards, checklist_total=max(total, 0), checklist_done=max(done, 0),
+            )
+    if boards:
+        BoardStat.objects.filter(board_id__in=boards, cards=0).delete()
+
+
+def apply_changes(card_ids):
+    """Lleva a BoardStat la diferencia entre el aporte guardado y el actual de cada tarjeta."""
+    card_ids = sorted(card_ids)
+    for start in range(0, len(card_ids), BATCH):
+        ids = card_ids[start:start + BATCH]
+        with transaction.atomic():
+            old = {state.card_id: state for state in CardStat.objects.select_for_update().filter(card_id__in=ids)}
+            new = {state.card_id: state for state in card_states(ids)}
+            changed = [pk for pk in ids if _state_key(old.get(pk)) != _state_key(new.get(pk))]
+            if not changed:
+                continue
+            deltas = defaultdict(lambda: [0, 0, 0])
+            for pk in changed:
+                if pk in old:
+                    _contribute(deltas, old[pk], -1)
+                if pk in new:
+                    _contribute(deltas, new[pk], 1)
+            _apply_deltas(deltas)
+            CardStat.objects.filter(card_id__in=changed).delete()
+            CardStat.objects.bulk_create([new[pk] for pk in changed if pk in new])
+
+
+def rebuild(board_ids):
+    """Reemplaza las estadísticas de los tableros dados, y el aporte guardado de sus tarjetas."""
+    board_ids = list(board_ids)
+    rows = compute_rows(board_ids)
+    card_ids = list(Card.objects.filter(board_id__in=board_ids).values_list('id', flat=True))
+    states = []
+    for start in range(0, len(card_ids), BATCH):
+        states += card_states(card_ids[start:start + BATCH])
+    with transaction.atomic():
+        BoardStat.objects.filter(board_id__in=board_ids).delete()
+        BoardStat.objects.bulk_create(rows)
+        CardStat.objects.filter(
+            Q(board_id__in=board_ids) | Q(card_id__in=Card.objects.filter(board_id__in=board_ids).values('id'))
+        ).delete()
+        CardStat.objects.bulk_create(states)
+
+
+# -----------------------
+# TARJETAS TOCADAS
+# -----------------------
+def _touched():
+    if not hasattr(_pending, 'cards'):
+        _pending.cards, _pending.lists = set(), set()
+    return _pending
+
+
+def _on_card_write(sender, instance, **kwargs):
+    _touched().cards.add(instance.pk)
+
+
+def _on_checklist_write(sender, instance, **kwargs):
+    cards = _touched().cards
+    cards.add(instance.card_id)
+    # Ítem pasado a otra tarjeta (BoardScoped.refresh_board): también cambia la de origen
+    source = getattr(instance, '_source_parent_id', None)
+    if source is not None:
+        cards.add(source)
+
+
+def _on_list_save(sender, instance, **kwargs):
+    # List.save actualiza _loaded_board_id después de guardar: aquí aún es el anterior
+    previous = getattr(instance, '_loaded_board_id', None)
+    if previous is not None and previous != instance.board_id:
+        _touched().lists.add(instance.pk)
+
+
+def _on_assignees(sender, instance, action, reverse, pk_set, **kwargs):
+    # add/remove/clear envían m2m_changed dentro de su atomic: el flush aún no corrió
+    cards = _touched().cards
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            cards.add(instance.pk)
+    elif action in ('post_add', 'post_remove'):
+        cards.update(pk_set or ())
+    elif action == 'pre_clear':
+        # user.assigned_cards.clear(): versioning no recibe los ids, se marcan aquí
+        rows = Card.objects.filter(assignees=instance).values_list('id', 'board_id')
+        for card_id, board_id in rows:
+            cards.add(card_id)
+            versioning.mark_board(board_id)
+
+
+def _on_boards_changed(sender, board_ids, models, **kwargs):
+    touched = _touched()
+    cards, lists = touched.cards, touched.lists
+    touched.cards, touched.lists = set(), set()
+    if lists:
+        cards.update(Card.objects.filter(list_id__in=lists).values_list('id', flat=True))
+    cards.discard(None)
+    if cards:
+        apply_changes(cards)
+
+
+# Por board_written y no post_save: así se anota antes de que versioning programe el flush
+for _model, _handler in ((Card, _on_card_write), (ChecklistItem, _on_checklist_write), (List, _on_list_save)):
+    board_written.connect(_handler, sender=_model, dispatch_uid=f'board-stats-written-{_model.__name__}')
+m2m_changed.connect(_on_assignees, sender=Card.assignees.through, dispatch_uid='board-stats-assignees')
+boards_changed.connect(_on_boards_changed, dispatch_uid='board-stats-deltas')
+
+
+# -----------------------
+# LECTURA
+# -----------------------
+def _empty():
+    return {"total": 0, "overdue": 0, "due_this_week": 0, "no_due_date": 0,
+            "by_priority": {}, "checklist": {"total": 0, "done": 0, "ratio": None}}
+
+
+def _add(summary, stat, today, week_end):
+    summary["total"] += stat.cards
+    summary["by_priority"][stat.priority] = summary["by_priority"].get(stat.priority, 0) + stat.cards
+    if stat.due_date is None:
+        summary["no_due_date"] += stat.cards
+    elif stat.due_date < today:
+        summary["overdue"] += stat.cards
+    elif stat.due_date <= week_end:
+        summary["due_this_week"] += stat.cards
+    checklist = summary["checklist"]
+    checklist["total"] += stat.checklist_total
+    checklist["done"] += stat.checklist_done
+
+
+def _finish(summary):
+    checklist = summary["checklist"]
+    checklist["ratio"] = round(checklist["done"] / checklist["total"], 4) if checklist["total"] else None
+    return summary
+
+
+def summarize(stats):
+    """
+    Agrupa filas de BoardStat en {(board_id, assignee_id): resumen}.
+    Vencidas: día de vencimiento anterior a hoy; esta semana: de hoy a hoy+6.
+    """
+    today = timezone.localdate()
+    week_end = today + timedelta(days=6)
+    out = defaultdict(_empty)
+    for stat in stats:
+        _add(out[(stat.board_id, stat.assignee_id)], stat, today, week_end)
+    return {key: _finish(value) for key, value in out.items()}
+
+
+def board_stats(board_id):
+    """Resumen del tablero y de cada asignado (una consulta)."""
+    summaries = summarize(BoardStat.objects.filter(board_id=board_id))
+    return {
+        "board": summaries.get((board_id, None), _finish(_empty())),
+        "by_assignee": [
+            {"user": assignee_id, **summary}
+            for (_, assignee_id), summary in sorted(summaries.items(), key=lambda kv: kv[0][1] or 0)
+            if assignee_id is not None
+        ],
+    }
+
+
+def user_stats(user, board_ids):
+    """Resumen por tablero y de las tarjetas asignadas a `user` en esos tableros (una consulta)."""
+    stats = BoardStat.objects.filter(board_id__in=board_ids).filter(Q(assignee__isnull=True) | Q(assignee=user))
+    summaries = summarize(stats)
+    mine = _empty()
+    for (_, assignee_id), summary in summaries.items():
+        if assignee_id is None:
+            continue
+        for key in ("total", "overdue", "due_this_week", "no_due_date"):
+            mine[key] += summary[key]
+        for priority, n in summary["by_priority"].items():
+            mine["by_priority"][priority] = mine["by_priority"].get(priority, 0) + n
+        mine["checklist"]["total"] += summary["checklist"]["total"]
+        mine["checklist"]["done"] += summary["checklist"]["done"]
+    return {
+        "boards": [
+            {"board": board_id, **summary}
+            for (board_id, assignee_id), summary in sorted(summaries.items(), key=lambda kv: kv[0][0])
+            if assignee_id is None
+        ],
+        "assigned_to_me": _finish(mine),
+    }
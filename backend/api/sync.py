@@ -0,0 +1,145 @@
+"""
+Sincronización incremental: `GET sync/?since=<cursor>`.
+
+Cada alta, modificación o borrado de listas, tarjetas, etiquetas, ítems de checklist y
+comentarios agrega una fila a ChangeLog dentro de la misma transacción (señales), con
+su board_id. Los borrados quedan como lápidas, incluidos los que ocurren en
+cascada, y una tarjeta que se muda de tablero deja una lápida en el tablero de origen
+(el cliente descarta con ella su checklist y comentarios) y llega con ellos al destino.
+Una lista mudada arrastra sus tarjetas con update(), sin señales: List.save escribe
+esas filas por su cuenta.
+
+El cursor es ChangeLog.id. En SQLite los ids se confirman en orden (un solo
+escritor); en otros motores se omiten las filas de los últimos SYNC_SETTLE_SECONDS
+para no saltarse transacciones que aún no se confirmaron. Las filas con más de
+SYNC_LOG_RETENTION_DAYS se borran con `manage.py prune_sync_log`; un cursor anterior a
+lo retenido recibe 410 y el cliente debe volver a cargar el tablero completo.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection, models
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.utils import timezone
+
+from .models import Card, ChangeLog, ChecklistItem, Comment, Label, List
+from .serializers import (
+    CardSerializer, ChecklistItemSerializer, CommentSerializer, LabelSerializer, ListSerializer,
+)
+
+# nombre en la respuesta -> (modelo, serializer)
+MODELS = {
+    'lists': (List, ListSerializer),
+    'cards': (Card, CardSerializer),
+    'labels': (Label, LabelSerializer),
+    'checklist': (ChecklistItem, ChecklistItemSerializer),
+    'comments': (Comment, CommentSerializer),
+}
+NAMES = {model: name for name, (model, _) in MODELS.items()}
+QUERYSETS = {
+    'cards': lambda: Card.objects.prefetch_related(
+        models.Prefetch('labels', queryset=Label.objects.only('id')),
+        models.Prefetch('assignees', queryset=User.objects.only('id')),
+    ),
+    'comments': lambda: Comment.objects.select_related('author'),
+}
+
+
+# -----------------------
+# REGISTRO
+# -----------------------
+def record(instances, deleted=False):
+    rows = []
+    for instance in instances:
+        if instance.board_id is None:
+            continue  # etiqueta global: no pertenece a ningún tablero
+        name = NAMES[type(instance)]
+        rows.append(ChangeLog(board_id=instance.board_id, model=name, object_id=instance.pk, deleted=deleted))
+        source = getattr(instance, '_source_board_id', None)
+        if source is not None and not deleted:
+            # Mudado de tablero (BoardScoped.refresh_board): lápida en el origen y, si es
+            # una tarjeta, sus hijos como altas en el destino
+            instance._source_board_id = None
+            rows.append(ChangeLog(board_id=source, model=name, object_id=instance.pk, deleted=True))
+            for child in ((ChecklistItem, Comment) if isinstance(instance, Card) else ()):
+                rows += [
+                    ChangeLog(board_id=instance.board_id, model=NAMES[child], object_id=pk)
+                    for pk in child.objects.filter(card_id=instance.pk).values_list('id', flat=True)
+                ]
+    if rows:
+        ChangeLog.objects.bulk_create(rows)
+
+
+def _on_save(sender, instance, **kwargs):
+    record([instance])
+
+
+def _on_delete(sender, instance, **kwargs):
+    record([instance], deleted=True)
+
+
+def _on_card_m2m(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        record([instance])
+    elif pk_set:
+        record(Card.objects.filter(id__in=pk_set).only('id', 'board_id'))
+
+
+for _model in NAMES:
+    post_save.connect(_on_save, sender=_model, dispatch_uid=f'sync-save-{_model.__name__}')
+    post_delete.connect(_on_delete, sender=_model, dispatch_uid=f'sync-delete-{_model.__name__}')
+for _through in (Card.labels.through, Card.assignees.through):
+    m2m_changed.connect(_on_card_m2m, sender=_through, dispatch_uid=f'sync-m2m-{_through.__name__}')
+
+
+# -----------------------
+# LECTURA
+# -----------------------
+class CursorExpired(Exception):
+    pass
+
+
+def latest_cursor():
+    return ChangeLog.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+
+def changes_since(board_ids, since, limit):
+    """
+    Cambios de `board_ids` posteriores a `since`. Devuelve
+    (cursor, has_more, upserted {nombre: [datos]}, deleted {nombre: [ids]}).
+    """
+    oldest = ChangeLog.objects.order_by('id').values_list('id', flat=True).first()
+    if oldest is not None and since + 1 < oldest:
+        # Se podaron cambios posteriores al cursor
+        raise CursorExpired()
+    qs = ChangeLog.objects.filter(board_id__in=board_ids, id__gt=since)
+    settle = getattr(settings, 'SYNC_SETTLE_SECONDS', 2)
+    if connection.vendor != 'sqlite' and settle:
+        qs = qs.filter(created_at__lt=timezone.now() - timedelta(seconds=settle))
+    entries = list(qs.order_by('id').values_list('id', 'model', 'object_id')[:limit + 1])
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    cursor = entries[-1][0] if entries else since
+
+    # Vale el estado actual: lo que existe y es visible es alta/cambio; el resto, lápida
+    # (borrado, o movido a un tablero ajeno después de la entrada)
+    touched = {}
+    for _, name, object_id in entries:
+        touched.setdefault(name, set()).add(object_id)
+    upserted, deleted = {}, {}
+    for name, (model, serializer) in MODELS.items():
+        ids = touched.get(name, set())
+        queryset = QUERYSETS.get(name, lambda model=model: model.objects.all())()
+        found = list(queryset.filter(id__in=ids).order_by('id')) if ids else []
+        visible = [obj for obj in found if obj.board_id in board_ids]
+        upserted[name] = serializer(visible, many=True).data
+        deleted[name] = sorted(ids - {obj.id for obj in visible})
+    return cursor, has_more, upserted, deleted
+
+
+def prune(days=None):
+    days = days if days is not None else getattr(settings, 'SYNC_LOG_RETENTION_DAYS', 30)
+    return ChangeLog.objects.filter(created_at__lt=timezone.now() - timedelta(days=days)).delete()[0]
@@ -0,0 +1,40 @@
+"""
+Revocación de tokens: debe valer en todos los procesos, no solo en el que la registró.
+"""
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api import authentication
+from api.authentication import add_user_claims
+
+
+@override_settings(ACTIVITY_LOG={'ASYNC': False})
+class TokenRevocationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('u', password='x')
+
+    def get_boards(self, token):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        return client.get('/api/api/boards/')
+
+    def test_revocation_survives_another_workers_cache(self):
+        for store in ('db', 'cache'):
+            with self.subTest(store=store), self.settings(TOKEN_REVOCATION_STORE=store):
+                self.user.is_active = True
+                self.user.save()
+                token = str(add_user_claims(AccessToken.for_user(self.user), self.user))
+                self.assertEqual(self.get_boards(token).status_code, 200)
+
+                self.user.is_active = False
+                self.user.save()
+                # Otro worker: ni su caché en memoria ni su copia de la tabla vieron la revocación
+                cache.clear()
+                with mock.patch.object(authentication, '_process_revocations', authentication._ProcessRevocations()):
+                    self.assertEqual(self.get_boards(token).status_code, 401)
@@ -0,0 +1,37 @@
+"""
+Los caminos calientes usan los índices de 0004_hot_path_indexes (EXPLAIN QUERY PLAN).
+"""
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from api.models import Activity, Board, Card, List
+
+
+@skipUnless(connection.vendor == 'sqlite', 'El plan se verifica con EXPLAIN QUERY PLAN de SQLite')
+class HotPathIndexTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('owner', password='x')
+        cls.board = Board.objects.create(name='b', owner=cls.user)
+        cls.list = List.objects.create(board=cls.board, title='l')
+
+    def assertUsesIndex(self, queryset, index):
+        plan = queryset.explain()
+        self.assertIn(index, plan, plan)
+
+    def test_cards_of_list_by_position(self):
+        self.assertUsesIndex(Card.objects.filter(list=self.list).order_by('position'), 'card_list_position_idx')
+
+    def test_cards_by_due_date_range(self):
+        now = timezone.now()
+        queryset = Card.objects.filter(due_date__gte=now, due_date__lt=now + timedelta(days=30))
+        self.assertUsesIndex(queryset, 'card_due_date_idx')
+
+    def test_board_activity_newest_first(self):
+        queryset = Activity.objects.filter(board=self.board).order_by('-created_at')
+        self.assertUsesIndex(queryset, 'activity_board_created_idx')
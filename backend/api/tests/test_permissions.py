@@ -0,0 +1,98 @@
+"""
+Escrituras de un tablero: solo sus miembros.
+"""
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from api import versioning
+from api.models import Board, Card, ChecklistItem, List
+
+
+# Actividad guardada en el mismo hilo al confirmar (sin el escritor de fondo)
+@override_settings(ACTIVITY_LOG={'ASYNC': False})
+class BoardPermissionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', password='x')
+        cls.outsider = User.objects.create_user('outsider', password='x')
+        cls.board = Board.objects.create(name='b', owner=cls.owner)
+        cls.board.members.add(cls.owner)
+        cls.lists = [List.objects.create(board=cls.board, title=f'l{i}', position=i * 1024) for i in range(3)]
+        cls.card = Card.objects.create(list=cls.lists[0], title='c', created_by=cls.owner)
+        cls.own_board = Board.objects.create(name='propio', owner=cls.outsider)
+        cls.own_board.members.add(cls.outsider)
+        cls.own_list = List.objects.create(board=cls.own_board, title='l')
+
+    def setUp(self):
+        cache.clear()
+        # setUpTestData no confirma su transacción: se aplican ahora las versiones pendientes
+        versioning.flush()
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(User.objects.get(pk=user.pk))
+        return client
+
+    def test_non_member_cannot_move_list(self):
+        response = self.client_for(self.outsider).patch(
+            f'/api/api/lists/{self.lists[0].id}/move/', {'position': 2}, format='json',
+        )
+        self.assertEqual(response.status_code, 403)
+        self.lists[0].refresh_from_db()
+        self.assertEqual(self.lists[0].position, 0)
+
+    def test_member_moves_list(self):
+        response = self.client_for(self.owner).patch(
+            f'/api/api/lists/{self.lists[0].id}/move/', {'position': 2}, format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+        order = list(List.objects.filter(board=self.board).order_by('position').values_list('id', flat=True))
+        self.assertEqual(order[-1], self.lists[0].id)
+
+    def test_bulk_create_card_on_foreign_board_rejects_batch(self):
+        operations = [
+            {'op': 'create', 'data': {'list': self.own_list.id, 'title': 'mía'}},
+            {'op': 'create', 'data': {'list': self.lists[0].id, 'title': 'ajena'}},
+        ]
+        response = self.client_for(self.outsider).post('/api/api/cards/bulk/', {'operations': operations}, format='json')
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Card.objects.filter(title__in=['mía', 'ajena']).exists())
+
+    def test_bulk_update_card_into_foreign_list_is_rejected(self):
+        card = Card.objects.create(list=self.own_list, title='mía', created_by=self.outsider)
+        operations = [{'op': 'update', 'id': card.id, 'data': {'list': self.lists[0].id}}]
+        response = self.client_for(self.outsider).post('/api/api/cards/bulk/', {'operations': operations}, format='json')
+        self.assertEqual(response.status_code, 403)
+        card.refresh_from_db()
+        self.assertEqual(card.board_id, self.own_board.id)
+
+    def test_bulk_create_checklist_on_foreign_card_is_rejected(self):
+        operations = [{'op': 'create', 'data': {'card': self.card.id, 'text': 'x'}}]
+        response = self.client_for(self.outsider).post('/api/api/checklist/bulk/', {'operations': operations}, format='json')
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(ChecklistItem.objects.exists())
+
+    def test_member_bulk_creates(self):
+        operations = [{'op': 'create', 'data': {'list': self.lists[1].id, 'title': 'nueva'}}]
+        response = self.client_for(self.owner).post('/api/api/cards/bulk/', {'operations': operations}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Card.objects.get(title='nueva').board_id, self.board.id)
+
+    def test_lists_only_from_member_boards(self):
+        client = self.client_for(self.outsider)
+        response = client.get('/api/api/lists/')
+        self.assertEqual([row['id'] for row in response.json()], [self.own_list.id])
+        # Una escritura en un tablero ajeno no invalida el ETag
+        with self.captureOnCommitCallbacks(execute=True):
+            List.objects.create(board=self.board, title='otra')
+        response = self.client_for(self.outsider).get('/api/api/lists/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_checklist_only_from_member_boards(self):
+        ChecklistItem.objects.create(card=self.card, text='ajeno')
+        response = self.client_for(self.outsider).get('/api/api/checklist/')
+        self.assertEqual(response.json(), [])
+        response = self.client_for(self.owner).get('/api/api/checklist/')
+        self.assertEqual([row['text'] for row in response.json()], ['ajeno'])
@@ -0,0 +1,89 @@
+"""
+Presupuesto de consultas por endpoint de lectura: el mismo número con 10 filas que
+con 10.000. Si un cambio agrega una consulta por fila (N+1) o una consulta extra,
+falla aquí.
+"""
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from api.models import Activity, Attachment, Board, Card, ChecklistItem, Comment, Label, List, Profile
+
+# url (relativa a /api/api/, con {board} como tablero principal) -> consultas
+BUDGETS = {
+    'boards/': 4,
+    'boards/{board}/': 4,
+    'boards/{board}/members/': 5,
+    'boards/{board}/snapshot/': 8,
+    'lists/': 3,
+    'cards/': 5,
+    'cards/?page_size=50': 5,
+    'comments/': 1,
+    'labels/': 3,
+    'checklist/': 2,
+    'attachments/': 1,
+    'activities/': 2,
+    'activities/?page_size=50': 2,
+    'admin/users/': 1,
+    'admin/users/?page_size=50': 1,
+}
+
+
+class QueryBudgetMixin:
+    rows = None
+
+    @classmethod
+    def setUpTestData(cls):
+        n = cls.rows
+        cls.user = User.objects.create_user('owner', password='x', is_staff=True)
+        Profile.objects.create(user=cls.user, role='teacher')
+        others = User.objects.bulk_create([User(username=f'u{i:05d}') for i in range(n)])
+        boards = Board.objects.bulk_create([Board(name=f'b{i}', owner=cls.user) for i in range(n)])
+        cls.board = boards[0]
+        Membership = Board.members.through
+        Membership.objects.bulk_create(
+            [Membership(board_id=b.id, user_id=cls.user.id) for b in boards]
+            + [Membership(board_id=cls.board.id, user_id=u.id) for u in others]
+        )
+        lists = List.objects.bulk_create([List(board=cls.board, title=f'l{i}', position=i) for i in range(n)])
+        labels = Label.objects.bulk_create([Label(board=cls.board, name=f'e{i}') for i in range(n)])
+        cards = Card.objects.bulk_create([
+            Card(list=lists[i % len(lists)], board=cls.board, title=f'c{i}', position=i, created_by=cls.user)
+            for i in range(n)
+        ])
+        Card.labels.through.objects.bulk_create([
+            Card.labels.through(card_id=c.id, label_id=labels[i].id) for i, c in enumerate(cards)
+        ])
+        Card.assignees.through.objects.bulk_create([
+            Card.assignees.through(card_id=c.id, user_id=others[i].id) for i, c in enumerate(cards)
+        ])
+        ChecklistItem.objects.bulk_create([ChecklistItem(card=c, board=cls.board, text='t', position=0) for c in cards])
+        Comment.objects.bulk_create([Comment(card=c, board=cls.board, author=others[i], content='x') for i, c in enumerate(cards)])
+        Attachment.objects.bulk_create([Attachment(card=c, board=cls.board, url='https://example.com/a') for c in cards])
+        Activity.objects.bulk_create([
+            Activity(card=c, board=cls.board, actor=others[i], action='created') for i, c in enumerate(cards)
+        ])
+
+    def get(self, url):
+        # Sin cachés calientes (membresía, etiquetas, snapshot): se mide el peor caso
+        cache.clear()
+        client = APIClient()
+        client.force_authenticate(User.objects.get(pk=self.user.pk))
+        return client, '/api/api/' + url.format(board=self.board.id)
+
+    def test_budgets(self):
+        for url, budget in BUDGETS.items():
+            with self.subTest(url=url):
+                client, path = self.get(url)
+                with self.assertNumQueries(budget):
+                    response = client.get(path)
+                self.assertEqual(response.status_code, 200)
+
+
+class SmallDatasetQueryBudgetTests(QueryBudgetMixin, TestCase):
+    rows = 10
+
+
+class LargeDatasetQueryBudgetTests(QueryBudgetMixin, TestCase):
+    rows = 10_000
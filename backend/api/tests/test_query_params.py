@@ -0,0 +1,65 @@
+"""
+Parámetros de consulta mal formados: respuesta de cliente (4xx), nunca un 500.
+"""
+import base64
+import json
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from api import versioning
+from api.models import Board, Card, List
+
+
+def cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+@override_settings(ACTIVITY_LOG={'ASYNC': False})
+class QueryParamTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('u', password='x', is_staff=True)
+        cls.board = Board.objects.create(name='b', owner=cls.user)
+        cls.board.members.add(cls.user)
+        cls.list = List.objects.create(board=cls.board, title='l')
+        cls.cards = [Card.objects.create(list=cls.list, title=f'c{i}', position=i, created_by=cls.user) for i in range(3)]
+
+    def setUp(self):
+        cache.clear()
+        versioning.flush()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.get(pk=self.user.pk))
+
+    def test_cursor_with_values_of_wrong_type(self):
+        for url, values in (
+            ('/api/api/cards/', ['a', 1]),
+            ('/api/api/cards/', [0, 'x']),
+            ('/api/api/cards/', [None, 1]),
+            ('/api/api/activities/', ['ayer', 1]),
+            ('/api/api/activities/', [5, 1]),
+            ('/api/api/admin/users/', ['u', 'x']),
+        ):
+            with self.subTest(url=url, values=values):
+                response = self.client.get(url, {'cursor': cursor(values)})
+                self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.client.get('/api/api/cards/?cursor=WyJhIiwxXQ==').status_code, 404)
+
+    def test_cursor_with_valid_values(self):
+        response = self.client.get('/api/api/cards/', {'cursor': cursor([0, self.cards[0].id])})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([c['id'] for c in response.json()['results']], [c.id for c in self.cards[1:]])
+
+    def test_calendar_with_non_numeric_board(self):
+        response = self.client.get('/api/api/cards/calendar/', {'from': '2026-01-01', 'to': '2026-01-31', 'board': 'abc'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['days'], [])
+
+    def test_archives_with_non_numeric_filters(self):
+        response = self.client.get('/api/api/activities/archives/', {'segment': 'abc'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get('/api/api/activities/archives/', {'board': 'abc'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [])
@@ -0,0 +1,49 @@
+"""
+Flujo SSE de un tablero: solo mientras el usuario sigue siendo miembro.
+"""
+import asyncio
+from unittest import mock
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api import realtime
+from api.models import Board
+
+
+@override_settings(ACTIVITY_LOG={'ASYNC': False})
+class BoardEventsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', password='x')
+        cls.viewer = User.objects.create_user('viewer', password='x')
+        cls.board = Board.objects.create(name='b', owner=cls.owner)
+        cls.board.members.add(cls.owner, cls.viewer)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_stream_ends_when_member_is_removed(self):
+        request = RequestFactory().get(
+            f'/api/boards/{self.board.id}/events/', {'token': str(AccessToken.for_user(self.viewer))},
+        )
+
+        async def read():
+            response = await realtime.board_events(request, self.board.id)
+            self.assertEqual(response.status_code, 200)
+            chunks = []
+            async for chunk in response.streaming_content:
+                chunks.append(chunk)
+                if len(chunks) == 2:
+                    await sync_to_async(self.board.members.remove)(self.viewer)
+            return chunks
+
+        async def bounded():
+            return await asyncio.wait_for(read(), timeout=5)
+
+        with mock.patch.object(realtime, 'HEARTBEAT', 0.01):
+            chunks = async_to_sync(bounded)()
+        self.assertEqual(chunks, [b'retry: 3000\n\n', b': ping\n\n'])
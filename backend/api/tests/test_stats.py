@@ -0,0 +1,139 @@
+"""
+BoardStat se mantiene por deltas: tras cada escritura coincide con un recálculo
+completo, y el costo de una escritura no depende del tamaño del tablero.
+"""
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api import stats, versioning
+from api.models import Board, BoardStat, Card, ChecklistItem, List
+
+
+def stored(board_ids):
+    totals = {}
+    for row in BoardStat.objects.filter(board_id__in=board_ids):
+        key = (row.board_id, row.assignee_id, row.priority, row.due_date)
+        counts = totals.setdefault(key, [0, 0, 0])
+        counts[0] += row.cards
+        counts[1] += row.checklist_total
+        counts[2] += row.checklist_done
+    return totals
+
+
+def expected(board_ids):
+    return {
+        (row.board_id, row.assignee_id, row.priority, row.due_date): [row.cards, row.checklist_total, row.checklist_done]
+        for row in stats.compute_rows(board_ids)
+    }
+
+
+# Actividad guardada en el mismo hilo al confirmar (sin el escritor de fondo)
+@override_settings(ACTIVITY_LOG={'ASYNC': False})
+class IncrementalStatsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user('owner', password='x')
+        self.other = User.objects.create_user('other', password='x')
+        self.boards = [Board.objects.create(name=f'b{i}', owner=self.owner) for i in range(2)]
+        for board in self.boards:
+            board.members.add(self.owner, self.other)
+        self.lists = [List.objects.create(board=board, title='l') for board in self.boards]
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def write(self, func):
+        with self.captureOnCommitCallbacks(execute=True):
+            result = func()
+        ids = [board.id for board in self.boards]
+        self.assertEqual(stored(ids), expected(ids))
+        return result
+
+    def test_matches_rebuild_after_each_write(self):
+        due = timezone.now() + timedelta(days=2)
+        card = self.write(lambda: Card.objects.create(list=self.lists[0], title='a', created_by=self.owner))
+        second = self.write(lambda: Card.objects.create(
+            list=self.lists[0], title='b', priority='high', due_date=due, created_by=self.owner,
+        ))
+        self.write(lambda: self.client.patch(f'/api/api/cards/{card.id}/', {'priority': 'med', 'due_date': due.isoformat()}, format='json'))
+        self.write(lambda: card.assignees.add(self.owner, self.other))
+        item = self.write(lambda: ChecklistItem.objects.create(card=card, text='x'))
+        self.write(lambda: ChecklistItem.objects.create(card=second, text='y', done=True))
+        self.write(lambda: self.client.patch(f'/api/api/checklist/{item.id}/', {'done': True}, format='json'))
+        self.write(lambda: self.client.patch(f'/api/api/checklist/{item.id}/', {'card': second.id}, format='json'))
+        self.write(lambda: card.assignees.remove(self.owner))
+        self.write(lambda: self.other.assigned_cards.clear())
+        self.write(lambda: second.assignees.add(self.other))
+        self.write(lambda: self.client.patch(f'/api/api/cards/{second.id}/move/', {'list': self.lists[1].id, 'position': 0}, format='json'))
+        self.write(lambda: self.client.post('/api/api/cards/bulk/', {'operations': [
+            {'op': 'create', 'data': {'list': self.lists[0].id, 'title': 'c', 'priority': 'high'}},
+            {'op': 'update', 'id': card.id, 'data': {'priority': 'low'}},
+        ]}, format='json'))
+
+        def move_list():
+            self.lists[1].board = self.boards[0]
+            self.lists[1].save()
+        self.write(move_list)
+        self.write(lambda: ChecklistItem.objects.filter(card=second).delete())
+        self.write(lambda: card.delete())
+        self.write(lambda: self.boards[0].delete())
+
+    def test_write_cost_does_not_depend_on_board_size(self):
+        def queries_for_update(n_cards):
+            board = Board.objects.create(name=f'n{n_cards}', owner=self.owner)
+            board.members.add(self.owner)
+            lst = List.objects.create(board=board, title='l')
+            cards = Card.objects.bulk_create([
+                Card(list=lst, board=board, title=f'c{i}', position=i, created_by=self.owner) for i in range(n_cards)
+            ])
+            stats.rebuild([board.id])
+            versioning.flush()
+            card = cards[0]
+            with CaptureQueriesContext(connection) as queries:
+                with self.captureOnCommitCallbacks(execute=True):
+                    card.priority = 'high'
+                    card.save()
+            self.assertEqual(stored([board.id]), expected([board.id]))
+            return len(queries)
+
+        self.assertEqual(queries_for_update(5), queries_for_update(500))
+
+
+@override_settings(ACTIVITY_LOG={'ASYNC': False})
+class IncrementalStatsAutocommitTests(TransactionTestCase):
+    """Flujo real de requests: sin transacción externa, cada escritura se confirma sola."""
+
+    def test_matches_rebuild_after_each_request(self):
+        cache.clear()
+        owner = User.objects.create_user('owner', password='x')
+        boards = [Board.objects.create(name=f'b{i}', owner=owner) for i in range(2)]
+        for board in boards:
+            board.members.add(owner)
+        lists = [List.objects.create(board=board, title='l') for board in boards]
+        client = APIClient()
+        client.force_authenticate(owner)
+        ids = [board.id for board in boards]
+        due = (timezone.now() + timedelta(days=1)).isoformat()
+
+        def check(response):
+            self.assertLess(response.status_code, 300, response.content)
+            self.assertEqual(stored(ids), expected(ids))
+            return response.json()
+
+        first = check(client.post('/api/api/cards/', {'list': lists[0].id, 'title': 'a', 'priority': 'high'}, format='json'))
+        self.assertEqual(stored(ids), {(boards[0].id, None, 'high', None): [1, 0, 0]})
+        second = check(client.post('/api/api/cards/', {'list': lists[0].id, 'title': 'b', 'due_date': due}, format='json'))
+        check(client.patch(f'/api/api/cards/{first["id"]}/', {'priority': 'low', 'assignees': [owner.id]}, format='json'))
+        check(client.post('/api/api/checklist/', {'card': second['id'], 'text': 'x', 'done': True}, format='json'))
+        check(client.patch(f'/api/api/cards/{second["id"]}/move/', {'list': lists[1].id, 'position': 0}, format='json'))
+        check(client.patch(f'/api/api/cards/{first["id"]}/move/', {'list': lists[1].id, 'position': 1}, format='json'))
+        check(client.patch(f'/api/api/lists/{lists[1].id}/', {'board': boards[0].id}, format='json'))
+        response = client.delete(f'/api/api/cards/{first["id"]}/')
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(stored(ids), expected(ids))
@@ -0,0 +1,61 @@
+"""
+Sincronización incremental (sync/) de una lista que cambia de tablero.
+"""
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from api import sync, versioning
+from api.models import Board, Card, ChecklistItem, Comment, List
+
+
+@override_settings(ACTIVITY_LOG={'ASYNC': False})
+class ListBoardMoveSyncTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', password='x')
+        cls.viewer = User.objects.create_user('viewer', password='x')
+        cls.origin = Board.objects.create(name='origen', owner=cls.owner)
+        cls.origin.members.add(cls.owner, cls.viewer)
+        cls.target = Board.objects.create(name='destino', owner=cls.owner)
+        cls.target.members.add(cls.owner)
+        cls.list = List.objects.create(board=cls.origin, title='l')
+        cls.card = Card.objects.create(list=cls.list, title='c', created_by=cls.owner)
+        cls.item = ChecklistItem.objects.create(card=cls.card, text='paso')
+        cls.comment = Comment.objects.create(card=cls.card, author=cls.owner, content='hola')
+
+    def setUp(self):
+        cache.clear()
+        versioning.flush()
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(User.objects.get(pk=user.pk))
+        return client
+
+    def changes(self, user, since):
+        response = self.client_for(user).get('/api/api/sync/', {'since': since})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_list_moved_to_another_board(self):
+        since = sync.latest_cursor()
+        response = self.client_for(self.owner).patch(
+            f'/api/api/lists/{self.list.id}/', {'board': self.target.id}, format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+
+        # Quien solo ve el origen recibe lápidas de la lista, la tarjeta y sus hijos
+        deleted = self.changes(self.viewer, since)['deleted']
+        self.assertEqual(deleted['lists'], [self.list.id])
+        self.assertEqual(deleted['cards'], [self.card.id])
+        self.assertEqual(deleted['checklist'], [self.item.id])
+        self.assertEqual(deleted['comments'], [self.comment.id])
+
+        # Quien ve el destino recibe todo como alta
+        upserted = self.changes(self.owner, since)['upserted']
+        self.assertEqual([row['id'] for row in upserted['lists']], [self.list.id])
+        self.assertEqual([row['id'] for row in upserted['cards']], [self.card.id])
+        self.assertEqual([row['id'] for row in upserted['checklist']], [self.item.id])
+        self.assertEqual([row['id'] for row in upserted['comments']], [self.comment.id])
@@ -3,12 +3,12 @@ from django.urls import path, include
 from rest_framework import routers
 from api.views import (
     BoardViewSet, ListViewSet, CardViewSet,
-    CommentViewSet, register_view, LoginView,
+    CommentViewSet, register_view, sync_view, LoginView, RefreshView,
     StudentLoginView, TeacherLoginView,
     LabelViewSet, ChecklistItemViewSet, AttachmentViewSet, ActivityViewSet,
     AdminUserViewSet
 )
-from rest_framework_simplejwt.views import TokenRefreshView
+from api.realtime import board_events
 
 router = routers.DefaultRouter()
 router.register(r'boards', BoardViewSet, basename='boards')
@@ -27,6 +27,8 @@ urlpatterns = [
     path('api/token/', LoginView.as_view(), name='token_obtain_pair'),
     path('api/token/student/', StudentLoginView.as_view(), name='token_student'),
     path('api/token/teacher/', TeacherLoginView.as_view(), name='token_teacher'),
-    path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('api/token/refresh/', RefreshView.as_view(), name='token_refresh'),
+    path('api/sync/', sync_view, name='sync'),
+    path('api/boards/<int:pk>/events/', board_events, name='board-events'),
     path('api/', include(router.urls)),
 ]
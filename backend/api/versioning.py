@@ -0,0 +1,204 @@
+"""
+Versión por tablero y GET condicional (ETag / Last-Modified).
+
+Cada escritura en un tablero o en sus hijos marca el tablero como modificado; al
+confirmarse la transacción se hace un solo UPDATE que incrementa Board.version.
+Los GET comparan If-None-Match / If-Modified-Since contra esas versiones y
+responden 304 sin serializar nada.
+
+Antes del UPDATE se envía la señal `boards_changed` con los tableros afectados y los
+modelos escritos, para que otros agregados (estadísticas) se actualicen sin
+repetir la resolución tablero <- lista <- tarjeta. Esos agregados anotan qué
+cambió con `board_written`, que se envía en cada escritura antes de programar el
+flush: en autocommit on_commit corre en el acto, y un post_save conectado después
+del de este módulo llegaría tarde.
+"""
+import functools
+import hashlib
+import threading
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import Signal
+from django.utils import timezone
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework.response import Response
+
+from .membership import board_ids_for, is_member
+from .models import Attachment, Board, Card, ChecklistItem, Comment, Label, List
+
+# Argumentos: board_ids (set de ids), models (set de clases de modelo escritas)
+boards_changed = Signal()
+# Argumentos: instance (objeto guardado o borrado); sender es su clase
+board_written = Signal()
+
+_pending = threading.local()
+
+
+def _state():
+    if not hasattr(_pending, 'boards'):
+        _pending.boards, _pending.cards = set(), set()
+        _pending.models = set()
+    return _pending
+
+
+def _register(state):
+    # Se registra en cada marca (no con una bandera): si la transacción se revierte su
+    # callback se descarta, y el siguiente commit vacía lo pendiente. Los callbacks
+    # repetidos encuentran los conjuntos vacíos y no consultan nada.
+    transaction.on_commit(flush)
+
+
+def mark_board(board_id):
+    """Marca un tablero por id (p. ej. el tablero origen de una tarjeta movida)."""
+    state = _state()
+    state.boards.add(board_id)
+    _register(state)
+
+
+def mark_changed(instance):
+    """Registra que el tablero de `instance` cambió; se aplica al confirmar la transacción."""
+    state = _state()
+    state.models.add(type(instance))
+    board_written.send(sender=type(instance), instance=instance)
+    if isinstance(instance, Board):
+        state.boards.add(instance.pk)
+    elif isinstance(instance, (List, Label, Card, ChecklistItem, Comment, Attachment)):
+        state.boards.add(instance.board_id)
+    else:
+        return
+    _register(state)
+
+
+def flush():
+    """Incrementa la versión de los tableros marcados (una consulta por tipo de padre)."""
+    state = _state()
+    boards, cards, changed_models = state.boards, state.cards, state.models
+    state.boards, state.cards, state.models = set(), set(), set()
+    boards.discard(None)
+    cards.discard(None)
+    if cards:
+        boards.update(Card.objects.filter(id__in=cards).values_list('board_id', flat=True))
+    if boards:
+        # Primero los agregados derivados: así una versión nueva nunca se asocia a datos viejos
+        boards_changed.send(sender=Board, board_ids=boards, models=changed_models)
+        Board.objects.filter(id__in=boards).update(version=F('version') + 1, modified_at=timezone.now())
+
+
+def _on_write(sender, instance, created=False, **kwargs):
+    # Un tablero recién creado no tiene lectores; el UPDATE de flush no dispara señales
+    if not (sender is Board and created):
+        mark_changed(instance)
+
+
+def _on_m2m(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        mark_changed(instance)
+    elif pk_set:
+        # p. ej. label.cards.add(...) / user.boards.add(...)
+        state = _state()
+        if kwargs['model'] is Board:
+            state.boards.update(pk_set)
+        else:
+            state.cards.update(pk_set)
+        state.models.add(kwargs['model'])
+        _register(state)
+
+
+for _model in (Board, List, Card, Label, ChecklistItem, Comment, Attachment):
+    post_save.connect(_on_write, sender=_model, dispatch_uid=f'board-version-save-{_model.__name__}')
+    if _model is not Board:
+        post_delete.connect(_on_write, sender=_model, dispatch_uid=f'board-version-delete-{_model.__name__}')
+for _through in (Board.members.through, Card.labels.through, Card.assignees.through):
+    m2m_changed.connect(_on_m2m, sender=_through, dispatch_uid=f'board-version-m2m-{_through.__name__}')
+
+
+# -----------------------
+# GET CONDICIONAL
+# -----------------------
+def member_boards(view, request, **kwargs):
+    return Board.objects.filter(id__in=board_ids_for(request.user))
+
+
+def board_from_url(view, request, pk=None, **kwargs):
+    try:
+        pk = int(pk)
+    except (TypeError, ValueError):
+        return Board.objects.none()
+    return Board.objects.filter(pk=pk) if is_member(request.user, pk) else Board.objects.none()
+
+
+def card_boards(view, request, **kwargs):
+    """Tableros cuyas tarjetas puede listar el usuario (miembro, creador o asignado)."""
+    user = request.user
+    assigned = Card.assignees.through.objects.filter(user_id=user.id).values('card_id')
+    via_cards = Card.objects.filter(Q(created_by=user) | Q(id__in=assigned)).values('board_id')
+    return Board.objects.filter(Q(id__in=board_ids_for(user)) | Q(id__in=via_cards))
+
+
+def member_boards_filtered(view, request, **kwargs):
+    """Tableros del usuario, limitados a ?board=<id> si se indica."""
+    board_id = request.query_params.get('board')
+    if not board_id:
+        return member_boards(view, request)
+    try:
+        board_id = int(board_id)
+    except ValueError:
+        return Board.objects.none()
+    return Board.objects.filter(pk=board_id) if is_member(request.user, board_id) else Board.objects.none()
+
+
+def conditional_on_boards(get_boards):
+    """
+    Decorador para acciones GET de los viewsets: `get_boards(view, request, **kwargs)`
+    devuelve el queryset de Board del que depende la respuesta.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, request, *args, **kwargs):
+            boards = get_boards(self, request, **kwargs)
+            return conditional_get(request, boards, lambda: func(self, request, *args, **kwargs))
+        return wrapper
+    return decorator
+
+
+def conditional_get(request, boards, build):
+    """
+    Responde 304 si el cliente ya tiene la versión actual de `boards` (queryset de Board);
+    si no, llama a `build()` y agrega ETag y Last-Modified a la respuesta.
+    El ETag depende de la URL completa, del usuario y de las versiones de los tableros.
+    """
+    rows = list(boards.order_by().values_list('id', 'version', 'modified_at'))
+    rows.sort()
+    key = f"{request.get_full_path()}|{request.user.pk}|" + ",".join(f"{i}:{v}" for i, v, _ in rows)
+    etag = '"%s"' % hashlib.sha1(key.encode()).hexdigest()
+    last_modified = max((m for _, _, m in rows), default=None)
+
+    if request.method in ('GET', 'HEAD'):
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match:
+            tags = [t.strip() for t in if_none_match.split(',')]
+            if etag in tags or '*' in tags:
+                return _not_modified(etag, last_modified)
+        elif last_modified is not None:
+            since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+            if since is not None and int(last_modified.timestamp()) <= since:
+                return _not_modified(etag, last_modified)
+
+    response = build()
+    if response.status_code == 200:
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
+
+
+def _not_modified(etag, last_modified):
+    response = Response(status=304)
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
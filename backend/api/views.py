@@ -2,19 +2,45 @@ from rest_framework import viewsets, permissions
 from rest_framework.decorators import api_view, action, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.renderers import BrowsableAPIRenderer
 from django.contrib.auth.models import User
-from .models import Board, List, Card, Comment, Profile, Label, ChecklistItem, Attachment, Activity
+from .models import Board, List, Card, Comment, Profile, Label, ChecklistItem, Attachment, Activity, ActivityArchive
 from .serializers import (
     BoardSerializer, ListSerializer, CardSerializer,
     CommentSerializer, UserSerializer, LabelSerializer,
-    ChecklistItemSerializer, AttachmentSerializer, ActivitySerializer
+    ChecklistItemSerializer, AttachmentSerializer, ActivitySerializer,
+    ActivityArchiveSerializer, SnapshotCardSerializer
 )
-from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework import status
 from rest_framework import serializers
 from django.db import models
+from django.db.models.functions import Coalesce, RowNumber, TruncDate
+from django.utils.dateparse import parse_date
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from django.utils import timezone
 from .permissions import IsBoardMember, CanDeleteBoard
+from .authentication import ClaimsTokenRefreshSerializer, add_user_claims
+from .lookups import labels_for_boards, role_of
+from .membership import board_ids_for, is_member
+from .search import search_cards
+from . import stats
+from .bulk import BulkMutationMixin
+from .fast_serialization import FastJSONRenderer, ValuesReader
+from .instrumentation import TimedViewMixin
+from .ordering import append_position, place
+from .sqlite import serialized_write
+from . import activity_log, realtime, retention, sync, versioning
+from . import cache as api_cache
+from .versioning import (
+    conditional_on_boards, member_boards, member_boards_filtered, board_from_url, card_boards,
+)
+from .pagination import (
+    CardCursorPagination, ActivityCursorPagination, UserCursorPagination,
+    StreamingListMixin,
+)
 from rest_framework.permissions import IsAdminUser
 from .serializers import AdminUserSerializer
 
@@ -27,14 +53,14 @@ class AnyRoleTokenObtainPairSerializer(TokenObtainPairSerializer):
     Igual que el token normal pero incluyendo role, username, user_id e is_staff.
     No impone un rol específico.
     """
+    @classmethod
+    def get_token(cls, user):
+        return add_user_claims(super().get_token(user), user)
+
     def validate(self, attrs):
         data = super().validate(attrs)
         user = self.user
-        try:
-            role = user.profile.role  # type: ignore[attr-defined]
-        except Profile.DoesNotExist:
-            role = 'student'
-        data["role"] = role
+        data["role"] = role_of(user)
         data["username"] = user.username
         data["user_id"] = user.id
         data["is_staff"] = user.is_staff
@@ -46,16 +72,22 @@ class LoginView(TokenObtainPairView):
     serializer_class = AnyRoleTokenObtainPairSerializer
 
 
+class RefreshView(TokenRefreshView):
+    """Renueva el access token con los claims actuales del usuario."""
+    serializer_class = ClaimsTokenRefreshSerializer
+
+
 class BaseRoleTokenObtainPairSerializer(TokenObtainPairSerializer):
     expected_role = None  # 'student' o 'teacher'
 
+    @classmethod
+    def get_token(cls, user):
+        return add_user_claims(super().get_token(user), user)
+
     def validate(self, attrs):
         data = super().validate(attrs)
         user = self.user
-        try:
-            role = user.profile.role
-        except Profile.DoesNotExist:
-            role = 'student'
+        role = role_of(user)
         # Si se exige rol específico, validarlo
         if self.expected_role and role != self.expected_role:
             raise serializers.ValidationError(
@@ -111,6 +143,46 @@ def register_view(request):
     user = serializer.save()
     return Response(UserSerializer(user).data, status=201)
 
+
+# -----------------------
+# SINCRONIZACIÓN INCREMENTAL
+# -----------------------
+SYNC_PAGE_SIZE = 500
+SYNC_MAX_PAGE_SIZE = 2000
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def sync_view(request):
+    """
+    Cambios en los tableros del usuario desde `since` (ver api/sync.py).
+    Sin `since` devuelve solo el cursor actual, para usar después de una carga completa.
+    """
+    board_ids = board_ids_for(request.user)
+    try:
+        limit = min(max(1, int(request.query_params.get("limit", SYNC_PAGE_SIZE))), SYNC_MAX_PAGE_SIZE)
+        since = request.query_params.get("since")
+        since = None if since in (None, "") else int(since)
+    except ValueError:
+        return Response({"detail": "since y limit deben ser enteros"}, status=400)
+
+    if since is None:
+        return Response({
+            "cursor": sync.latest_cursor(), "has_more": False, "boards": sorted(board_ids),
+            "upserted": {}, "deleted": {},
+        }, status=200)
+    try:
+        cursor, has_more, upserted, deleted = sync.changes_since(board_ids, since, limit)
+    except sync.CursorExpired:
+        return Response({
+            "detail": "El cursor es anterior a los cambios retenidos; recargar los tableros.",
+            "cursor": sync.latest_cursor(),
+        }, status=status.HTTP_410_GONE)
+    return Response({
+        "cursor": cursor, "has_more": has_more, "boards": sorted(board_ids),
+        "upserted": upserted, "deleted": deleted,
+    }, status=200)
+
 # -----------------------
 # CURSOS POR DEFECTO (CATEDRÁTICO)
 # -----------------------
@@ -130,37 +202,76 @@ DEFAULT_COURSES = [
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def default_courses(request):
-    try:
-        role = request.user.profile.role  # type: ignore[attr-defined]
-    except (Profile.DoesNotExist, AttributeError):
-        role = 'student'
-    if role != 'teacher':
+    if role_of(request.user) != 'teacher':
         return Response({"detail": "Solo catedráticos."}, status=403)
     return Response(DEFAULT_COURSES, status=200)
 
 
+# -----------------------
+# HELPERS DE CONSULTA
+# -----------------------
+def parse_index(request):
+    """Lee `position` (índice destino) del payload. Devuelve (index, error_response)."""
+    position = request.data.get("position")
+    if position is None:
+        return None, Response({"detail": "position es requerido"}, status=400)
+    try:
+        return int(position), None
+    except (TypeError, ValueError):
+        return None, Response({"detail": "position inválida"}, status=400)
+
+
+def count_subquery(queryset, field='card'):
+    """
+    Subconsulta correlacionada que cuenta las filas de `queryset` cuyo `field` apunta
+    a la fila externa. Evita el producto cartesiano de varios Count() sobre joins.
+    """
+    qs = (
+        queryset.filter(**{field: models.OuterRef('pk')})
+        .order_by()
+        .values(field)
+        .annotate(n=models.Count('pk'))
+        .values('n')
+    )
+    return Coalesce(models.Subquery(qs, output_field=models.IntegerField()), 0)
+
+
+# Listados de lectura: filas desde values() y JSON con orjson (api/fast_serialization.py)
+FAST_RENDERERS = [FastJSONRenderer, BrowsableAPIRenderer]
+USER_READER = ValuesReader(UserSerializer)
+
+
 # -----------------------
 # BOARDS CRUD
 # -----------------------
-class BoardViewSet(viewsets.ModelViewSet):
+class BoardViewSet(TimedViewMixin, viewsets.ModelViewSet):
     serializer_class = BoardSerializer
     permission_classes = [permissions.IsAuthenticated, IsBoardMember|CanDeleteBoard]
 
     def get_queryset(self):
-        return Board.objects.filter(members=self.request.user)
+        return (
+            Board.objects.filter(id__in=board_ids_for(self.request.user))
+            .select_related('owner')
+            .prefetch_related('members')
+        )
 
     def perform_create(self, serializer):
         board = serializer.save(owner=self.request.user)
         board.members.add(self.request.user)
 
+    @conditional_on_boards(member_boards)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @conditional_on_boards(board_from_url)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     @action(detail=True, methods=['post'])
     def invite(self, request, pk=None):
         board = self.get_object()
-        try:
-            if request.user.profile.role != 'teacher' and request.user != board.owner:
-                return Response({"detail": "Solo docentes u owners pueden invitar."}, status=403)
-        except Profile.DoesNotExist:
-            return Response({"detail": "Perfil no encontrado."}, status=400)
+        if role_of(request.user) != 'teacher' and request.user.id != board.owner_id:
+            return Response({"detail": "Solo docentes u owners pueden invitar."}, status=403)
         username = request.data.get('username')
         if not username:
             return Response({"detail": "username requerido"}, status=400)
@@ -169,55 +280,178 @@ class BoardViewSet(viewsets.ModelViewSet):
         except User.DoesNotExist:
             return Response({"detail": "Usuario no existe"}, status=404)
         board.members.add(user)
-        Activity.objects.create(board=board, actor=request.user, action='updated', meta={"invited": user.username})
+        activity_log.record(board.id, request.user, 'updated', meta={"invited": user.username})
         return Response({"detail": "Miembro agregado"}, status=200)
 
-    @action(detail=True, methods=['get'])
+    @action(detail=True, methods=['get'], renderer_classes=FAST_RENDERERS)
+    @conditional_on_boards(board_from_url)
     def members(self, request, pk=None):
         board = self.get_object()
         qs = board.members.all().order_by('username')
-        return Response(UserSerializer(qs, many=True).data, status=200)
+        return Response(USER_READER.data(qs), status=200)
+
+    @action(detail=True, methods=['get'])
+    def stats(self, request, pk=None):
+        """Estadísticas precalculadas del tablero y de cada asignado."""
+        board = self.get_object()
+        return Response(stats.board_stats(board.id), status=200)
+
+    @action(detail=False, methods=['get'])
+    def dashboard(self, request):
+        """Estadísticas de todos los tableros del usuario y de sus tareas asignadas."""
+        return Response(stats.user_stats(request.user, board_ids_for(request.user)), status=200)
 
-class ListViewSet(viewsets.ModelViewSet):
+    @action(detail=True, methods=['get'])
+    @conditional_on_boards(board_from_url)
+    def snapshot(self, request, pk=None):
+        """
+        Tablero completo en una sola respuesta: listas ordenadas con sus tarjetas ordenadas,
+        ids de etiquetas/asignados, progreso de checklist y conteo de comentarios.
+        El número de consultas es fijo, sin importar el tamaño del tablero; la respuesta
+        se cachea por versión del tablero, así cualquier cambio la invalida.
+        """
+        board = self.get_object()
+        data = api_cache.get_or_set('snapshot', (board.id, board.version), lambda: self._snapshot(board))
+        return Response(data, status=200)
+
+    def _snapshot(self, board):
+        lists = list(board.lists.order_by('position', 'id'))
+        cards = (
+            Card.objects.filter(board=board)
+            .prefetch_related(
+                models.Prefetch('labels', queryset=Label.objects.only('id')),
+                models.Prefetch('assignees', queryset=User.objects.only('id')),
+            )
+            .annotate(
+                checklist_total=count_subquery(ChecklistItem.objects.all()),
+                checklist_done=count_subquery(ChecklistItem.objects.filter(done=True)),
+                comments_count=count_subquery(Comment.objects.all()),
+            )
+            .order_by('position', 'id')
+        )
+        cards_by_list = {l.id: [] for l in lists}
+        for data in SnapshotCardSerializer(cards, many=True).data:
+            cards_by_list[data['list']].append(data)
+        lists_data = [dict(data) for data in ListSerializer(lists, many=True).data]
+        for data in lists_data:
+            data['cards'] = cards_by_list[data['id']]
+        return {
+            "board": dict(BoardSerializer(board).data),
+            "lists": lists_data,
+        }
+
+class ListViewSet(TimedViewMixin, viewsets.ModelViewSet):
     queryset = List.objects.all()
     serializer_class = ListSerializer
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [permissions.IsAuthenticated, IsBoardMember]
+
+    def perform_create(self, serializer):
+        extra = {}
+        if 'position' not in serializer.initial_data:
+            extra['position'] = append_position(serializer.validated_data['board'].lists.all())
+        serializer.save(**extra)
+
+    @conditional_on_boards(member_boards_filtered)
+    def list(self, request, *args, **kwargs):
+        # Listas de los tableros del usuario (?board=<id> limita a uno), los mismos del ETag
+        queryset = self.get_queryset().filter(board_id__in=board_ids_for(request.user))
+        board_id = request.query_params.get('board')
+        if board_id:
+            queryset = queryset.filter(board_id=board_id) if board_id.isdigit() else queryset.none()
+        return Response(self.get_serializer(queryset, many=True).data)
+
+    @action(detail=True, methods=['patch'])
+    def move(self, request, pk=None):
+        """
+        Reordenar la lista dentro de su tablero.
+        Payload: { "position": <índice> }
+        """
+        lst = self.get_object()
+        index, error = parse_index(request)
+        if error:
+            return error
+        with serialized_write():
+            place(lst, List.objects.filter(board_id=lst.board_id).exclude(id=lst.id), index)
+            lst.save(update_fields=['position'])
+        return Response(ListSerializer(lst).data, status=200)
 
 
-class CardViewSet(viewsets.ModelViewSet):
+class CardViewSet(TimedViewMixin, BulkMutationMixin, StreamingListMixin, viewsets.ModelViewSet):
     serializer_class = CardSerializer
     permission_classes = [permissions.IsAuthenticated, IsBoardMember]
+    pagination_class = CardCursorPagination
+    renderer_classes = FAST_RENDERERS
+    values_reader = ValuesReader(CardSerializer)
+    bulk_parent_field = 'list'
+    bulk_prefetch = ('labels', 'assignees')
+
+    def bulk_create_kwargs(self):
+        return {'created_by': self.request.user}
+
+    def bulk_resolve_move(self, obj, target_id):
+        try:
+            target_list = List.objects.get(id=target_id)
+        except (List.DoesNotExist, TypeError, ValueError):
+            return None, {"list": "list no existe"}
+        if not is_member(self.request.user, target_list.board_id):
+            return None, {"list": "No autorizado en el tablero destino"}
+        return target_list, None
+
+    def bulk_activity(self, kind, card):
+        meta = {"card": card.id}
+        if kind == 'created':
+            meta["title"] = card.title
+        elif kind == 'moved':
+            meta = {"to_list": card.list_id, "position": card.position}
+        return Activity(board_id=card.board_id, card=card, actor=self.request.user, action=kind, meta=meta)
+
+    def bulk_board_id(self, card):
+        return card.board_id
+
+    def bulk_publish(self, kind, pk, card, data, board_id):
+        if card is None:
+            realtime.publish(board_id, 'card.deleted', {"id": pk})
+        else:
+            realtime.publish(card.board_id, f'card.{kind}', data)
 
     def perform_create(self, serializer):
-        card = serializer.save(created_by=self.request.user)
+        extra = {}
+        if 'position' not in serializer.initial_data:
+            extra['position'] = append_position(serializer.validated_data['list'].cards.all())
+        card = serializer.save(created_by=self.request.user, **extra)
         # Log actividad de creación
-        Activity.objects.create(
-            board=card.list.board,
-            card=card,
-            actor=self.request.user,
-            action='created',
-            meta={"card": card.id, "title": card.title}
-        )
+        activity_log.record(card.board_id, self.request.user, 'created', card.id, {"card": card.id, "title": card.title})
+        realtime.publish(card.board_id, 'card.created', serializer.data)
 
     def get_queryset(self):
         user = self.request.user
-        # Tarjetas visibles por pertenecer al board, por ser creador o asignado
-        return Card.objects.filter(
-            models.Q(list__board__members=user) |
-            models.Q(created_by=user) |
-            models.Q(assignees=user)
-        ).distinct()
+        # Tarjetas visibles por pertenecer al board, por ser creador o asignado.
+        # Los asignados van por subconsulta: sin join no hacen falta filas duplicadas ni distinct()
+        assigned = Card.assignees.through.objects.filter(user_id=user.id).values('card_id')
+        return (
+            Card.objects.filter(
+                models.Q(board_id__in=board_ids_for(user)) |
+                models.Q(created_by=user) |
+                models.Q(id__in=assigned)
+            )
+            .prefetch_related(
+                # Ordenados por id, igual que la lectura rápida
+                models.Prefetch('labels', queryset=Label.objects.only('id').order_by('id')),
+                models.Prefetch('assignees', queryset=User.objects.only('id').order_by('id')),
+            )
+        )
 
     def perform_update(self, serializer):
         card = serializer.save()
-        Activity.objects.create(
-            board=card.list.board,
-            card=card,
-            actor=self.request.user,
-            action='updated',
-            meta={"card": card.id}
-        )
+        activity_log.record(card.board_id, self.request.user, 'updated', card.id, {"card": card.id})
+        realtime.publish(card.board_id, 'card.updated', serializer.data)
+
+    def perform_destroy(self, instance):
+        board_id, card_id = instance.board_id, instance.id
+        instance.delete()
+        realtime.publish(board_id, 'card.deleted', {"id": card_id})
 
+    @conditional_on_boards(card_boards)
     def list(self, request, *args, **kwargs):
         queryset = self.get_queryset()
         label = request.query_params.get('label')
@@ -234,15 +468,78 @@ class CardViewSet(viewsets.ModelViewSet):
         if due_after:
             queryset = queryset.filter(due_date__gte=due_after)
         if search:
-            queryset = queryset.filter(models.Q(title__icontains=search) | models.Q(description__icontains=search))
-        self.queryset = queryset
-        return super().list(request, *args, **kwargs)
+            queryset = search_cards(queryset, search)
+        if self.wants_stream(request):
+            return self.stream_response(queryset)
+        return self.list_response(queryset)
+
+    @action(detail=False, methods=['get'])
+    def calendar(self, request):
+        """
+        Tarjetas agrupadas por día de vencimiento, calculado en SQL.
+        Query: from=YYYY-MM-DD, to=YYYY-MM-DD (incluido), tz=<zona IANA>, limit=<tarjetas por día>, board=<id>
+        Cada día trae el total, los conteos por prioridad y hasta `limit` tarjetas resumidas.
+        """
+        start_date = parse_date(request.query_params.get('from') or '')
+        end_date = parse_date(request.query_params.get('to') or '')
+        if not start_date or not end_date or end_date < start_date:
+            return Response({"detail": "from y to (YYYY-MM-DD) son requeridos"}, status=400)
+        if (end_date - start_date).days > 366:
+            return Response({"detail": "El rango máximo es de un año."}, status=400)
+        tz_name = request.query_params.get('tz') or timezone.get_current_timezone_name()
+        try:
+            tz = ZoneInfo(tz_name)
+        except (ZoneInfoNotFoundError, ValueError):
+            return Response({"detail": "tz inválida"}, status=400)
+        try:
+            limit = min(max(int(request.query_params.get('limit', 5)), 0), 50)
+        except ValueError:
+            return Response({"detail": "limit inválido"}, status=400)
+
+        # Rango por el índice de due_date: [from 00:00, to+1 00:00) en la zona pedida
+        start = datetime.combine(start_date, time.min, tzinfo=tz)
+        end = datetime.combine(end_date + timedelta(days=1), time.min, tzinfo=tz)
+        queryset = (
+            self.get_queryset()
+            .prefetch_related(None)
+            .filter(due_date__gte=start, due_date__lt=end)
+            .annotate(day=TruncDate('due_date', tzinfo=tz))
+        )
+        board = request.query_params.get('board')
+        if board:
+            queryset = queryset.filter(board_id=board) if board.isdigit() else queryset.none()
+
+        days = {}
+        counts = queryset.values('day', 'priority').annotate(n=models.Count('id')).order_by()
+        for row in counts:
+            bucket = days.setdefault(row['day'], {"date": row['day'], "total": 0, "by_priority": {}, "cards": []})
+            bucket["total"] += row['n']
+            bucket["by_priority"][row['priority']] = row['n']
+        if limit:
+            summaries = (
+                queryset.annotate(rank=models.Window(
+                    RowNumber(), partition_by=[TruncDate('due_date', tzinfo=tz)], order_by=['due_date', 'id'],
+                ))
+                .filter(rank__lte=limit)
+                .values('id', 'title', 'due_date', 'priority', 'list', 'day', 'board')
+                .order_by('due_date', 'id')
+            )
+            for row in summaries:
+                day = row.pop('day')
+                days[day]["cards"].append(row)
+        return Response({
+            "from": start_date,
+            "to": end_date,
+            "tz": tz_name,
+            "days": [days[d] for d in sorted(days)],
+        }, status=200)
 
     @action(detail=True, methods=['patch'])
     def move(self, request, pk=None):
         """
         Mover tarjeta a otra lista/posición.
-        Payload: { "list": <list_id>, "position": <int> }
+        Payload: { "list": <list_id>, "position": <índice en la lista destino> }
+        Solo se escribe la tarjeta movida, salvo que haga falta rebalancear la lista.
         """
         card = self.get_object()
         target_list_id = request.data.get("list")
@@ -251,8 +548,8 @@ class CardViewSet(viewsets.ModelViewSet):
             return Response({"detail": "list y position son requeridos"}, status=400)
 
         try:
-            position = int(position)
-        except ValueError:
+            position = max(0, int(position))
+        except (TypeError, ValueError):
             return Response({"detail": "position inválida"}, status=400)
 
         try:
@@ -261,77 +558,107 @@ class CardViewSet(viewsets.ModelViewSet):
             return Response({"detail": "list no existe"}, status=404)
 
         # Validar que el usuario sea miembro del board destino
-        if not target_list.board.members.filter(id=request.user.id).exists():
+        if not is_member(request.user, target_list.board_id):
             return Response({"detail": "No autorizado en el tablero destino"}, status=403)
 
-        # Mover
-        card.list = target_list
-        card.position = max(0, position)
-        card.save()
-
-        # Reindexar posiciones en la lista destino
-        cards = list(target_list.cards.exclude(id=card.id).order_by('position'))
-        cards.insert(min(card.position, len(cards)), card)
-        for idx, c in enumerate(cards):
-            if c.position != idx:
-                Card.objects.filter(id=c.id).update(position=idx)
-
-        Activity.objects.create(
-            board=target_list.board,
-            card=card,
-            actor=request.user,
-            action='moved',
-            meta={"to_list": target_list.id, "position": card.position}
+        # Mover: posición dispersa entre los vecinos del índice destino
+        source_board_id = card.board_id
+        with serialized_write():
+            card.list = target_list
+            place(card, target_list.cards.exclude(id=card.id), position)
+            card.save(update_fields=['list', 'position'])
+
+        activity_log.record(
+            target_list.board_id, request.user, 'moved', card.id, {"to_list": target_list.id, "position": position},
         )
-        return Response(CardSerializer(card).data, status=200)
+        data = CardSerializer(card).data
+        if source_board_id != target_list.board_id:
+            versioning.mark_board(source_board_id)
+            realtime.publish(source_board_id, 'card.deleted', {"id": card.id})
+        realtime.publish(target_list.board_id, 'card.moved', data)
+        return Response(data, status=200)
 
 
-class CommentViewSet(viewsets.ModelViewSet):
-    queryset = Comment.objects.all()
+class CommentViewSet(TimedViewMixin, viewsets.ModelViewSet):
+    queryset = Comment.objects.select_related('author')
     serializer_class = CommentSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def perform_create(self, serializer):
         comment = serializer.save(author=self.request.user)
-        Activity.objects.create(
-            board=comment.card.list.board,
-            card=comment.card,
-            actor=self.request.user,
-            action='commented',
-            meta={"comment_id": comment.id}
+        activity_log.record(
+            comment.board_id, self.request.user, 'commented', comment.card_id, {"comment_id": comment.id},
         )
+        realtime.publish(comment.board_id, 'comment.created', serializer.data)
 
 
-class LabelViewSet(viewsets.ModelViewSet):
+class LabelViewSet(TimedViewMixin, viewsets.ModelViewSet):
     queryset = Label.objects.all()
     serializer_class = LabelSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
         user = self.request.user
-        return Label.objects.filter(board__members=user)
+        return Label.objects.filter(board_id__in=board_ids_for(user))
+
+    @conditional_on_boards(member_boards_filtered)
+    def list(self, request, *args, **kwargs):
+        # Etiquetas por tablero desde la caché (?board=<id> limita a uno)
+        board_ids = board_ids_for(request.user)
+        board_id = request.query_params.get('board')
+        if board_id:
+            board_ids = [b for b in board_ids if str(b) == board_id]
+        return Response(labels_for_boards(board_ids))
 
 
-class ChecklistItemViewSet(viewsets.ModelViewSet):
+class ChecklistItemViewSet(TimedViewMixin, BulkMutationMixin, viewsets.ModelViewSet):
     queryset = ChecklistItem.objects.all()
     serializer_class = ChecklistItemSerializer
     permission_classes = [permissions.IsAuthenticated, IsBoardMember]
+    bulk_parent_field = 'card'
+
+    def get_queryset(self):
+        return ChecklistItem.objects.filter(board_id__in=board_ids_for(self.request.user))
+
+    def perform_create(self, serializer):
+        extra = {}
+        if 'position' not in serializer.initial_data:
+            extra['position'] = append_position(serializer.validated_data['card'].checklist.all())
+        serializer.save(**extra)
+
+    @action(detail=True, methods=['patch'])
+    def move(self, request, pk=None):
+        """
+        Reordenar el ítem dentro de su tarjeta.
+        Payload: { "position": <índice> }
+        """
+        item = self.get_object()
+        index, error = parse_index(request)
+        if error:
+            return error
+        with serialized_write():
+            place(item, ChecklistItem.objects.filter(card_id=item.card_id).exclude(id=item.id), index)
+            item.save(update_fields=['position'])
+        return Response(ChecklistItemSerializer(item).data, status=200)
 
 
-class AttachmentViewSet(viewsets.ModelViewSet):
+class AttachmentViewSet(TimedViewMixin, viewsets.ModelViewSet):
     queryset = Attachment.objects.all()
     serializer_class = AttachmentSerializer
     permission_classes = [permissions.IsAuthenticated, IsBoardMember]
 
 
-class ActivityViewSet(viewsets.ReadOnlyModelViewSet):
+class ActivityViewSet(TimedViewMixin, StreamingListMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class = ActivitySerializer
     permission_classes = [permissions.IsAuthenticated, IsBoardMember]
+    pagination_class = ActivityCursorPagination
+    renderer_classes = FAST_RENDERERS
+    values_reader = ValuesReader(ActivitySerializer)
     queryset = Activity.objects.all()
 
     def get_queryset(self):
         user = self.request.user
-        qs = Activity.objects.filter(board__members=user)
+        qs = Activity.objects.filter(board_id__in=board_ids_for(user)).select_related('actor')
         board_id = self.request.query_params.get('board')
         card_id = self.request.query_params.get('card')
         if board_id:
@@ -340,11 +667,36 @@ class ActivityViewSet(viewsets.ReadOnlyModelViewSet):
             qs = qs.filter(card_id=card_id)
         return qs
 
-
-class AdminUserViewSet(viewsets.ModelViewSet):
-    queryset = User.objects.all().order_by('username')
+    @action(detail=False, methods=['get'])
+    def archives(self, request):
+        """
+        Actividad archivada (fuera de la tabla caliente) de los tableros del usuario.
+        ?board=<id> filtra; ?segment=<id> devuelve los eventos de ese segmento.
+        """
+        qs = ActivityArchive.objects.filter(board_id__in=board_ids_for(request.user))
+        board_id = request.query_params.get('board')
+        if board_id:
+            qs = qs.filter(board_id=board_id) if board_id.isdigit() else qs.none()
+        segment_id = request.query_params.get('segment')
+        if segment_id:
+            if not segment_id.isdigit():
+                return Response({"detail": "segment inválido"}, status=400)
+            segment = qs.filter(id=segment_id).first()
+            if segment is None:
+                return Response({"detail": "Segmento no encontrado"}, status=404)
+            try:
+                events = retention.read_segment(segment)
+            except FileNotFoundError:
+                return Response({"detail": "Archivo del segmento no disponible"}, status=410)
+            return Response({"segment": ActivityArchiveSerializer(segment).data, "events": events}, status=200)
+        return Response(ActivityArchiveSerializer(qs, many=True).data, status=200)
+
+
+class AdminUserViewSet(TimedViewMixin, StreamingListMixin, viewsets.ModelViewSet):
+    queryset = User.objects.select_related('profile').order_by('username')
     serializer_class = AdminUserSerializer
     permission_classes = [IsAdminUser]
+    pagination_class = UserCursorPagination
 
     @action(detail=True, methods=['post'])
     def set_password(self, request, pk=None):
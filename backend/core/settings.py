@@ -2,6 +2,8 @@ from pathlib import Path
 from datetime import timedelta
 import os
 
+from core.database import databases, sqlite_tuned
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 SECRET_KEY = os.getenv("DJANGO_SECRET_KEY", "dev-secret-key")
@@ -28,12 +30,15 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "api.instrumentation.RequestMetricsMiddleware",
+    "api.prometheus.PrometheusMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "api.db_router.ReplicaMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -57,14 +62,95 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "core.wsgi.application"
+ASGI_APPLICATION = "core.asgi.application"
+
+# Broker de eventos en tiempo real (SSE por tablero); reemplazable por uno externo
+REALTIME_BROKER = os.getenv("REALTIME_BROKER", "api.realtime.InProcessBroker")
+
+# Registro de actividad por lotes en un hilo de fondo, con spool en disco ante caídas
+ACTIVITY_LOG = {
+    "ASYNC": os.getenv("ACTIVITY_LOG_ASYNC", "1") == "1",
+    "BATCH_SIZE": int(os.getenv("ACTIVITY_LOG_BATCH_SIZE", "200")),
+    "FLUSH_INTERVAL": float(os.getenv("ACTIVITY_LOG_FLUSH_INTERVAL", "1.0")),
+    "SPOOL_DIR": os.getenv("ACTIVITY_LOG_SPOOL_DIR", str(BASE_DIR / "var" / "activity")),
+}
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+# Retención: la actividad más antigua se archiva con `manage.py archive_activity`
+ACTIVITY_RETENTION_DAYS = int(os.getenv("ACTIVITY_RETENTION_DAYS", "180"))
+ACTIVITY_ARCHIVE_DIR = os.getenv("ACTIVITY_ARCHIVE_DIR", str(BASE_DIR / "var" / "activity-archive"))
+
+# Sincronización incremental (api/sync.py): ventana de asentamiento fuera de SQLite y
+# retención del registro de cambios (`manage.py prune_sync_log`)
+SYNC_SETTLE_SECONDS = float(os.getenv("SYNC_SETTLE_SECONDS", "2"))
+SYNC_LOG_RETENTION_DAYS = int(os.getenv("SYNC_LOG_RETENTION_DAYS", "30"))
+
+# Caché: Redis si se define REDIS_URL (requiere el paquete `redis`), si no en memoria (LRU)
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+            "KEY_PREFIX": "kanban",
+        }
     }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "kanban",
+            "OPTIONS": {"MAX_ENTRIES": int(os.getenv("CACHE_MAX_ENTRIES", "10000"))},
+        }
+    }
+API_CACHE_ALIAS = "default"
+# Revocación de tokens (api/authentication.py): 'cache' la lee de la caché compartida y
+# 'db' de una copia por proceso de la tabla, releída cada TOKEN_REVOCATION_REFRESH_SECONDS
+# (la caché en memoria no se comparte entre workers)
+TOKEN_REVOCATION_STORE = os.getenv("TOKEN_REVOCATION_STORE", "cache" if os.getenv("REDIS_URL") else "db")
+TOKEN_REVOCATION_REFRESH_SECONDS = float(os.getenv("TOKEN_REVOCATION_REFRESH_SECONDS", "5"))
+# TTL en segundos por espacio de nombres (api/cache.py)
+API_CACHE_TTLS = {
+    "user": 300,
+    "membership": 300,
+    "role": 600,
+    "labels": 600,
+    "snapshot": 600,
+    "revoked": 300,
+}
+
+# Métricas por request (api/instrumentation.py): fracción muestreada (0 = apagado),
+# umbral de request lento en ms y repeticiones para marcar una consulta como N+1
+REQUEST_METRICS = {
+    "SAMPLE_RATE": float(os.getenv("REQUEST_METRICS_SAMPLE_RATE", "0")),
+    "SLOW_MS": int(os.getenv("REQUEST_METRICS_SLOW_MS", "500")),
+    "DUPLICATE_THRESHOLD": int(os.getenv("REQUEST_METRICS_DUPLICATE_THRESHOLD", "3")),
+    "SLOW_SQL_LIMIT": 10,
+    "SERVER_TIMING": os.getenv("REQUEST_METRICS_SERVER_TIMING", "1") == "1",
 }
 
+# Endpoint /metrics (api/prometheus.py). Con varios workers definir además
+# PROMETHEUS_MULTIPROC_DIR; con METRICS_TOKEN se exige "Authorization: Bearer <token>"
+METRICS = {
+    "ENABLED": os.getenv("METRICS_ENABLED", "1") == "1",
+    "TOKEN": os.getenv("METRICS_TOKEN"),
+}
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        "api.requests": {"handlers": ["console"], "level": os.getenv("REQUEST_METRICS_LOG_LEVEL", "INFO"), "propagate": False},
+    },
+}
+
+# Base principal y réplica opcional desde DATABASE_URL / DATABASE_REPLICA_URL (core/database.py)
+DATABASES = databases(BASE_DIR)
+# Perfil SQLite (WAL, PRAGMA, BEGIN IMMEDIATE y escrituras serializadas); ver api/sqlite.py
+SQLITE_TUNED = sqlite_tuned()
+DATABASE_ROUTERS = ["api.db_router.PrimaryReplicaRouter"]
+# Segundos que un cliente lee de la principal después de escribir
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+
 AUTH_PASSWORD_VALIDATORS = []
 
 LANGUAGE_CODE = "en-us"
@@ -84,7 +170,7 @@ CORS_ALLOWED_ORIGINS = [
 # 🔥 Solo uno, no duplicado
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "api.authentication.StatelessJWTAuthentication",
     )
 }
 
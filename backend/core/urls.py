@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.urls import path, include
-from api.views import register_view, LoginView, StudentLoginView, TeacherLoginView, default_courses
-from rest_framework_simplejwt.views import TokenRefreshView
+from api.views import register_view, LoginView, RefreshView, StudentLoginView, TeacherLoginView, default_courses
+from api.prometheus import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -10,6 +10,7 @@ urlpatterns = [
     path('api/token/student/', StudentLoginView.as_view(), name='token_student'),
     path('api/token/teacher/', TeacherLoginView.as_view(), name='token_teacher'),
     path('api/default-courses/', default_courses, name='default_courses'),
-    path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('api/token/refresh/', RefreshView.as_view(), name='token_refresh'),
     path('api/', include('api.urls')),
+    path('metrics', metrics_view, name='metrics'),
 ]
@@ -4,6 +4,7 @@ import api from "../services/axiosConfig";
 
 type List = { id: number; board: number; title: string; position: number };
 type Card = { id: number; list: number; title: string; description?: string; position: number };
+type SnapshotList = List & { cards: Card[] };
 
 export default function BoardPage() {
   const { id } = useParams();
@@ -18,10 +19,10 @@ export default function BoardPage() {
       try {
         setLoading(true);
         setError("");
-        const [listsRes, cardsRes] = await Promise.all([api.get("/lists/"), api.get("/cards/")]);
-        const boardLists = (listsRes.data || []).filter((l: List) => l.board === boardId).sort((a: List, b: List) => a.position - b.position);
-        setLists(boardLists);
-        setCards((cardsRes.data || []).filter((c: Card) => boardLists.some((l) => l.id === c.list)));
+        const { data } = await api.get(`/boards/${boardId}/snapshot/`);
+        const boardLists: SnapshotList[] = data?.lists || [];
+        setLists(boardLists.map(({ cards: _cards, ...l }) => l));
+        setCards(boardLists.flatMap((l) => l.cards));
       } catch {
         setError("No se pudo cargar el tablero.");
       } finally {
@@ -31,6 +32,26 @@ export default function BoardPage() {
     load();
   }, [boardId]);
 
+  // Deltas en tiempo real del tablero (SSE); evita volver a descargar todo tras cada cambio
+  useEffect(() => {
+    const access = localStorage.getItem("access");
+    if (!access) return;
+    const es = new EventSource(`/api/boards/${boardId}/events/?token=${encodeURIComponent(access)}`);
+    const upsert = (e: Event) => {
+      const { data } = JSON.parse((e as MessageEvent).data);
+      setCards((prev) => [...prev.filter((c) => c.id !== data.id), data]);
+    };
+    const remove = (e: Event) => {
+      const { data } = JSON.parse((e as MessageEvent).data);
+      setCards((prev) => prev.filter((c) => c.id !== data.id));
+    };
+    es.addEventListener("card.created", upsert);
+    es.addEventListener("card.updated", upsert);
+    es.addEventListener("card.moved", upsert);
+    es.addEventListener("card.deleted", remove);
+    return () => es.close();
+  }, [boardId]);
+
   const cardsByList = useMemo(() => {
     const map: Record<number, Card[]> = {};
     for (const l of lists) map[l.id] = [];
@@ -50,9 +71,10 @@ export default function BoardPage() {
   const onDropOnList = async (listId: number, index: number) => {
     if (!dragCard) return;
     try {
-      await api.patch(`/cards/${dragCard.id}/move/`, { list: listId, position: index });
+      // El backend devuelve la posición dispersa asignada a la tarjeta
+      const { data } = await api.patch(`/cards/${dragCard.id}/move/`, { list: listId, position: index });
       setCards((prev) => {
-        const moved = { ...dragCard, list: listId, position: index };
+        const moved = { ...dragCard, list: listId, position: data.position };
         const others = prev.filter((c) => c.id !== dragCard.id);
         return [...others, moved];
       });
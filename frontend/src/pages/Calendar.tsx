@@ -8,6 +8,13 @@ type Card = {
   due_date?: string | null;
 };
 
+type DayBucket = {
+  date: string;
+  total: number;
+  by_priority: Record<string, number>;
+  cards: Card[];
+};
+
 function startOfMonth(date: Date) {
   return new Date(date.getFullYear(), date.getMonth(), 1);
 }
@@ -28,18 +35,26 @@ function formatYmd(d: Date) {
 
 export default function CalendarPage() {
   const [current, setCurrent] = useState<Date>(startOfMonth(new Date()));
-  const [cards, setCards] = useState<Card[]>([]);
+  const [days, setDays] = useState<DayBucket[]>([]);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState("");
   const [selectedDate, setSelectedDate] = useState<string>("");
 
+  // El backend agrupa por día (en la zona horaria del navegador) solo el mes visible
   useEffect(() => {
     const load = async () => {
       try {
         setLoading(true);
         setError("");
-        const { data } = await api.get("/cards/");
-        setCards(data || []);
+        const { data } = await api.get("/cards/calendar/", {
+          params: {
+            from: formatYmd(startOfMonth(current)),
+            to: formatYmd(endOfMonth(current)),
+            tz: Intl.DateTimeFormat().resolvedOptions().timeZone,
+            limit: 20,
+          },
+        });
+        setDays(data?.days || []);
       } catch (_e) {
         setError("No se pudieron cargar las tareas del calendario.");
       } finally {
@@ -47,20 +62,13 @@ export default function CalendarPage() {
       }
     };
     load();
-  }, []);
+  }, [current]);
 
   const groupedByDate = useMemo(() => {
-    const map: Record<string, Card[]> = {};
-    for (const c of cards) {
-      if (!c.due_date) continue;
-      // Normalizamos a YYYY-MM-DD sin hora
-      const dt = new Date(c.due_date);
-      const ymd = formatYmd(dt);
-      if (!map[ymd]) map[ymd] = [];
-      map[ymd].push(c);
-    }
+    const map: Record<string, DayBucket> = {};
+    for (const d of days) map[d.date] = d;
     return map;
-  }, [cards]);
+  }, [days]);
 
   const daysMatrix = useMemo(() => {
     const start = startOfMonth(current);
@@ -98,7 +106,8 @@ export default function CalendarPage() {
     });
   }, [current]);
 
-  const selectedTasks = selectedDate ? groupedByDate[selectedDate] || [] : [];
+  const selectedDay = selectedDate ? groupedByDate[selectedDate] : undefined;
+  const selectedTasks = selectedDay?.cards || [];
 
   return (
     <div style={{ padding: 20 }}>
@@ -120,17 +129,17 @@ export default function CalendarPage() {
         <div className="calendar-grid">
           {daysMatrix.map(({ date, inMonth }) => {
             const ymd = formatYmd(date);
-            const events = groupedByDate[ymd] || [];
-            const hasEvents = events.length > 0;
+            const total = groupedByDate[ymd]?.total || 0;
+            const hasEvents = total > 0;
             return (
               <button
                 key={ymd}
                 className={`cell day ${inMonth ? "" : "muted"} ${hasEvents ? "has-events" : ""}`}
                 onClick={() => setSelectedDate(ymd)}
-                title={hasEvents ? `${events.length} tarea(s)` : ""}
+                title={hasEvents ? `${total} tarea(s)` : ""}
               >
                 <div className="day-num">{date.getDate()}</div>
-                {hasEvents && <div className="badges">{events.length}</div>}
+                {hasEvents && <div className="badges">{total}</div>}
               </button>
             );
           })}
@@ -155,6 +164,9 @@ export default function CalendarPage() {
                     {t.description && <p style={{ marginTop: 6 }}>{t.description}</p>}
                   </div>
                 ))}
+                {selectedDay && selectedDay.total > selectedTasks.length && (
+                  <div className="muted">y {selectedDay.total - selectedTasks.length} más…</div>
+                )}
               </div>
             )}
           </div>